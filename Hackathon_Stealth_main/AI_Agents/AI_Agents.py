@@ -5,6 +5,16 @@ import pygame
 # don't import draw_vision_cone here unless you actually draw from AI file
 
 class StandardAI:
+    # fixed attribute layout: no per-instance __dict__, so thousands of agents
+    # stay compact and attribute access is a slot lookup
+    __slots__ = (
+        "x", "y", "size", "facing",
+        "vision_distance", "vision_angle", "cos_half_vision",
+        "standard_speed", "running_speed",
+        "chasing", "patrol_endA", "patrol_endB", "patrol_target",
+        "kind", "mode", "timer", "heading", "last_seen",
+    )
+
     def __init__(self, x, y, size=6):
         # position is top-left of a square hitbox (consistent with Player)
         self.x = float(x)
@@ -13,8 +23,9 @@ class StandardAI:
         # small square hitbox size (pixels)
         self.size = int(size)
 
-        # facing as a normalized vector (dx, dy). Must be non-zero.
-        self.facing = (1.0, 0.0)
+        # facing as a normalized vector [dx, dy]. Must be non-zero.
+        # It is a list so turning updates it in place instead of allocating.
+        self.facing = [1.0, 0.0]
 
         # vision parameters
         self.vision_distance = 120.0
@@ -31,43 +42,31 @@ class StandardAI:
         self.patrol_target = None
         self.cos_half_vision = math.cos(self.vision_angle / 2)
 
+        # behaviour (Agent_Behaviours): agent type, its state machine's
+        # current state (None = the type's start), seconds spent in that
+        # state, base look direction (radians) and where the player was last seen
+        self.kind = "patroller"
+        self.mode = None
+        self.timer = 0.0
+        self.heading = 0.0
+        self.last_seen = None
+
     def get_rect(self):
         """Return a pygame.Rect representing the agent's hitbox (top-left coords)."""
         return pygame.Rect(int(self.x), int(self.y), int(self.size), int(self.size))
 
-    def _collides_with_wall(self, maze):
-        """
-        Check collision against maze walls using tile lookup (same method Player uses).
-        This doesn't require Maze.is_wall_at_pixel to exist.
-        """
-        rect = self.get_rect()
-
-        # Determine which tiles the agent overlaps
-        left_tile = rect.left // maze.tile_size
-        right_tile = (rect.right - 1) // maze.tile_size
-        top_tile = rect.top // maze.tile_size
-        bottom_tile = (rect.bottom - 1) // maze.tile_size
-
-        for row in range(int(top_tile), int(bottom_tile) + 1):
-            for col in range(int(left_tile), int(right_tile) + 1):
-                # Bounds check: outside map counts as wall
-                if row < 0 or row >= maze.rows or col < 0 or col >= maze.cols:
-                    return True
-
-                # If tile value 1 is wall (your convention), collide
-                if maze.grid[row][col] == 1:
-                    return True
-
-        return False
-
     @classmethod
-    def on_track(cls, endA, endB, random_t=None, size=6):
+    def on_track(cls, endA, endB, random_t=None, size=6, rng=None):
         """
         Create an agent located on the segment endA->endB at random_t in [0,1].
         endA/endB should be pixel (x,y) points.
+        rng is the random.Random to draw from (World.rng for reproducible
+        runs); defaults to the global random module.
         """
+        if rng is None:
+            rng = random
         if random_t is None:
-            random_t = random.random()
+            random_t = rng.random()
 
         ax, ay = float(endA[0]), float(endA[1])
         bx, by = float(endB[0]), float(endB[1])
@@ -78,7 +77,7 @@ class StandardAI:
         agent = cls(x, y, size=size)
         agent.patrol_endA = (ax, ay)
         agent.patrol_endB = (bx, by)
-        agent.patrol_target = random.choice([agent.patrol_endA, agent.patrol_endB])
+        agent.patrol_target = rng.choice([agent.patrol_endA, agent.patrol_endB])
         agent._set_facing_toward(agent.patrol_target)
         return agent
 
@@ -87,9 +86,11 @@ class StandardAI:
         tx, ty = float(target[0]), float(target[1])
         dx = tx - self.x
         dy = ty - self.y
-        nx, ny = self._normalize(dx, dy)
-        if nx is not None:
-            self.facing = (nx, ny)
+        mag = math.sqrt(dx * dx + dy * dy)
+        if mag != 0:
+            facing = self.facing
+            facing[0] = dx / mag
+            facing[1] = dy / mag
 
     # public alias kept for compatibility
     def set_facing_toward(self, target):
@@ -97,7 +98,9 @@ class StandardAI:
 
     @staticmethod
     def _normalize(dx, dy):
-        mag = math.hypot(dx, dy)
+        # sqrt of the sum of squares rather than math.hypot so the batched
+        # NumPy backend can reproduce the exact same bits
+        mag = math.sqrt(dx * dx + dy * dy)
         if mag == 0:
             return (None, None)
         return (dx / mag, dy / mag)
@@ -107,11 +110,7 @@ class StandardAI:
         if self.patrol_target is None:
             return False
         tx, ty = self.patrol_target
-        return math.hypot(tx - self.x, ty - self.y) <= thresh
-
+        dx = tx - self.x
+        dy = ty - self.y
+        return math.sqrt(dx * dx + dy * dy) <= thresh
 
-# Keep the wrapper subclass if you previously had one (optional)
-class StandardAI(StandardAI):
-    def __init__(self, x, y, size=6):
-        super().__init__(x, y, size=size)
-        self.cos_half_vision = math.cos(self.vision_angle / 2)
\ No newline at end of file
@@ -1,17 +1,61 @@
 # Hackathon_Stealth_main/Agent_Actions/Agent_Actions.py
+import itertools
 import math
+import time
 from typing import List, Optional
 
 from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
-from Hackathon_Stealth_main.utils.utils import in_vision_cone, distance, clamp
-from Hackathon_Stealth_main.Vision_Cones.Cones_Initialization import draw_vision_cone
+from Hackathon_Stealth_main.utils.utils import in_vision_cone, clamp
+from Hackathon_Stealth_main.Vision_Cones.Cones_Initialization import ConeRenderer
+from world.pathfinding import steer_point
 
 import pygame
 
 
+BACKENDS = ("python", "numpy")
+
+
 class Agent_Actions:
-    def __init__(self, show_cones: bool = False):
+    def __init__(self, show_cones: bool = False, backend: str = "python", navigate: bool = True,
+                 clip_cones: bool = False, scheduler=None, alerts=None, behaviours=None,
+                 noise=None):
+        """
+        backend selects how move_agents runs:
+        - "python": one StandardAI at a time (reference implementation)
+        - "numpy":  all agents at once through an AgentBatch (same results)
+        navigate routes patrols over the maze's cached A* paths and chases over
+        the flow field toward the player's tile; False steers straight at targets.
+        clip_cones stops drawn vision cones at walls (needs the maze in draw_agents).
+        scheduler, an AIScheduler, updates distant agents less often under a
+        time budget (python backend only; the numpy one steps every row anyway).
+        alerts, an AlertBoard, lets agents that see the player send the guards
+        near its tile (by path distance) to investigate (python backend only).
+        behaviours, a BehaviourEngine, moves agents by their type's state
+        machine instead of the built-in patrol / chase (python backend, no
+        scheduler). noise, a world.noise.NoiseModel, is what the player made
+        since the last step: patrolling agents that hear it walk over to where
+        it came from (behaviours: the states that react to "hears").
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}, expected one of {BACKENDS}")
+        if backend != "python" and (scheduler is not None or alerts is not None):
+            raise ValueError("scheduler and alerts need the python backend")
+        if behaviours is not None and (backend != "python" or scheduler is not None):
+            raise ValueError("behaviours need the python backend and no scheduler")
         self.show_cones = show_cones
+        self.cones = ConeRenderer(color=(255, 255, 0), clip=clip_cones)
+        self.backend = backend
+        self.navigate = navigate
+        self._batch = None
+
+        self.scheduler = scheduler
+        self.alerts = alerts
+        self.behaviours = behaviours
+        self.noise = noise
+
+        # Optional world.profiler.Profiler receiving "vision", "steering",
+        # "collision", "draw_agents" and "draw_cones" spans; None disables timing.
+        self.profiler = None
 
     @staticmethod
     def _face_toward(agent: StandardAI, target):
@@ -26,9 +70,10 @@ class Agent_Actions:
             dy = ty - agent.y
             nx, ny = agent._normalize(dx, dy)
             if nx is not None:
-                agent.facing = (nx, ny)
+                agent.facing[0] = nx
+                agent.facing[1] = ny
 
-    def move_agents(self, agents: List[StandardAI], player, maze, dt: float = 1.0):
+    def move_agents(self, agents: List[StandardAI], player, maze, dt: float = 1.0, spatial=None):
         """
         Move agents with maze collision:
         - axis-separated movement (X, then Y) to avoid corner-through.
@@ -36,22 +81,145 @@ class Agent_Actions:
         - player: object with .x and .y
         - maze: Maze instance (must have is_wall_at_pixel, width, height, tile_size)
         - dt: seconds
+        - spatial: optional SpatialHash holding the agents; agents it rules out
+          skip the vision check, and it is kept up to date as agents move
+        With a scheduler (python backend) only the agents it picks move this
+        frame, each by the dt it has accumulated. The noise made since the last
+        call is listened to once, for every agent.
         """
         if dt <= 0:
             return
 
-        for a in agents:
+        profiler = self.profiler
+        if profiler is not None:
+            t_start = time.perf_counter()
+            self._t_vision = 0.0
+            self._t_steering = 0.0
+
+        # this step's sound field (NoiseModel.sources), shared by all agents
+        noise = self.noise
+        if noise is not None and not noise.listen(maze):
+            noise = None
+
+        if self.backend == "numpy":
+            self._move_agents_batched(agents, player, maze, dt, spatial, noise)
+            return
+
+        # only agents within reach of the player can possibly see it
+        candidates = None
+        if spatial is not None:
+            candidates = set(spatial.query_radius(player.x, player.y, spatial.max_reach))
+
+        # chasers share one flow field toward the player's tile (which is
+        # also what they report to the alert board)
+        alerts = self.alerts
+        player_tile = -1
+        if self.navigate or alerts is not None:
+            half = getattr(player, "size", 0) / 2
+            player_tile = maze.tile_index_at(player.x + half, player.y + half)
+        if alerts is not None:
+            alerts.advance(dt)
+
+        scheduler = self.scheduler
+        if self.behaviours is not None:
+            t_vision, t_steering = self.behaviours.step(agents, player, maze, dt, spatial, candidates, player_tile,
+                                                        self.navigate, alerts, profiler, noise)
+            if profiler is not None:
+                self._t_vision += t_vision
+                self._t_steering += t_steering
+        elif scheduler is None:
+            self._step_agents(agents, itertools.repeat(dt), player, maze, spatial, candidates, player_tile, noise)
+        else:
+            scheduler.run(agents, player, dt, spatial,
+                          lambda chunk, dts: self._step_agents(chunk, dts, player, maze, spatial,
+                                                               candidates, player_tile, noise))
+
+        if alerts is not None:
+            # this frame's sightings, as (at most) one alert event
+            if profiler is not None:
+                t0 = time.perf_counter()
+                alerts.propagate(maze, agents, player, spatial)
+                self._t_steering += time.perf_counter() - t0
+            else:
+                alerts.propagate(maze, agents, player, spatial)
+
+        if profiler is not None:
+            # per-agent pieces summed up; everything else counts as collision
+            total = time.perf_counter() - t_start
+            t_vision = self._t_vision
+            t_steering = self._t_steering
+            profiler.add_split(t_start, (("vision", t_vision), ("steering", t_steering),
+                                         ("collision", total - t_vision - t_steering)))
+
+    def _step_agents(self, agents, dts, player, maze, spatial, candidates, player_tile, noise=None):
+        """
+        python backend: one update of each agent by its dt (dts runs parallel
+        to agents). noise, if given, has just been listened to.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            t_vision = 0.0
+            t_steering = 0.0
+        navigate = self.navigate
+        alerts = self.alerts
+        field = None
+        sources = noise.sources if noise is not None else None
+        ts = maze.tile_size
+        cols = maze.cols
+
+        for a, dt in zip(agents, dts):
             vx = 0.0
             vy = 0.0
 
+            if profiler is not None:
+                t0 = time.perf_counter()
+                sees = (candidates is None or a in candidates) and in_vision_cone(a, player, maze)
+                t1 = time.perf_counter()
+                t_vision += t1 - t0
+            else:
+                sees = (candidates is None or a in candidates) and in_vision_cone(a, player, maze)
+
+            # alerted agents investigate the last sighting instead of patrolling
+            target = None
+            if not sees and alerts is not None and alerts.is_responding(a):
+                target = alerts.steer(maze, a)
+
             # chase
-            if in_vision_cone(a, player, maze):
+            if sees:
                 a.chasing = True
-                dx = player.x - a.x
-                dy = player.y - a.y
-                nx, ny = a._normalize(dx, dy)
-                if nx is not None:
-                    a.facing = (nx, ny)
+                if alerts is not None:
+                    alerts.report(player_tile)
+                    alerts.release(a)
+                tx, ty = player.x, player.y
+                if navigate and player_tile >= 0:
+                    if field is None:
+                        field = maze.flow_field(player_tile)
+                    tx, ty = steer_point(maze, a.x, a.y, a.size, tx, ty, player_tile, field)
+                dx = tx - a.x
+                dy = ty - a.y
+                mag = math.sqrt(dx * dx + dy * dy)  # StandardAI._normalize, inlined
+                if mag != 0:
+                    nx = dx / mag
+                    ny = dy / mag
+                    facing = a.facing
+                    facing[0] = nx
+                    facing[1] = ny
+                    speed = float(getattr(a, "running_speed", 0.0))
+                    vx = nx * speed
+                    vy = ny * speed
+
+            elif target is not None:
+                # run down the alert field toward the last sighting
+                a.chasing = False
+                dx = target[0] - a.x
+                dy = target[1] - a.y
+                mag = math.sqrt(dx * dx + dy * dy)
+                if mag != 0:
+                    nx = dx / mag
+                    ny = dy / mag
+                    facing = a.facing
+                    facing[0] = nx
+                    facing[1] = ny
                     speed = float(getattr(a, "running_speed", 0.0))
                     vx = nx * speed
                     vy = ny * speed
@@ -63,11 +231,23 @@ class Agent_Actions:
                     if a.patrol_endA is None or a.patrol_endB is None:
                         a.patrol_target = a.patrol_endA or a.patrol_endB
                     else:
-                        dA = math.hypot(a.patrol_endA[0] - a.x, a.patrol_endA[1] - a.y)
-                        dB = math.hypot(a.patrol_endB[0] - a.x, a.patrol_endB[1] - a.y)
+                        ax, ay = a.patrol_endA[0] - a.x, a.patrol_endA[1] - a.y
+                        bx, by = a.patrol_endB[0] - a.x, a.patrol_endB[1] - a.y
+                        dA = math.sqrt(ax * ax + ay * ay)
+                        dB = math.sqrt(bx * bx + by * by)
                         a.patrol_target = a.patrol_endA if dA < dB else a.patrol_endB
                         self._face_toward(a, a.patrol_target)
 
+                # heard the player: walk over to the middle of the tile the
+                # noise came from, then patrol on from there
+                if sources:
+                    half = a.size / 2
+                    source = sources.get(maze.tile_index_at(a.x + half, a.y + half))
+                    if source is not None:
+                        row, col = divmod(source, cols)
+                        a.patrol_target = (col * ts + ts / 2 - half, row * ts + ts / 2 - half)
+                        self._face_toward(a, a.patrol_target)
+
                 # patrol
                 if a.patrol_target is None:
                     a.patrol_target = a.patrol_endA if a.patrol_endA is not None else a.patrol_endB
@@ -82,43 +262,109 @@ class Agent_Actions:
 
                 if a.patrol_target is not None:
                     tx, ty = a.patrol_target
+                    if navigate:
+                        tx, ty = steer_point(maze, a.x, a.y, a.size, tx, ty)
                     dx = tx - a.x
                     dy = ty - a.y
-                    nx, ny = a._normalize(dx, dy)
-                    if nx is not None:
-                        a.facing = (nx, ny)
+                    mag = math.sqrt(dx * dx + dy * dy)
+                    if mag != 0:
+                        nx = dx / mag
+                        ny = dy / mag
+                        facing = a.facing
+                        facing[0] = nx
+                        facing[1] = ny
                         speed = float(getattr(a, "standard_speed", 0.0))
                         vx = nx * speed
                         vy = ny * speed
 
-            # apply axis-separated movement and collision
-            move_x = vx * dt
-            a.x += move_x
-            if a._collides_with_wall(maze):
-                a.x -= move_x
+            if profiler is not None:
+                t_steering += time.perf_counter() - t1
 
-            move_y = vy * dt
-            a.y += move_y
-            if a._collides_with_wall(maze):
-                a.y -= move_y
+            # swept movement: X then Y, stopping at walls (Maze.sweep_box)
+            size = getattr(a, "size", 1)
+            a.x, a.y, _ = maze.sweep_box(a.x, a.y, size, vx * dt, vy * dt)
 
             # clamp within maze pixel bounds (top-left coordinates)
-            size = getattr(a, "size", 1)
             a.x = clamp(a.x, 0, max(0, maze.width - size))
             a.y = clamp(a.y, 0, max(0, maze.height - size))
 
-    def draw_agents(self, screen: pygame.Surface, agents: List[StandardAI], draw_cones: Optional[bool] = None):
+            if spatial is not None:
+                spatial.update(a)
+
+        if profiler is not None:
+            self._t_vision += t_vision
+            self._t_steering += t_steering
+
+    def _move_agents_batched(self, agents: List[StandardAI], player, maze, dt: float, spatial=None, noise=None):
+        """numpy backend: step every agent through one AgentBatch and write results back."""
+        from Hackathon_Stealth_main.AI_Agents.Agent_Batch import AgentBatch
+
+        batch = self._batch
+        if batch is None or not batch.matches(agents):
+            batch = self._batch = AgentBatch(agents)
+            if spatial is not None:
+                batch.attach_spatial(spatial)
+
+        candidates = None
+        if spatial is not None:
+            candidates = batch.indices_of(spatial.query_radius(player.x, player.y, spatial.max_reach))
+
+        profiler = self.profiler
+        changed_targets = batch.step(player, maze, dt, profiler, candidates, self.navigate, noise)
+        if profiler is not None:
+            t0 = time.perf_counter()
+        batch.store(changed_targets)
+        if spatial is not None:
+            batch.sync_spatial(spatial)
+        if profiler is not None:
+            # writing positions back to the agents and the spatial hash
+            profiler.add("collision", t0, time.perf_counter())
+
+    def invalidate_batch(self):
+        """Force the numpy backend to re-read agent attributes on the next frame."""
+        self._batch = None
+        if self.scheduler is not None:
+            self.scheduler.reset()
+        if self.behaviours is not None:
+            self.behaviours.reset()
+
+    def draw_agents(self, screen: pygame.Surface, agents: List[StandardAI], draw_cones: Optional[bool] = None,
+                    maze=None, offset=(0, 0)) -> List[pygame.Rect]:
+        """
+        Draw agents (and cones) with world pixel offset at the screen's
+        top-left; returns the screen Rects that were drawn on.
+        """
         if draw_cones is None:
             draw_cones = self.show_cones
 
+        profiler = self.profiler
+        if profiler is not None:
+            t0 = time.perf_counter()
+
+        ox, oy = offset
+        w, h = screen.get_size()
+        rects = []
+        # agent types have their own colors
+        colors = self.behaviours.colors if self.behaviours is not None else None
+        color = (20, 150, 20)
         for a in agents:
             size = getattr(a, "size", 6)
-            cx = int(a.x + size / 2)
-            cy = int(a.y + size / 2)
-            pygame.draw.circle(screen, (20, 150, 20), (cx, cy), max(2, size // 2))
-
-            if draw_cones:
-                try:
-                    draw_vision_cone(a, screen, color=(255, 255, 0))
-                except Exception:
-                    pass
\ No newline at end of file
+            cx = int(a.x + size / 2) - ox
+            cy = int(a.y + size / 2) - oy
+            r = max(2, size // 2)
+            if cx + r < 0 or cy + r < 0 or cx - r >= w or cy - r >= h:
+                continue
+            if colors is not None:
+                color = colors.get(a.kind, (20, 150, 20))
+            rects.append(pygame.draw.circle(screen, color, (cx, cy), r))
+
+        if profiler is not None:
+            t1 = time.perf_counter()
+            profiler.add("draw_agents", t0, t1)
+
+        if draw_cones:
+            # all cones in one overlay pass
+            rects.extend(self.cones.draw(screen, agents, maze, offset))
+            if profiler is not None:
+                profiler.add("draw_cones", t1, time.perf_counter())
+        return rects
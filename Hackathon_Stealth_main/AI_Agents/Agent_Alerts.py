@@ -0,0 +1,136 @@
+# Hackathon_Stealth_main/AI_Agents/Agent_Alerts.py
+from world.pathfinding import FlowField
+
+
+class AlertBoard:
+    """
+    Shared blackboard through which guards pass on sightings (Agent_Actions,
+    python backend).
+
+    An agent that sees the player report()s the player's tile: that is the
+    last-known position every guard reads. Reports are only propagated as
+    an alert event by propagate(), at most once every rebroadcast seconds:
+    one multi-source BFS (a FlowField) from the tiles reported since the
+    last event, bounded by radius steps. Every agent standing on a tile the
+    BFS reached becomes a responder and walks the same field down to the
+    nearest reported tile, so an alert costs one bounded BFS plus a lookup
+    per nearby agent, and nothing per frame beyond each responder's step.
+
+    A responder stops investigating (and goes back to patrolling) when it
+    reaches a reported tile, walks off the field, or after timeout seconds
+    without a new alert reaching it.
+    """
+
+    def __init__(self, radius=12, timeout=8.0, rebroadcast=0.5):
+        self.radius = int(radius)
+        self.timeout = float(timeout)
+        self.rebroadcast = float(rebroadcast)
+        self.reset()
+
+    def reset(self):
+        """Forget sightings and responders (new agent set, restart...)."""
+        self.time = 0.0
+        self.last_known = -1       # player tile at the latest sighting
+        self.last_seen = None      # self.time of the latest sighting
+        self.field = None          # FlowField of the latest alert event
+        self.responders = {}       # agent -> self.time its investigation expires
+        self._pending = {}         # player tiles reported since the last event (ordered set)
+        self._broadcast_at = None
+        self.alerts = 0            # alert events so far
+
+    def advance(self, dt):
+        """Move the board's clock on by one frame, dropping responders whose investigation expired."""
+        self.time += dt
+        now = self.time
+        responders = self.responders
+        if responders:
+            expired = [a for a, expires in responders.items() if now >= expires]
+            for a in expired:
+                del responders[a]
+
+    def is_responding(self, agent):
+        """True if agent is investigating an alert that has not timed out yet."""
+        expires = self.responders.get(agent)
+        if expires is None:
+            return False
+        if self.time >= expires:
+            del self.responders[agent]
+            return False
+        return True
+
+    def report(self, player_tile):
+        """An agent sees the player standing on player_tile (a flat tile index)."""
+        if player_tile < 0:
+            return
+        self.last_known = player_tile
+        self.last_seen = self.time
+        self._pending[player_tile] = None
+
+    def propagate(self, maze, agents, player, spatial=None):
+        """
+        Turn pending reports into an alert event if one is due: returns the
+        number of agents it alerted. spatial (the World's SpatialHash) narrows
+        the agents looked at to those around the reported tiles.
+        """
+        if not self._pending:
+            return 0
+        if self._broadcast_at is not None and self.time - self._broadcast_at < self.rebroadcast:
+            return 0
+
+        goals = list(self._pending)
+        self._pending.clear()
+        self._broadcast_at = self.time
+        self.alerts += 1
+        field = self.field = FlowField.from_goals(maze, goals, self.radius)
+        dist_of = field.dist_of
+
+        if spatial is not None:
+            # path distance is never shorter than the straight line
+            ts = maze.tile_size
+            reach = (self.radius + 2) * ts
+            cols = maze.cols
+            seen = set()
+            nearby = []
+            for goal in goals:
+                row, col = divmod(goal, cols)
+                for e in spatial.query_radius(col * ts + ts / 2, row * ts + ts / 2, reach):
+                    if e is not player and id(e) not in seen:
+                        seen.add(id(e))
+                        nearby.append(e)
+            agents = nearby
+
+        expires = self.time + self.timeout
+        responders = self.responders
+        count = 0
+        for a in agents:
+            half = a.size / 2
+            if maze.tile_index_at(a.x + half, a.y + half) in dist_of:
+                responders[a] = expires
+                count += 1
+        return count
+
+    def steer(self, maze, agent):
+        """
+        Where a responding agent should head (top-left pixels: the centre of
+        its next tile on the alert field), or None once it is not, or no
+        longer, investigating.
+        """
+        expires = self.responders.get(agent)
+        if expires is None:
+            return None
+        half = agent.size / 2
+        tile = maze.tile_index_at(agent.x + half, agent.y + half)
+        field = self.field
+        step = field.next_tile(tile) if field is not None else -1
+        if self.time >= expires or step < 0 or step == tile:
+            # timed out, off the field, or arrived
+            del self.responders[agent]
+            return None
+
+        ts = maze.tile_size
+        row, col = divmod(step, maze.cols)
+        return col * ts + ts / 2 - half, row * ts + ts / 2 - half
+
+    def release(self, agent):
+        """Stop agent investigating (it found the player, or was removed)."""
+        self.responders.pop(agent, None)
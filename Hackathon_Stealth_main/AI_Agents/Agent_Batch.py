@@ -0,0 +1,406 @@
+# Hackathon_Stealth_main/AI_Agents/Agent_Batch.py
+import operator
+import time
+from typing import List
+
+import numpy as np
+
+from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from world.maze import VIS_CLEAR, VIS_UNKNOWN
+from world.pathfinding import steer_point
+
+
+def _norm(dx, dy):
+    """Vector length, computed exactly like StandardAI._normalize."""
+    return np.sqrt(dx * dx + dy * dy)
+
+
+class AgentBatch:
+    """
+    Struct-of-arrays mirror of a list of StandardAI agents.
+
+    Positions, facings, patrol endpoints/targets and chase flags live in NumPy
+    buffers so a whole frame of Agent_Actions.move_agents can run as a handful
+    of array operations. The math is written to follow the per-agent path
+    operation for operation, so both backends produce identical results.
+    """
+
+    def __init__(self, agents: List[StandardAI]):
+        self.load(agents)
+
+    def load(self, agents: List[StandardAI]):
+        """(Re)read every agent attribute into the array buffers."""
+        self.agents = agents
+        self.members = list(agents)
+        n = len(self.members)
+        self.count = n
+
+        def col(values, dtype=np.float64):
+            return np.fromiter(values, dtype=dtype, count=n)
+
+        members = self.members
+        self.x = col(a.x for a in members)
+        self.y = col(a.y for a in members)
+        self.size = col((getattr(a, "size", 1) for a in members), np.int64)
+        self.fx = col(a.facing[0] for a in members)
+        self.fy = col(a.facing[1] for a in members)
+        self.vision_distance = col(a.vision_distance for a in members)
+        self.cos_half_vision = col(a.cos_half_vision for a in members)
+        self.standard_speed = col(float(getattr(a, "standard_speed", 0.0)) for a in members)
+        self.running_speed = col(float(getattr(a, "running_speed", 0.0)) for a in members)
+        self.chasing = col((bool(getattr(a, "chasing", False)) for a in members), np.bool_)
+
+        # patrol endpoints / target as (x, y, present) triples; None -> present False
+        self.ax, self.ay, self.has_a = self._points([a.patrol_endA for a in members])
+        self.bx, self.by, self.has_b = self._points([a.patrol_endB for a in members])
+        self.tx, self.ty, self.has_t = self._points([a.patrol_target for a in members])
+
+        # cached patrol waypoints: recomputed only when an agent changes tile
+        # or target (steer_point depends on nothing else)
+        self.wp_tile = np.full(n, -2, dtype=np.int64)
+        self.wp_tx = np.full(n, np.nan)
+        self.wp_ty = np.full(n, np.nan)
+        self.wp_x = np.zeros(n, dtype=np.float64)
+        self.wp_y = np.zeros(n, dtype=np.float64)
+        self._wp_maze = None
+
+        self.index_of = {a: i for i, a in enumerate(members)}
+        self._cell_size = None
+        self._cell_x = None
+        self._cell_y = None
+
+    @staticmethod
+    def _points(points):
+        n = len(points)
+        px = np.zeros(n, dtype=np.float64)
+        py = np.zeros(n, dtype=np.float64)
+        present = np.zeros(n, dtype=np.bool_)
+        for i, p in enumerate(points):
+            if p is not None:
+                px[i] = p[0]
+                py[i] = p[1]
+                present[i] = True
+        return px, py, present
+
+    def matches(self, agents: List[StandardAI]) -> bool:
+        """True if agents still holds exactly the objects this batch was loaded from."""
+        return (
+            agents is self.agents
+            and len(agents) == self.count
+            and all(map(operator.is_, agents, self.members))
+        )
+
+    def store(self, changed_targets=None):
+        """Write the array state back onto the StandardAI objects."""
+        for a, x, y, fx, fy, chasing in zip(
+            self.members,
+            self.x.tolist(),
+            self.y.tolist(),
+            self.fx.tolist(),
+            self.fy.tolist(),
+            self.chasing.tolist(),
+        ):
+            a.x = x
+            a.y = y
+            facing = a.facing
+            facing[0] = fx
+            facing[1] = fy
+            a.chasing = chasing
+
+        if changed_targets is None:
+            idx = range(self.count)
+        else:
+            idx = np.flatnonzero(changed_targets).tolist()
+        for i in idx:
+            a = self.members[i]
+            if self.has_t[i]:
+                a.patrol_target = (float(self.tx[i]), float(self.ty[i]))
+            else:
+                a.patrol_target = None
+
+    # --------------------------------------------------------------- spatial
+
+    def indices_of(self, entities):
+        """Batch indices of the given entities (entities not in the batch are ignored)."""
+        index_of = self.index_of
+        return np.fromiter(
+            (index_of[e] for e in entities if e in index_of), dtype=np.int64
+        )
+
+    def attach_spatial(self, spatial):
+        """Make sure every member is filed in spatial and remember the cells."""
+        for a in self.members:
+            spatial.insert(a, reach=a.vision_distance)
+        self._cell_size = spatial.cell_size
+        self._cell_x = self.x // self._cell_size
+        self._cell_y = self.y // self._cell_size
+
+    def sync_spatial(self, spatial):
+        """After store(): re-file only the agents that crossed into a new cell."""
+        if self._cell_size != spatial.cell_size:
+            self.attach_spatial(spatial)
+            return
+        cell_x = self.x // self._cell_size
+        cell_y = self.y // self._cell_size
+        moved = np.flatnonzero((cell_x != self._cell_x) | (cell_y != self._cell_y))
+        members = self.members
+        for i in moved.tolist():
+            spatial.update(members[i])
+        self._cell_x = cell_x
+        self._cell_y = cell_y
+
+    # ------------------------------------------------------------------ maze
+
+    @staticmethod
+    def _tile_indices(maze, px, py):
+        """Vectorized Maze.tile_index_at."""
+        col = np.trunc(px).astype(np.int64) // maze.tile_size
+        row = np.trunc(py).astype(np.int64) // maze.tile_size
+        inside = (row >= 0) & (row < maze.rows) & (col >= 0) & (col < maze.cols)
+        return np.where(inside, row * maze.cols + col, -1)
+
+    # ---------------------------------------------------------------- vision
+
+    def in_vision_cone(self, player, maze, candidates=None):
+        """
+        Vectorized utils.in_vision_cone for every agent against one target.
+        candidates optionally restricts the check to those batch indices
+        (everyone else is reported as not seeing the target).
+        """
+        seen = np.zeros(self.count, dtype=np.bool_)
+        if candidates is None:
+            idx = np.arange(self.count)
+        else:
+            idx = np.asarray(candidates, dtype=np.int64)
+
+        dx = player.x - self.x[idx]
+        dy = player.y - self.y[idx]
+        dist_sq = dx * dx + dy * dy
+        vd = self.vision_distance[idx]
+        near = (dist_sq != 0) & ~(dist_sq > vd * vd)
+        idx, dx, dy, d = idx[near], dx[near], dy[near], dist_sq[near]
+        seen[idx] = True
+        if idx.size == 0:
+            return seen
+
+        # angle check on the survivors only
+        inv_dist = 1 / np.sqrt(d)
+        dot = self.fx[idx] * (dx * inv_dist) + self.fy[idx] * (dy * inv_dist)
+        keep = ~(dot < self.cos_half_vision[idx])
+        seen[idx[~keep]] = False
+        idx = idx[keep]
+        d = d[keep]
+        if idx.size == 0:
+            return seen
+
+        # line of sight: same fixed-step ray march as the per-agent path
+        steps = (np.sqrt(d) // 6).astype(np.int64)
+        march = steps > 1
+        idx = idx[march]
+        steps = steps[march]
+        if idx.size == 0:
+            return seen
+
+        size = self.size[idx]
+        px = self.x[idx] + size / 2
+        py = self.y[idx] + size / 2
+        step_x = (player.x - px) / steps
+        step_y = (player.y - py) / steps
+
+        # index lookup first; only VIS_UNKNOWN rays are marched
+        cls = maze.visibility_between_many(
+            px, py,
+            np.full(idx.size, player.x), np.full(idx.size, player.y),
+            np.maximum(np.abs(step_x), np.abs(step_y)),
+        )
+        known = cls != VIS_UNKNOWN
+        seen[idx[known & (cls != VIS_CLEAR)]] = False
+        march = ~known
+        idx, steps = idx[march], steps[march]
+        px, py, step_x, step_y = px[march], py[march], step_x[march], step_y[march]
+        if idx.size == 0:
+            return seen
+
+        blocked = np.zeros(idx.size, dtype=np.bool_)
+        for k in range(1, int(steps.max()) + 1):
+            live = (steps >= k) & ~blocked
+            if not live.any():
+                break
+            px[live] += step_x[live]
+            py[live] += step_y[live]
+            blocked[live] = maze.walls_at_pixels(px[live], py[live])
+
+        seen[idx[blocked]] = False
+        return seen
+
+    # ------------------------------------------------------------------ step
+
+    def _face_toward(self, mask, tx, ty):
+        """Vectorized StandardAI._set_facing_toward on the masked agents."""
+        dx = tx - self.x
+        dy = ty - self.y
+        mag = _norm(dx, dy)
+        ok = mask & (mag != 0)
+        self.fx[ok] = dx[ok] / mag[ok]
+        self.fy[ok] = dy[ok] / mag[ok]
+
+    def step(self, player, maze, dt: float, profiler=None, candidates=None, navigate=False, noise=None):
+        """
+        Advance all agents by dt seconds. Mirrors Agent_Actions.move_agents.
+        profiler, if given, gets "vision", "steering" and "collision" spans.
+        candidates, if given, are the only batch indices that can see the player.
+        navigate follows maze paths / the chase flow field (see steer_point).
+        noise, a NoiseModel that has just been listened to, sends the
+        patrolling agents that hear it to the noise's tile.
+        Returns a bool mask of agents whose patrol_target changed.
+        """
+        if profiler is not None:
+            t0 = time.perf_counter()
+        n = self.count
+        changed_targets = np.zeros(n, dtype=np.bool_)
+        if dt <= 0 or n == 0:
+            return changed_targets
+
+        vx = np.zeros(n, dtype=np.float64)
+        vy = np.zeros(n, dtype=np.float64)
+
+        see = self.in_vision_cone(player, maze, candidates)
+        if profiler is not None:
+            t1 = time.perf_counter()
+        lost = self.chasing & ~see
+        patrol = ~see
+        self.chasing = see
+
+        # chase
+        if see.any():
+            gx = np.full(n, float(player.x))
+            gy = np.full(n, float(player.y))
+            if navigate:
+                half = getattr(player, "size", 0) / 2
+                player_tile = maze.tile_index_at(player.x + half, player.y + half)
+                if player_tile >= 0:
+                    # few agents see the player at once; the shared field does the work
+                    field = maze.flow_field(player_tile)
+                    chasers = np.flatnonzero(see)
+                    for i, x, y, size in zip(chasers.tolist(), self.x[chasers].tolist(),
+                                             self.y[chasers].tolist(), self.size[chasers].tolist()):
+                        gx[i], gy[i] = steer_point(maze, x, y, size, player.x, player.y, player_tile, field)
+            dx = gx - self.x
+            dy = gy - self.y
+            mag = _norm(dx, dy)
+            ok = see & (mag != 0)
+            nx = dx[ok] / mag[ok]
+            ny = dy[ok] / mag[ok]
+            self.fx[ok] = nx
+            self.fy[ok] = ny
+            vx[ok] = nx * self.running_speed[ok]
+            vy[ok] = ny * self.running_speed[ok]
+
+        # lost sight -> resume patrol at the nearer endpoint
+        if lost.any():
+            both = self.has_a & self.has_b
+            one = lost & ~both
+            use_a = one & self.has_a
+            use_b = one & ~self.has_a
+            self._set_target(use_a, self.ax, self.ay, self.has_a, changed_targets)
+            self._set_target(use_b, self.bx, self.by, self.has_b, changed_targets)
+
+            nearer = lost & both
+            if nearer.any():
+                d_a = _norm(self.ax - self.x, self.ay - self.y)
+                d_b = _norm(self.bx - self.x, self.by - self.y)
+                pick_a = nearer & (d_a < d_b)
+                pick_b = nearer & ~(d_a < d_b)
+                self._set_target(pick_a, self.ax, self.ay, self.has_a, changed_targets)
+                self._set_target(pick_b, self.bx, self.by, self.has_b, changed_targets)
+                self._face_toward(nearer, self.tx, self.ty)
+
+        # heard the player: one gather of the sound field over the agents' tiles
+        if noise is not None:
+            half = self.size / 2
+            source = noise.sources_at(maze, self._tile_indices(maze, self.x + half, self.y + half))
+            hears = patrol & (source >= 0)
+            if hears.any():
+                ts = maze.tile_size
+                row, col = np.divmod(source, maze.cols)
+                self._set_target(hears, col * ts + ts / 2 - half, row * ts + ts / 2 - half, hears, changed_targets)
+                self._face_toward(hears, self.tx, self.ty)
+
+        # patrol: default target
+        missing = patrol & ~self.has_t
+        if missing.any():
+            self._set_target(missing & self.has_a, self.ax, self.ay, self.has_a, changed_targets)
+            self._set_target(missing & ~self.has_a, self.bx, self.by, self.has_b, changed_targets)
+
+        # patrol: flip target once reached
+        reached = patrol & self.has_t & (_norm(self.tx - self.x, self.ty - self.y) <= 4.0)
+        if reached.any():
+            at_a = self.has_a & (self.tx == self.ax) & (self.ty == self.ay)
+            self._set_target(reached & at_a, self.bx, self.by, self.has_b, changed_targets)
+            self._set_target(reached & ~at_a, self.ax, self.ay, self.has_a, changed_targets)
+            self._face_toward(reached & self.has_t, self.tx, self.ty)
+
+        # patrol: steer toward target
+        walking = patrol & self.has_t
+        if walking.any():
+            gx, gy = self.tx, self.ty
+            if navigate:
+                self._update_waypoints(maze, walking)
+                gx, gy = self.wp_x, self.wp_y
+            dx = gx - self.x
+            dy = gy - self.y
+            mag = _norm(dx, dy)
+            ok = walking & (mag != 0)
+            nx = dx[ok] / mag[ok]
+            ny = dy[ok] / mag[ok]
+            self.fx[ok] = nx
+            self.fy[ok] = ny
+            vx[ok] = nx * self.standard_speed[ok]
+            vy[ok] = ny * self.standard_speed[ok]
+
+        if profiler is not None:
+            t2 = time.perf_counter()
+
+        # swept movement: X then Y, stopping at walls (Maze.sweep_boxes)
+        self.x, self.y, _ = maze.sweep_boxes(self.x, self.y, self.size, vx * dt, vy * dt)
+
+        # clamp within maze pixel bounds (top-left coordinates)
+        high_x = np.maximum(0, maze.width - self.size)
+        high_y = np.maximum(0, maze.height - self.size)
+        self.x = np.maximum(0, np.minimum(high_x, self.x))
+        self.y = np.maximum(0, np.minimum(high_y, self.y))
+
+        if profiler is not None:
+            profiler.add("vision", t0, t1)
+            profiler.add("steering", t1, t2)
+            profiler.add("collision", t2, time.perf_counter())
+        return changed_targets
+
+    def _update_waypoints(self, maze, walking):
+        """Refresh wp_x / wp_y for walking agents whose tile or target changed."""
+        if self._wp_maze is not maze:
+            self._wp_maze = maze
+            self.wp_tile[:] = -2
+        half = self.size / 2
+        tile = self._tile_indices(maze, self.x + half, self.y + half)
+        stale = walking & (
+            (tile != self.wp_tile) | (self.tx != self.wp_tx) | (self.ty != self.wp_ty)
+        )
+        idx = np.flatnonzero(stale)
+        if idx.size == 0:
+            return
+        for i, x, y, size, tx, ty in zip(idx.tolist(), self.x[idx].tolist(), self.y[idx].tolist(),
+                                         self.size[idx].tolist(), self.tx[idx].tolist(),
+                                         self.ty[idx].tolist()):
+            self.wp_x[i], self.wp_y[i] = steer_point(maze, x, y, size, tx, ty)
+        self.wp_tile[idx] = tile[idx]
+        self.wp_tx[idx] = self.tx[idx]
+        self.wp_ty[idx] = self.ty[idx]
+
+    def _set_target(self, mask, px, py, present, changed):
+        if not mask.any():
+            return
+        self.tx[mask] = px[mask]
+        self.ty[mask] = py[mask]
+        self.has_t[mask] = present[mask]
+        changed |= mask
@@ -0,0 +1,515 @@
+# Hackathon_Stealth_main/AI_Agents/Agent_Behaviours.py
+import math
+import time
+
+import numpy as np
+
+from Hackathon_Stealth_main.utils.utils import in_vision_cone, clamp
+from world.pathfinding import steer_point
+
+
+# Agent types as finite state machines. Each type has:
+# - stats:  StandardAI attributes it overrides (speeds, vision...)
+# - start:  its first behaviour state
+# - states: behaviour state -> {"action": what agents in it do each tick,
+#           "on": {event: next state} checked in order, "timeout": seconds}
+# plus the parameters its actions read (turn_rate, arc) and a draw color.
+#
+# Events:
+# - sees / lost: the agent does / does not see the player this tick
+# - timeout:     the agent has been in the state for its "timeout" seconds
+# - alerted:     the AlertBoard made the agent a responder
+# - hears:       the player's noise (world.noise) reaches the agent's tile;
+#                last_seen becomes where it came from
+# - arrived:     (search) reached the player's last seen position
+# - released:    (investigate) the AlertBoard let the agent go
+#
+# Actions:
+# - patrol:      walk between patrol_endA and patrol_endB at standard_speed
+# - chase:       run at the player (running_speed); reports it to the AlertBoard
+# - search:      run to where the player was last seen (or heard)
+# - investigate: run down the AlertBoard's field to the last sighting
+# - look:        stand still and turn at turn_rate (rad/s), all the way
+#                round, or back and forth across arc (rad) around the
+#                direction it first faced
+# - track:       stand still facing the player; reports it to the AlertBoard
+# - face:        stand still facing where the player was last seen (or heard)
+AGENT_TYPES = {
+    "patroller": {
+        "stats": {},
+        "color": (20, 150, 20),
+        "start": "patrol",
+        "states": {
+            "patrol": {"action": "patrol", "on": {"sees": "chase", "alerted": "investigate", "hears": "search"}},
+            "chase": {"action": "chase", "on": {"lost": "patrol"}},
+            "search": {"action": "search", "timeout": 6.0,
+                       "on": {"sees": "chase", "hears": "search", "arrived": "patrol", "timeout": "patrol"}},
+            "investigate": {"action": "investigate", "on": {"sees": "chase", "released": "patrol"}},
+        },
+    },
+    "sentry": {
+        "stats": {"standard_speed": 0.0, "running_speed": 0.0, "vision_distance": 150.0},
+        "color": (200, 140, 20),
+        "turn_rate": 1.0,
+        "start": "watch",
+        "states": {
+            "watch": {"action": "look", "on": {"sees": "alarm", "hears": "listen"}},
+            "listen": {"action": "face", "timeout": 3.0,
+                       "on": {"sees": "alarm", "hears": "listen", "timeout": "watch"}},
+            "alarm": {"action": "track", "on": {"lost": "watch"}},
+        },
+    },
+    "hunter": {
+        "stats": {"running_speed": 110.0, "vision_distance": 160.0},
+        "color": (170, 30, 30),
+        "turn_rate": 2.0,
+        "start": "patrol",
+        "states": {
+            "patrol": {"action": "patrol", "on": {"sees": "chase", "alerted": "investigate", "hears": "search"}},
+            "chase": {"action": "chase", "on": {"lost": "search"}},
+            "search": {"action": "search", "timeout": 6.0,
+                       "on": {"sees": "chase", "hears": "search", "arrived": "scan", "timeout": "patrol"}},
+            "scan": {"action": "look", "timeout": 3.0,
+                     "on": {"sees": "chase", "hears": "search", "timeout": "patrol"}},
+            "investigate": {"action": "investigate", "on": {"sees": "chase", "released": "patrol"}},
+        },
+    },
+    "camera": {
+        "stats": {"standard_speed": 0.0, "running_speed": 0.0, "vision_distance": 200.0,
+                  "vision_angle": math.pi / 3},
+        "color": (90, 90, 200),
+        "turn_rate": 0.6,
+        "arc": math.pi / 2,
+        "start": "sweep",
+        "states": {
+            "sweep": {"action": "look", "on": {"sees": "spot"}},
+            "spot": {"action": "track", "on": {"lost": "sweep"}},
+        },
+    },
+}
+
+SENSED_EVENTS = ("sees", "lost", "timeout", "alerted", "hears")
+ACTION_EVENTS = ("arrived", "released")
+
+
+def parse_mix(text, types=None):
+    """
+    {type: weight} from "patroller=4,hunter=1" (command lines, replay logs).
+    Raises ValueError for a malformed entry, a type not in types (default
+    AGENT_TYPES) or a weight that is not positive.
+    """
+    types = types if types is not None else AGENT_TYPES
+    mix = {}
+    for entry in text.split(","):
+        kind, sep, weight = entry.strip().partition("=")
+        if not sep:
+            raise ValueError(f"agent mix entry {entry!r} is not TYPE=WEIGHT")
+        if kind not in types:
+            raise ValueError(f"unknown agent type {kind!r} in mix, expected one of {tuple(types)}")
+        try:
+            mix[kind] = float(weight)
+        except ValueError:
+            raise ValueError(f"agent mix entry {entry!r}: weight {weight!r} is not a number") from None
+        if not mix[kind] > 0:
+            raise ValueError(f"agent mix entry {entry!r}: weight must be positive")
+    return mix
+
+
+def format_mix(mix):
+    """The parse_mix text of mix ("" for none)."""
+    return ",".join(f"{kind}={weight:g}" for kind, weight in (mix or {}).items())
+
+
+class _Tick:
+    """What the actions of one BehaviourEngine.step share."""
+
+    __slots__ = ("player", "maze", "dt", "spatial", "navigate", "alerts", "player_tile", "_field")
+
+    def __init__(self, player, maze, dt, spatial, navigate, alerts, player_tile):
+        self.player = player
+        self.maze = maze
+        self.dt = dt
+        self.spatial = spatial
+        self.navigate = navigate
+        self.alerts = alerts
+        self.player_tile = player_tile
+        self._field = None
+
+    def field(self):
+        """The flow field toward the player's tile (built on first use)."""
+        if self._field is None:
+            self._field = self.maze.flow_field(self.player_tile)
+        return self._field
+
+
+def _move(a, vx, vy, tick):
+    """Swept move by (vx, vy) * dt, clamped to the maze, and re-filed in the spatial hash."""
+    maze = tick.maze
+    dt = tick.dt
+    size = a.size
+    a.x, a.y, _ = maze.sweep_box(a.x, a.y, size, vx * dt, vy * dt)
+    a.x = clamp(a.x, 0, max(0, maze.width - size))
+    a.y = clamp(a.y, 0, max(0, maze.height - size))
+    if tick.spatial is not None:
+        tick.spatial.update(a)
+
+
+def _run_at(a, tx, ty, speed):
+    """Face (tx, ty) and return the velocity toward it at speed ((0, 0) if already there)."""
+    dx = tx - a.x
+    dy = ty - a.y
+    mag = math.sqrt(dx * dx + dy * dy)
+    if mag == 0:
+        return 0.0, 0.0
+    nx = dx / mag
+    ny = dy / mag
+    facing = a.facing
+    facing[0] = nx
+    facing[1] = ny
+    return nx * speed, ny * speed
+
+
+def _enter_patrol(a, spec, tick):
+    # back from elsewhere: resume at the nearer patrol endpoint
+    if a.patrol_endA is None or a.patrol_endB is None:
+        a.patrol_target = a.patrol_endA or a.patrol_endB
+    else:
+        ax, ay = a.patrol_endA[0] - a.x, a.patrol_endA[1] - a.y
+        bx, by = a.patrol_endB[0] - a.x, a.patrol_endB[1] - a.y
+        dA = math.sqrt(ax * ax + ay * ay)
+        dB = math.sqrt(bx * bx + by * by)
+        a.patrol_target = a.patrol_endA if dA < dB else a.patrol_endB
+        a._set_facing_toward(a.patrol_target)
+
+
+def _patrol(agents, spec, tick, events):
+    maze = tick.maze
+    navigate = tick.navigate
+    for a in agents:
+        if a.patrol_target is None:
+            a.patrol_target = a.patrol_endA if a.patrol_endA is not None else a.patrol_endB
+
+        if a.reached_patrol_target():
+            if a.patrol_target == a.patrol_endA:
+                a.patrol_target = a.patrol_endB
+            else:
+                a.patrol_target = a.patrol_endA
+            if a.patrol_target is not None:
+                a._set_facing_toward(a.patrol_target)
+
+        vx = vy = 0.0
+        if a.patrol_target is not None:
+            tx, ty = a.patrol_target
+            if navigate:
+                tx, ty = steer_point(maze, a.x, a.y, a.size, tx, ty)
+            vx, vy = _run_at(a, tx, ty, a.standard_speed)
+        _move(a, vx, vy, tick)
+
+
+def _chase(agents, spec, tick, events):
+    player = tick.player
+    alerts = tick.alerts
+    player_tile = tick.player_tile
+    steer = tick.navigate and player_tile >= 0
+    for a in agents:
+        if alerts is not None:
+            alerts.report(player_tile)
+            alerts.release(a)
+        a.last_seen = (player.x, player.y)
+        tx, ty = player.x, player.y
+        if steer:
+            tx, ty = steer_point(tick.maze, a.x, a.y, a.size, tx, ty, player_tile, tick.field())
+        vx, vy = _run_at(a, tx, ty, a.running_speed)
+        _move(a, vx, vy, tick)
+
+
+def _search(agents, spec, tick, events):
+    maze = tick.maze
+    navigate = tick.navigate
+    for a in agents:
+        if a.last_seen is None:
+            events.append((a, "arrived"))
+            continue
+        gx, gy = a.last_seen
+        dx = gx - a.x
+        dy = gy - a.y
+        if math.sqrt(dx * dx + dy * dy) <= 4.0:
+            events.append((a, "arrived"))
+            continue
+        tx, ty = gx, gy
+        if navigate:
+            tx, ty = steer_point(maze, a.x, a.y, a.size, gx, gy)
+        vx, vy = _run_at(a, tx, ty, a.running_speed)
+        _move(a, vx, vy, tick)
+
+
+def _investigate(agents, spec, tick, events):
+    alerts = tick.alerts
+    maze = tick.maze
+    for a in agents:
+        target = alerts.steer(maze, a) if alerts is not None else None
+        if target is None:
+            events.append((a, "released"))
+            continue
+        vx, vy = _run_at(a, target[0], target[1], a.running_speed)
+        _move(a, vx, vy, tick)
+
+
+def _enter_look(a, spec, tick):
+    if spec.get("arc") is None:
+        # turning all the way round: carry on from wherever it faces now
+        a.heading = math.atan2(a.facing[1], a.facing[0])
+
+
+def _look(agents, spec, tick, events):
+    turn = spec.get("turn_rate", 1.0)
+    arc = spec.get("arc")
+    if arc is None:
+        for a in agents:
+            angle = a.heading + turn * a.timer
+            facing = a.facing
+            facing[0] = math.cos(angle)
+            facing[1] = math.sin(angle)
+    else:
+        # back and forth across the arc, at most turn rad/s
+        half = arc / 2
+        rate = turn / half
+        for a in agents:
+            angle = a.heading + half * math.sin(a.timer * rate)
+            facing = a.facing
+            facing[0] = math.cos(angle)
+            facing[1] = math.sin(angle)
+
+
+def _track(agents, spec, tick, events):
+    player = tick.player
+    alerts = tick.alerts
+    for a in agents:
+        if alerts is not None:
+            alerts.report(tick.player_tile)
+        a.last_seen = (player.x, player.y)
+        a._set_facing_toward(a.last_seen)
+
+
+def _face(agents, spec, tick, events):
+    for a in agents:
+        if a.last_seen is not None:
+            a._set_facing_toward(a.last_seen)
+
+
+# action -> (run on entering a state with it or None, run each tick on the whole group)
+ACTIONS = {
+    "patrol": (_enter_patrol, _patrol),
+    "chase": (None, _chase),
+    "search": (None, _search),
+    "investigate": (None, _investigate),
+    "look": (_enter_look, _look),
+    "track": (None, _track),
+    "face": (None, _face),
+}
+
+
+class BehaviourEngine:
+    """
+    Runs agents of several types (AGENT_TYPES) through their behaviour
+    state machines, for Agent_Actions (python backend only; there is no
+    AgentBatch version).
+
+    Agents carry their type (kind) and behaviour state (mode); the engine
+    keeps them grouped by (kind, mode). Each step is two passes over the
+    groups: sensing (vision and the state's events, for the groups whose
+    state reacts to them) moves agents between groups, then each group's
+    action is called once with the type's parameters. Both passes still
+    visit the agents one at a time in Python, vision included; the grouping
+    only saves the per-agent table lookups and the checks a state ignores.
+    Stationary states (look, track, face) never touch the maze or the
+    spatial hash. Hearing is one lookup of the agent's tile in the
+    NoiseModel's sound field, only for the states that listen.
+
+    mix weights the types World.populate hands out (see assign).
+    """
+
+    def __init__(self, types=None, mix=None):
+        self.types = types if types is not None else AGENT_TYPES
+        self.mix = dict(mix) if mix else {"patroller": 1}
+        self._check()
+        self.colors = {kind: spec.get("color", (20, 150, 20)) for kind, spec in self.types.items()}
+        self.reset()
+
+    def _check(self):
+        """Raise ValueError on an inconsistent type table or mix."""
+        events = SENSED_EVENTS + ACTION_EVENTS
+        for kind, spec in self.types.items():
+            states = spec.get("states", {})
+            if spec.get("start") not in states:
+                raise ValueError(f"agent type {kind!r}: start state {spec.get('start')!r} is not one of its states")
+            for name, state in states.items():
+                if state.get("action") not in ACTIONS:
+                    raise ValueError(f"agent type {kind!r}, state {name!r}: unknown action "
+                                     f"{state.get('action')!r}, expected one of {tuple(ACTIONS)}")
+                for event, target in state.get("on", {}).items():
+                    if event not in events:
+                        raise ValueError(f"agent type {kind!r}, state {name!r}: unknown event {event!r}, "
+                                         f"expected one of {events}")
+                    if target not in states:
+                        raise ValueError(f"agent type {kind!r}, state {name!r}: {event!r} goes to unknown "
+                                         f"state {target!r}")
+                if "timeout" in state.get("on", {}) and "timeout" not in state:
+                    raise ValueError(f"agent type {kind!r}, state {name!r}: 'timeout' event without a timeout")
+        for kind in self.mix:
+            if kind not in self.types:
+                raise ValueError(f"unknown agent type {kind!r} in mix, expected one of {tuple(self.types)}")
+
+    def reset(self):
+        """Forget the grouping (new agent set, restored snapshot...); rebuilt on the next step."""
+        self.agents = None
+        self.members = []
+        self.groups = {}   # (kind, mode) -> {agent: None}, insertion-ordered
+
+    # ----------------------------------------------------------------- setup
+
+    def setup(self, agent, kind):
+        """Make agent a kind agent: its stats, and its start state."""
+        spec = self.types[kind]
+        agent.kind = kind
+        for name, value in spec["stats"].items():
+            setattr(agent, name, value)
+        if "vision_angle" in spec["stats"]:
+            agent.cos_half_vision = math.cos(agent.vision_angle / 2)
+        agent.mode = spec["start"]
+        agent.timer = 0.0
+        agent.chasing = False
+        agent.heading = math.atan2(agent.facing[1], agent.facing[0])
+
+    def assign(self, agents, rng):
+        """Draw a type for each of agents from mix (rng: a numpy Generator) and set it up."""
+        kinds = list(self.mix)
+        weights = np.array([self.mix[k] for k in kinds], dtype=np.float64)
+        picks = rng.choice(len(kinds), size=len(agents), p=weights / weights.sum())
+        for agent, k in zip(agents, picks.tolist()):
+            self.setup(agent, kinds[k])
+
+    def _regroup(self, agents):
+        self.agents = agents
+        self.members = list(agents)
+        groups = self.groups = {}
+        for a in self.members:
+            spec = self.types.get(a.kind)
+            if spec is None:
+                raise ValueError(f"unknown agent type {a.kind!r}, expected one of {tuple(self.types)}")
+            if a.mode not in spec["states"]:
+                a.mode = spec["start"]
+            key = (a.kind, a.mode)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {}
+            group[a] = None
+
+    def _matches(self, agents):
+        members = self.members
+        return (agents is self.agents and len(agents) == len(members)
+                and all(a is b for a, b in zip(agents, members)))
+
+    def _switch(self, a, mode, tick):
+        """Move a into behaviour state mode (entering it)."""
+        groups = self.groups
+        del groups[(a.kind, a.mode)][a]
+        key = (a.kind, mode)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {}
+        group[a] = None
+
+        spec = self.types[a.kind]
+        action = spec["states"][mode]["action"]
+        a.mode = mode
+        a.timer = 0.0
+        a.chasing = action == "chase"
+        enter = ACTIONS[action][0]
+        if enter is not None:
+            enter(a, spec, tick)
+
+    # ------------------------------------------------------------------ step
+
+    def step(self, agents, player, maze, dt, spatial=None, candidates=None, player_tile=-1,
+             navigate=True, alerts=None, profiler=None, noise=None):
+        """
+        Advance every agent by dt. candidates, if given, is the set of agents
+        that can possibly see the player; noise, a NoiseModel, has just been
+        listened to (NoiseModel.listen) for what the player made since the
+        last step. Returns the seconds spent sensing and acting (both 0.0
+        without a profiler).
+        """
+        if not self._matches(agents):
+            self._regroup(agents)
+        if profiler is not None:
+            t0 = time.perf_counter()
+        tick = _Tick(player, maze, dt, spatial, navigate, alerts, player_tile)
+        types = self.types
+        heard = noise is not None and bool(noise.sources)
+        if heard:
+            levels = noise.levels
+            sources = noise.sources
+            ts = maze.tile_size
+            cols = maze.cols
+
+        # sense: the events each group's state reacts to
+        switches = []
+        for (kind, mode), group in self.groups.items():
+            if not group:
+                continue
+            state = types[kind]["states"][mode]
+            on = tuple(state.get("on", {}).items())
+            looks = any(event in ("sees", "lost") for event, _ in on)
+            listens = heard and any(event == "hears" for event, _ in on)
+            timeout = state.get("timeout")
+            for a in group:
+                a.timer += dt
+                sees = looks and (candidates is None or a in candidates) and in_vision_cone(a, player, maze)
+                source = -1
+                if listens:
+                    half = a.size / 2
+                    tile = maze.tile_index_at(a.x + half, a.y + half)
+                    if tile in levels:
+                        source = sources[tile]
+                for event, target in on:
+                    if event == "sees":
+                        hit = sees
+                    elif event == "lost":
+                        hit = not sees
+                    elif event == "timeout":
+                        hit = a.timer >= timeout
+                    elif event == "alerted":
+                        hit = alerts is not None and alerts.is_responding(a)
+                    elif event == "hears":
+                        hit = source >= 0
+                        if hit:
+                            # head for the middle of the tile the noise came from
+                            row, col = divmod(source, cols)
+                            half = a.size / 2
+                            a.last_seen = (col * ts + ts / 2 - half, row * ts + ts / 2 - half)
+                    else:
+                        continue
+                    if hit:
+                        switches.append((a, target))
+                        break
+        for a, mode in switches:
+            self._switch(a, mode, tick)
+
+        if profiler is not None:
+            t1 = time.perf_counter()
+
+        # act: one action call per group
+        events = []
+        for (kind, mode), group in self.groups.items():
+            if group:
+                spec = types[kind]
+                ACTIONS[spec["states"][mode]["action"]][1](group, spec, tick, events)
+        for a, event in events:
+            target = types[a.kind]["states"][a.mode].get("on", {}).get(event)
+            if target is not None:
+                self._switch(a, target, tick)
+
+        if profiler is None:
+            return 0.0, 0.0
+        return t1 - t0, time.perf_counter() - t1
@@ -0,0 +1,170 @@
+# Hackathon_Stealth_main/AI_Agents/Agent_Scheduler.py
+import math
+import time
+
+
+class AIScheduler:
+    """
+    Level-of-detail scheduling for Agent_Actions.move_agents (python backend).
+
+    Agents are split into update tiers by distance to the player:
+    - near: within their vision reach of the player (plus near_margin), or
+      chasing. Updated every frame, always, budget or not.
+    - mid:  within mid_distance. Round-robin, each one every mid_period frames.
+    - far:  the rest. Round-robin, each one every far_period frames.
+
+    An agent that sits out frames keeps its time: its next update moves it
+    by the dt accumulated since its last one (capped at max_dt), so slow
+    tiers cover the same ground in fewer, longer steps.
+
+    budget_us caps the time spent on mid/far agents each frame (near agents
+    are never skipped). When it runs out, the agents still owed an update
+    stay at the front of the round-robin queue for the next frame, so a
+    spike in agent count stretches their update period instead of the
+    frame time; at least min_batch of them still run per frame so none
+    starve. Without a budget the schedule depends only on frame count and
+    positions, so recordings (sim.replay) stay deterministic; with one it
+    depends on wall-clock time.
+
+    Tiers are recomputed every retier_frames frames (one distance pass over
+    all agents); the near set is recomputed every frame, from the World's
+    SpatialHash when one is given.
+    """
+
+    def __init__(self, near_margin=64.0, mid_distance=640.0, mid_period=3, far_period=10,
+                 budget_us=None, retier_frames=15, max_dt=0.25, min_batch=32):
+        if mid_period < 1 or far_period < 1:
+            raise ValueError("tier periods must be >= 1")
+        self.near_margin = float(near_margin)
+        self.mid_distance = float(mid_distance)
+        self.mid_period = int(mid_period)
+        self.far_period = int(far_period)
+        self.budget_us = budget_us
+        self.retier_frames = int(retier_frames)
+        self.max_dt = float(max_dt)
+        self.min_batch = int(min_batch)
+        self.reset()
+
+    def reset(self):
+        """Forget all per-agent state (new agent set, restored snapshot...)."""
+        self.time = 0.0
+        self.frame = 0
+        self._frame_dt = 0.0
+        self._last = {}          # agent -> self.time at its last update
+        self._count = -1
+        self._first = None
+        self._tiers = ([], [])   # mid, far
+        self._cursors = [0, 0]
+        self._owed = [0, 0]      # round-robin updates carried over from earlier frames
+        # last frame: agents updated (near, round-robin) and round-robin updates deferred
+        self.stats = (0, 0, 0)
+
+    def _retier(self, agents, player):
+        px, py = player.x, player.y
+        mid_sq = self.mid_distance * self.mid_distance
+        mid = []
+        far = []
+        for a in agents:
+            dx = a.x - px
+            dy = a.y - py
+            if dx * dx + dy * dy <= mid_sq:
+                mid.append(a)
+            else:
+                far.append(a)
+        self._tiers = (mid, far)
+        # carry on from about the same place rather than restarting each pass
+        self._cursors = [self._cursors[0] % max(1, len(mid)), self._cursors[1] % max(1, len(far))]
+        # owed updates only make sense within the old lists' sizes
+        self._owed = [min(self._owed[0], len(mid)), min(self._owed[1], len(far))]
+
+    def _near(self, agents, player, spatial):
+        margin = self.near_margin
+        if spatial is not None:
+            # chasers saw the player last update, so they are within max_reach too
+            reach = spatial.max_reach + margin
+            return [e for e in spatial.query_radius(player.x, player.y, reach) if e is not player]
+        px, py = player.x, player.y
+        near = []
+        for a in agents:
+            dx = a.x - px
+            dy = a.y - py
+            reach = a.vision_distance + margin
+            if a.chasing or dx * dx + dy * dy <= reach * reach:
+                near.append(a)
+        return near
+
+    def _dts(self, agents):
+        """Accumulated dt for each agent (and mark them updated now)."""
+        now = self.time
+        last = self._last
+        cap = self.max_dt
+        first = now - self._frame_dt
+        dts = []
+        for a in agents:
+            elapsed = now - last.get(a, first)
+            dts.append(elapsed if elapsed < cap else cap)
+            last[a] = now
+        return dts
+
+    def run(self, agents, player, dt, spatial, step):
+        """
+        Advance one frame of dt seconds: calls step(agent_list, dt_list) for
+        the near agents and then for round-robin batches until every tier's
+        quota is met or the budget is spent.
+        """
+        t_start = time.perf_counter()
+        self.time += dt
+        self._frame_dt = dt
+        self.frame += 1
+
+        count = len(agents)
+        first = agents[0] if count else None
+        if count != self._count or first is not self._first:
+            # a different agent set: start over with it
+            self._last = {}
+            self._count = count
+            self._first = first
+            self._owed = [0, 0]
+            self._retier(agents, player)
+        elif self.frame % self.retier_frames == 0:
+            self._retier(agents, player)
+
+        near = self._near(agents, player, spatial)
+        if near:
+            step(near, self._dts(near))
+        near_set = set(near)
+
+        deadline = None
+        if self.budget_us is not None:
+            deadline = t_start + self.budget_us / 1e6
+
+        updated = 0
+        deferred = 0
+        batch = self.min_batch
+        for tier, period in ((0, self.mid_period), (1, self.far_period)):
+            members = self._tiers[tier]
+            size = len(members)
+            if size == 0:
+                continue
+            # this frame's share, plus whatever earlier frames could not afford
+            quota = min(size, self._owed[tier] + math.ceil(size / period))
+            cursor = self._cursors[tier]
+            while quota > 0:
+                if deadline is not None and updated >= self.min_batch and time.perf_counter() >= deadline:
+                    break
+                take = min(batch, quota)
+                chunk = []
+                for _ in range(take):
+                    a = members[cursor]
+                    cursor = cursor + 1 if cursor + 1 < size else 0
+                    if a not in near_set:
+                        chunk.append(a)
+                quota -= take
+                if chunk:
+                    step(chunk, self._dts(chunk))
+                    updated += len(chunk)
+            self._cursors[tier] = cursor
+            self._owed[tier] = quota
+            deferred += quota
+
+        self.stats = (len(near), updated, deferred)
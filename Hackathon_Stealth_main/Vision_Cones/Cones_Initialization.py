@@ -1,15 +1,206 @@
 import pygame
-import math
+from functools import lru_cache
+
+import numpy as np
+
+from world.maze import VIS_CLEAR
+
+# pixels between wall probes when clipping cone rays against the maze
+CLIP_STEP = 4.0
+
+
+def cone_steps(vision_angle):
+    """Number of fan segments for a cone (scales detail with angle)."""
+    return max(3, int(vision_angle * 10))
+
+
+@lru_cache(maxsize=64)
+def fan_template(vision_angle, steps):
+    """
+    Unit fan for a cone facing +x: (steps + 1, 2) array of (cos, sin) of the
+    ray offsets -angle/2 .. +angle/2. Rotating it by a facing vector gives the
+    ray directions, so cos/sin run once per (angle, steps), not per frame.
+    """
+    offsets = -vision_angle / 2 + np.arange(steps + 1) * vision_angle / steps
+    fan = np.column_stack((np.cos(offsets), np.sin(offsets)))
+    fan.flags.writeable = False
+    return fan
+
+
+def fan_directions(fan, fx, fy):
+    """Rotate a fan template by facing vectors fx, fy (arrays, shape (n,)) -> (n, k, 2)."""
+    c = fan[:, 0]
+    s = fan[:, 1]
+    fx = np.asarray(fx, dtype=np.float64)[:, None]
+    fy = np.asarray(fy, dtype=np.float64)[:, None]
+    return np.stack((fx * c - fy * s, fy * c + fx * s), axis=-1)
+
+
+def clip_rays(maze, ox, oy, dirs, lengths, step=CLIP_STEP):
+    """
+    Shorten rays (origins ox/oy shape (n,), dirs (n, k, 2), lengths (n,)) so
+    they stop at the first wall. Rays the maze's visibility index reports as
+    clear end to end are left alone; only the rest are marched. Returns an
+    (n, k) array of ray lengths.
+    """
+    n, k, _ = dirs.shape
+    ox = np.broadcast_to(np.asarray(ox, dtype=np.float64)[:, None], (n, k))
+    oy = np.broadcast_to(np.asarray(oy, dtype=np.float64)[:, None], (n, k))
+    full = np.broadcast_to(np.asarray(lengths, dtype=np.float64)[:, None], (n, k))
+    ex = ox + dirs[..., 0] * full
+    ey = oy + dirs[..., 1] * full
+
+    out = full.copy()
+    marching = maze.visibility_between_many(ox, oy, ex, ey, step) != VIS_CLEAR
+    if not marching.any():
+        return out
+
+    mx = ox[marching]
+    my = oy[marching]
+    dx = dirs[..., 0][marching]
+    dy = dirs[..., 1][marching]
+    limit = full[marching]
+    hit_at = limit.copy()
+    live = np.ones(mx.shape, dtype=np.bool_)
+    t = 0.0
+    t_max = float(limit.max())
+    while t < t_max and live.any():
+        t = min(t + step, t_max)
+        live &= t <= limit
+        idx = np.flatnonzero(live)
+        if idx.size == 0:
+            break
+        hit = maze.walls_at_pixels(mx[idx] + dx[idx] * t, my[idx] + dy[idx] * t)
+        stopped = idx[hit]
+        hit_at[stopped] = t - step if t > step else 0.0
+        live[stopped] = False
+
+    out[marching] = hit_at
+    return out
+
+
+class ConeRenderer:
+    """
+    Draws every agent's vision cone for one frame into a single overlay.
+
+    Cone outlines come from cached fan templates rotated and translated for
+    all agents at once with NumPy. With clip=True (and a maze passed to draw)
+    each ray stops at the first wall, so the overlay shows what the agent can
+    actually see. fill_alpha > 0 fills the cones translucently as well.
+    """
+
+    def __init__(self, color=(255, 255, 0), clip=False, fill_alpha=0):
+        self.color = color
+        self.clip = clip
+        self.fill_alpha = fill_alpha
+        self._overlay = None
+        self._drawn = []  # overlay rects drawn last frame
+
+    def _cone_groups(self, agents, maze=None):
+        """Yield (agent indices, (m, k + 2, 2) polygon array) per vision_angle group."""
+        groups = {}
+        for i, a in enumerate(agents):
+            groups.setdefault(a.vision_angle, []).append(i)
+
+        for angle, idx in groups.items():
+            fan = fan_template(angle, cone_steps(angle))
+            members = [agents[i] for i in idx]
+            m = len(members)
+            ox = np.fromiter((a.x for a in members), dtype=np.float64, count=m)
+            oy = np.fromiter((a.y for a in members), dtype=np.float64, count=m)
+            fx = np.fromiter((a.facing[0] for a in members), dtype=np.float64, count=m)
+            fy = np.fromiter((a.facing[1] for a in members), dtype=np.float64, count=m)
+            dist = np.fromiter((a.vision_distance for a in members), dtype=np.float64, count=m)
+
+            # cones leave the agent's centre, where its vision checks start
+            half = np.fromiter((a.size / 2 for a in members), dtype=np.float64, count=m)
+            ox += half
+            oy += half
+
+            dirs = fan_directions(fan, fx, fy)
+            if self.clip and maze is not None:
+                lengths = clip_rays(maze, ox, oy, dirs, dist)
+            else:
+                lengths = dist[:, None]
+
+            pts = np.empty((m, fan.shape[0] + 1, 2))
+            pts[:, 0, 0] = ox
+            pts[:, 0, 1] = oy
+            pts[:, 1:, 0] = ox[:, None] + dirs[..., 0] * lengths
+            pts[:, 1:, 1] = oy[:, None] + dirs[..., 1] * lengths
+            yield idx, pts
+
+    def polygons(self, agents, maze=None):
+        """Cone polygons as a list of (k + 2, 2) float arrays, one per agent."""
+        out = [None] * len(agents)
+        for idx, pts in self._cone_groups(agents, maze):
+            for j, i in enumerate(idx):
+                out[i] = pts[j]
+        return out
+
+    def _overlay_for(self, screen):
+        """The reusable overlay, with last frame's cones wiped off."""
+        size = screen.get_size()
+        overlay = self._overlay
+        if overlay is None or overlay.get_size() != size:
+            overlay = self._overlay = pygame.Surface(size, pygame.SRCALPHA)
+        else:
+            for r in self._drawn:
+                overlay.fill((0, 0, 0, 0), r)
+        self._drawn = []
+        return overlay
+
+    def draw(self, screen, agents, maze=None, offset=(0, 0)):
+        """
+        Render all cones into the overlay and copy the covered areas onto
+        screen, with world pixel offset at the screen's top-left. Returns
+        the list of screen Rects touched (for dirty-rect presentation).
+        """
+        overlay = self._overlay_for(screen)
+        if not agents:
+            return []
+        w, h = overlay.get_size()
+        fill = self.color + (self.fill_alpha,) if self.fill_alpha > 0 else None
+        outline = self.color + (255,)
+        rects = self._drawn
+        for _, pts in self._cone_groups(agents, maze):
+            if offset != (0, 0):
+                pts -= offset
+            # skip cones entirely off screen
+            lo = pts.min(axis=1)
+            hi = pts.max(axis=1)
+            visible = (hi[:, 0] >= 0) & (hi[:, 1] >= 0) & (lo[:, 0] < w) & (lo[:, 1] < h)
+            for points in pts[visible].tolist():
+                if fill is not None:
+                    pygame.draw.polygon(overlay, fill, points)
+                rects.append(pygame.draw.polygon(overlay, outline, points, 1))
+
+        if not rects:
+            return []
+        area = 0
+        for r in rects:
+            area += r.w * r.h
+        if area >= w * h:
+            screen.blit(overlay, (0, 0))
+            return [screen.get_rect()]
+        if fill is not None:
+            # translucent fills must not be blended twice where rects overlap
+            bounds = rects[0].unionall(rects)
+            screen.blit(overlay, bounds, bounds)
+            return [bounds]
+        screen.blits([(overlay, r, r) for r in rects], doreturn=False)
+        return rects
+
 
 def draw_vision_cone(agent, screen, color=(255,255,0)):
-    steps = max(3, int(agent.vision_angle * 10))  # scale detail with angle
-    base_angle = math.atan2(agent.facing[1], agent.facing[0])
+    """Outline one agent's (unclipped) cone directly on screen."""
+    steps = cone_steps(agent.vision_angle)
+    fan = fan_template(agent.vision_angle, steps)
+    dirs = fan_directions(fan, (agent.facing[0],), (agent.facing[1],))[0]
 
-    points = [(agent.x, agent.y)]
-    for i in range(steps + 1):
-        a = base_angle - agent.vision_angle/2 + i * agent.vision_angle / steps
-        x = agent.x + agent.vision_distance * math.cos(a)
-        y = agent.y + agent.vision_distance * math.sin(a)
-        points.append((x, y))
+    half = agent.size / 2
+    origin = (agent.x + half, agent.y + half)
+    points = [origin]
+    points.extend((dirs * agent.vision_distance + origin).tolist())
 
-    pygame.draw.polygon(screen, color, points, 1)
\ No newline at end of file
+    pygame.draw.polygon(screen, color, points, 1)
@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 import pygame
@@ -8,40 +9,84 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from world.world import World
-from world.settings import MAZE_WIDTH, MAZE_LENGTH, FPS
-from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from world.input import ActionMap
+from world.settings import AGENT_MIX, MAZE_WIDTH, MAZE_LENGTH, FPS
+from states.loading_state import LoadingState
+
+
+def first_level(agent_mix=None):
+    """The level the game starts on; its modules are imported on first use."""
+    from states.playing_state import PlayingState
+    return PlayingState(agent_mix=agent_mix)
 
 
 def main():
-    pygame.init()
-    screen = pygame.display.set_mode((MAZE_WIDTH, MAZE_LENGTH))
-    clock = pygame.time.Clock()
+    parser = argparse.ArgumentParser(description="Maze stealth game.")
+    parser.add_argument("--seed", type=int, default=None, help="world seed (default: random)")
+    parser.add_argument("--record", metavar="PATH", help="record the session for sim.replay")
+    parser.add_argument("--profile", action="store_true", help="start with the profiler HUD on (F3 toggles)")
+    parser.add_argument("--trace", metavar="PATH", help="on exit, write the profiler's Chrome trace JSON here")
+    parser.add_argument("--bind", metavar="ACTION=KEYS", action="append", default=[],
+                        help="rebind an action to comma-separated pygame key names, e.g. up=i,up")
+    parser.add_argument("--behaviours", action="store_true",
+                        help="mixed agent types from settings.AGENT_MIX (default: settings.AI_BEHAVIOURS)")
+    parser.add_argument("--agent-mix", metavar="TYPE=WEIGHT,...",
+                        help="mixed agent types by weight, e.g. patroller=4,hunter=1,sentry=1,camera=1")
+    args = parser.parse_args()
+
+    agent_mix = AGENT_MIX if args.behaviours else None
+    if args.agent_mix:
+        from Hackathon_Stealth_main.AI_Agents.Agent_Behaviours import parse_mix
+        try:
+            agent_mix = parse_mix(args.agent_mix)
+        except ValueError as e:
+            parser.error(f"--agent-mix: {e}")
 
-    world = World(MAZE_WIDTH, MAZE_LENGTH)
-    world.populate()
+    pygame.init()
+    action_map = ActionMap()
+    for binding in args.bind:
+        name, _, keys = binding.partition("=")
+        try:
+            action_map.bind(name, *(pygame.key.key_code(k) for k in keys.split(",") if k))
+        except ValueError as e:
+            parser.error(f"--bind {binding}: {e}")
 
-    font = pygame.font.SysFont(None, 24)
+    # World.update ticks the clock (capped at FPS) and runs the player and
+    # agents at their own fixed rates; draw interpolates between steps.
+    # The window opens on a loading screen: the level (maze, AI and vision
+    # modules, prerendered maze) is built on World's loader thread while it
+    # shows, and the first update after that spawns the agents.
+    world = World(MAZE_WIDTH, MAZE_LENGTH, fps=FPS, seed=args.seed, fixed_step=True, action_map=action_map,
+                  state=LoadingState())
+    if args.record:
+        # the log starts with the level and its agents: build them up front
+        from sim.replay import Recorder
+        world.change_state(first_level(agent_mix))
+        world.populate()
+        world.recorder = Recorder(args.record, world)
+    else:
+        # present the loading screen before the build starts sharing the GIL
+        world.draw()
+        world.load_state(lambda: first_level(agent_mix))
+    if args.profile or args.trace:
+        world.toggle_profiler()
+        world.profiler.show_hud = args.profile
 
-    running = True
-    while running and world.running:
-        # let the world collect and handle its events (including QUIT)
+    while world.running:
+        # the world drains the event queue (including QUIT) for everyone
         world.handle_events()
 
-        # simple fallback: also catch QUIT from the main loop event queue
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
         # --- update
         world.update()
 
-        # --- draw
-        screen.fill((30, 30, 30))
+        # --- draw (World.draw presents the frame)
         world.draw()
 
-        pygame.display.flip()
-        clock.tick(FPS)
-
+    if world.recorder is not None:
+        world.recorder.close()
+    if args.trace and world.profiler is not None:
+        world.profiler.export_chrome_trace(args.trace)
+    world.close()
     pygame.quit()
     sys.exit()
 
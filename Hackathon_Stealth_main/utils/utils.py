@@ -1,5 +1,7 @@
 import math
 
+from world.maze import VIS_CLEAR, VIS_UNKNOWN
+
 def distance(a, b):
         return math.hypot(a.x - b.x, a.y - b.y)
 
@@ -49,6 +51,11 @@ def in_vision_cone(agent, target, maze):
     step_x = (tx - ax) / steps
     step_y = (ty - ay) / steps
 
+    # Precomputed tile-to-tile visibility answers most rays without marching
+    cls = maze.visibility_between(ax, ay, tx, ty, max(abs(step_x), abs(step_y)))
+    if cls != VIS_UNKNOWN:
+        return cls == VIS_CLEAR
+
     px = ax
     py = ay
 
@@ -0,0 +1,107 @@
+"""
+Compare the "python" and "numpy" Agent_Actions backends.
+
+Runs both backends side by side on the PlayingState maze with the same seeded
+agents and the same random player walk, checks that every agent attribute
+matches exactly after every frame, and reports the average move_agents time.
+
+    python benchmarks/bench_agent_backends.py --counts 7 100 1000 5000 --frames 300
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from world.world import World
+from world.spatial_hash import SpatialHash
+from world.settings import SPATIAL_CELL_SIZE
+from Hackathon_Stealth_main.AI_Agents.Agent_Actions import Agent_Actions
+
+
+def snapshot(agents):
+    return [
+        (a.x, a.y, a.facing, a.chasing, a.patrol_target)
+        for a in agents
+    ]
+
+
+def make_spatial(player, agents):
+    spatial = SpatialHash(SPATIAL_CELL_SIZE)
+    spatial.insert(player)
+    for a in agents:
+        spatial.insert(a, reach=a.vision_distance)
+    return spatial
+
+
+def run(count, frames, seed, dt, use_spatial):
+    world = World(320, 320, seed=seed)
+    world.populate(count)
+    state = world.current_state
+    maze = state.maze
+
+    agents_py = world.agents
+    agents_np = copy.deepcopy(agents_py)
+    player_py = state.player
+    player_np = copy.deepcopy(player_py)
+
+    python_actions = Agent_Actions(backend="python")
+    numpy_actions = Agent_Actions(backend="numpy")
+    spatial_py = make_spatial(player_py, agents_py) if use_spatial else None
+    spatial_np = make_spatial(player_np, agents_np) if use_spatial else None
+
+    walk = random.Random(seed + 1)
+    t_py = 0.0
+    t_np = 0.0
+    mismatches = 0
+    for frame in range(frames):
+        dx = walk.choice((-1, 0, 1))
+        dy = walk.choice((-1, 0, 1))
+        player_py.update(dt, maze, dx, dy, spatial_py)
+        player_np.update(dt, maze, dx, dy, spatial_np)
+
+        t0 = time.perf_counter()
+        python_actions.move_agents(agents_py, player_py, maze, dt, spatial_py)
+        t1 = time.perf_counter()
+        numpy_actions.move_agents(agents_np, player_np, maze, dt, spatial_np)
+        t2 = time.perf_counter()
+        t_py += t1 - t0
+        t_np += t2 - t1
+
+        if snapshot(agents_py) != snapshot(agents_np):
+            mismatches += 1
+
+    return t_py / frames, t_np / frames, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[7, 100, 1000, 5000])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--dt", type=float, default=1 / 60)
+    parser.add_argument("--spatial", action="store_true", help="give both backends a SpatialHash")
+    args = parser.parse_args()
+
+    pygame.init()
+    print(f"{'agents':>8} {'python ms':>10} {'numpy ms':>10} {'speedup':>8} {'mismatched frames':>18}")
+    failed = False
+    for count in args.counts:
+        t_py, t_np, mismatches = run(count, args.frames, args.seed, args.dt, args.spatial)
+        failed |= mismatches > 0
+        print(f"{count:>8} {t_py * 1000:>10.3f} {t_np * 1000:>10.3f} {t_py / t_np:>8.1f} {mismatches:>18}")
+    pygame.quit()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Hearing benchmark: noise field search, cached re-use and listener lookups.
+
+On the built-in level repeated scales x scales times, noises are emitted
+from random floor tiles and listen()ed to, first with a cold NoiseModel
+cache (every source is a bounded Dijkstra), then again from the same
+sources (every source is a cache hit). Then `listeners` agents each look
+up their tile in the sound field, as BehaviourEngine's "hears" does.
+
+    python benchmarks/bench_noise.py --scales 4 16 --noises 2000 --listeners 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from world.maze import Maze
+from world.noise import NoiseModel
+from world.settings import NOISE_REACH, NOISE_RUN
+from states.playing_state import PlayingState
+from sim.headless import tile_grid
+
+
+def bench(scale, noises, listeners, seed):
+    state = PlayingState()
+    maze = Maze(tile_grid(state.grid, scale), state.tile_size, visibility_radius=0)
+    rng = random.Random(seed)
+    floor = maze.floor_indices().tolist()
+    sources = [rng.choice(floor) for _ in range(noises)]
+    model = NoiseModel(NOISE_REACH, cache_size=noises)
+
+    def run():
+        t0 = time.perf_counter()
+        for tile in sources:
+            model.emit(tile, NOISE_RUN)
+            model.listen(maze)
+        return (time.perf_counter() - t0) * 1e6 / noises
+
+    cold = run()
+    warm = run()
+
+    # listeners spread over the map, hearing the last noise
+    ts = maze.tile_size
+    agents = [(rng.uniform(0, maze.width - 1), rng.uniform(0, maze.height - 1)) for _ in range(listeners)]
+    levels = model.levels
+    t0 = time.perf_counter()
+    heard = 0
+    for x, y in agents:
+        if maze.tile_index_at(x, y) in levels:
+            heard += 1
+    query_ns = (time.perf_counter() - t0) * 1e9 / listeners
+    print(f"{maze.rows:>5}x{maze.cols:<5} {len(floor):>8} {len(levels):>8} {cold:>10.1f} {warm:>10.1f} "
+          f"{cold / warm if warm > 0 else 0:>8.1f} {query_ns:>10.0f} {heard:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--noises", type=int, default=2000)
+    parser.add_argument("--listeners", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'grid':>11} {'floor':>8} {'heard on':>8} {'cold us':>10} {'cached us':>10} {'speedup':>8} "
+          f"{'query ns':>10} {'heard':>6}")
+    for scale in args.scales:
+        bench(scale, args.noises, args.listeners, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+SpatialHash benchmark for 1k-50k agents.
+
+Scatters agents over a large maze (tiled copies of the PlayingState level),
+then measures:
+- build:   inserting every agent
+- update:  one frame of small random moves followed by SpatialHash.update
+- query:   radius query around the player vs a brute-force scan (same result)
+- vision:  in_vision_cone over all agents vs only the hash candidates
+
+    python benchmarks/bench_spatial_hash.py --counts 1000 10000 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from world.maze import Maze, WALL
+from world.settings import SPATIAL_CELL_SIZE
+from world.spatial_hash import SpatialHash
+from states.playing_state import PlayingState
+from entities.player import Player
+from sim.headless import tile_grid
+from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from Hackathon_Stealth_main.utils.utils import in_vision_cone
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def bench(count, maze, floor, seed):
+    rng = random.Random(seed)
+    ts = maze.tile_size
+    agents = []
+    for _ in range(count):
+        r, c = rng.choice(floor)
+        a = StandardAI(c * ts + rng.uniform(0, ts - 6), r * ts + rng.uniform(0, ts - 6))
+        a.set_facing_toward((rng.uniform(0, maze.width), rng.uniform(0, maze.height)))
+        agents.append(a)
+    r, c = rng.choice(floor)
+    player = Player(c * ts + 20, r * ts + 20)
+
+    def build():
+        spatial = SpatialHash(SPATIAL_CELL_SIZE)
+        spatial.insert(player)
+        for a in agents:
+            spatial.insert(a, reach=a.vision_distance)
+        return spatial
+
+    t_build, spatial = timed(build)
+
+    # one frame of movement at running speed
+    def update():
+        for a in agents:
+            a.x += rng.uniform(-1.5, 1.5)
+            a.y += rng.uniform(-1.5, 1.5)
+            spatial.update(a)
+
+    t_update, _ = timed(update)
+
+    reach = spatial.max_reach
+
+    def brute():
+        out = []
+        for a in agents:
+            dx = a.x - player.x
+            dy = a.y - player.y
+            if dx * dx + dy * dy <= reach * reach:
+                out.append(a)
+        return out
+
+    t_brute, near_brute = timed(brute)
+    t_query, near_hash = timed(lambda: [e for e in spatial.query_radius(player.x, player.y, reach)
+                                        if e is not player])
+    assert set(near_brute) == set(near_hash), "hash query disagrees with brute force"
+
+    t_vis_all, seen_all = timed(lambda: [a for a in agents if in_vision_cone(a, player, maze)])
+
+    def vision_hash():
+        candidates = set(spatial.query_radius(player.x, player.y, reach))
+        return [a for a in agents if a in candidates and in_vision_cone(a, player, maze)]
+
+    t_vis_hash, seen_hash = timed(vision_hash)
+    assert seen_all == seen_hash, "hash-filtered vision disagrees with the full scan"
+
+    print(f"{count:>8} {t_build * 1000:>9.2f} {t_update * 1000:>9.2f} "
+          f"{t_brute * 1000:>9.3f} {t_query * 1000:>9.3f} {len(near_hash):>6} "
+          f"{t_vis_all * 1000:>9.2f} {t_vis_hash * 1000:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 5000, 10000, 50000])
+    parser.add_argument("--scale", type=int, default=12, help="maze = scale x scale copies of the 16x16 level")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    maze = Maze(tile_grid(PlayingState().grid, args.scale), 50)
+    floor = [(r, c) for r in range(maze.rows) for c in range(maze.cols) if maze.grid[r][c] != WALL]
+    print(f"maze {maze.rows}x{maze.cols} tiles, cell size {SPATIAL_CELL_SIZE}px (times in ms)")
+    print(f"{'agents':>8} {'build':>9} {'update':>9} {'brute q':>9} {'hash q':>9} {'near':>6} "
+          f"{'vis all':>9} {'vis hash':>9}")
+    for count in args.counts:
+        bench(count, maze, floor, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Cold-start benchmark for Hackathon_Stealth_main/main.py.
+
+Each measurement runs in a fresh interpreter, so nothing is cached between
+runs except what the OS keeps (run it twice and read the second one):
+- import ms:      total of `python -X importtime main.py --help`, i.e. every
+                  module main.py pulls in before it can parse its arguments
+- first frame ms: from launching `main.py` to its first presented frame
+- playable ms:    from launching `main.py` to the first frame presented with
+                  the PlayingState active (agents spawn on its first AI step)
+
+Frames are detected by wrapping pygame.display.flip / update in the child
+(SDL's dummy video driver unless SDL_VIDEODRIVER is set); the child exits
+right after the playable frame. The heaviest imports are listed too.
+
+--save PATH stores the medians as a baseline; --baseline PATH compares
+against one and exits 1 if any metric got slower by more than --tolerance:
+
+    python benchmarks/bench_startup.py --runs 5 --save startup.json
+    python benchmarks/bench_startup.py --runs 5 --baseline startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MAIN = os.path.join(PROJECT_ROOT, "Hackathon_Stealth_main", "main.py")
+
+METRICS = ("import_ms", "first_frame_ms", "playable_ms")
+
+# runs main.py with presentation wrapped; prints the wall-clock times of its
+# first frame and first playable frame as JSON, then exits
+CHILD = r"""
+import json, os, runpy, sys, time
+import pygame
+
+marks = {}
+
+def mark():
+    if "first_frame" not in marks:
+        marks["first_frame"] = time.time()
+    world = sys.modules.get("world.world")
+    game = getattr(world, "_bench_world", None) if world else None
+    state = game.current_state if game is not None else None
+    if type(state).__name__ == "PlayingState":
+        marks["playable"] = time.time()
+        print(json.dumps(marks), flush=True)
+        os._exit(0)
+
+def wrap(fn):
+    def presented(*args):
+        result = fn(*args)
+        mark()
+        return result
+    return presented
+
+pygame.display.flip = wrap(pygame.display.flip)
+pygame.display.update = wrap(pygame.display.update)
+
+import world.world as world_module
+init = world_module.World.__init__
+def remember(self, *args, **kwargs):
+    world_module._bench_world = self
+    init(self, *args, **kwargs)
+world_module.World.__init__ = remember
+
+sys.argv = [sys.argv[1]] + sys.argv[2:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    # no stale-bytecode writes skewing the first run
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def import_profile():
+    """(total import ms, [(cumulative ms, module)] of every import) of one cold main.py start."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", MAIN, "--help"], env=child_env(),
+                          capture_output=True, text=True, check=True)
+    total_us = 0
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        us = int(cumulative)
+        modules.append((us / 1000.0, name.strip()))
+        if not name.startswith("  "):
+            # top-level imports; nested ones are already in their parent's total
+            total_us += us
+    return total_us / 1000.0, modules
+
+
+def frame_times():
+    """(first frame ms, playable ms) of one cold main.py start."""
+    t0 = time.time()
+    proc = subprocess.run([sys.executable, "-c", CHILD, MAIN, "--seed", "1"], env=child_env(),
+                          capture_output=True, text=True, timeout=120)
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"main.py did not reach a playable frame:\n{proc.stderr}")
+    marks = json.loads(lines[-1])
+    return (marks["first_frame"] - t0) * 1000.0, (marks["playable"] - t0) * 1000.0
+
+
+def measure(runs):
+    """Median of each metric over runs cold starts, plus the heaviest imports of the last one."""
+    samples = {m: [] for m in METRICS}
+    modules = []
+    for _ in range(runs):
+        import_ms, modules = import_profile()
+        first, playable = frame_times()
+        samples["import_ms"].append(import_ms)
+        samples["first_frame_ms"].append(first)
+        samples["playable_ms"].append(playable)
+    return {m: statistics.median(v) for m, v in samples.items()}, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline JSON file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown over the baseline, as a fraction (default 0.25)")
+    args = parser.parse_args()
+
+    results, modules = measure(args.runs)
+
+    print(f"{'import':>48} {'cumulative ms':>14}")
+    for ms, name in sorted(modules, reverse=True)[:args.top]:
+        print(f"{name:>48} {ms:>14.1f}")
+    print()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failed = 0
+    print(f"{'metric':>16} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for metric in METRICS:
+        value = results[metric]
+        if baseline is None or metric not in baseline:
+            print(f"{metric:>16} {value:>10.1f}")
+            continue
+        base = baseline[metric]
+        change = value / base - 1.0 if base > 0 else 0.0
+        regressed = change > args.tolerance
+        failed += regressed
+        print(f"{metric:>16} {value:>10.1f} {base:>10.1f} {change:>+8.1%}" + ("  REGRESSION" if regressed else ""))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"runs": args.runs, **results}, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Line-of-sight benchmark: precomputed visibility index vs the plain ray march.
+
+For each grid, random agent/target pairs inside vision range are generated
+(agents always face their target so every query reaches the line-of-sight
+stage of utils.in_vision_cone). The same queries are answered by a Maze built
+with the visibility index and by one built with visibility_radius=0; answers
+must agree and the per-query time is reported.
+
+    python benchmarks/bench_visibility.py --queries 20000 --sizes 64 256
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from world.maze import Maze, WALL, FLOOR, VIS_UNKNOWN
+from states.playing_state import PlayingState
+from entities.player import Player
+from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from Hackathon_Stealth_main.utils.utils import in_vision_cone
+
+
+def random_grid(rows, cols, wall_density, seed):
+    """Bordered grid with randomly scattered walls."""
+    rng = random.Random(seed)
+    grid = []
+    for r in range(rows):
+        row = []
+        for c in range(cols):
+            border = r in (0, rows - 1) or c in (0, cols - 1)
+            row.append(WALL if border or rng.random() < wall_density else FLOOR)
+        grid.append(row)
+    return grid
+
+
+def make_queries(grid, tile_size, count, seed):
+    rng = random.Random(seed)
+    floor = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v != WALL]
+    queries = []
+    while len(queries) < count:
+        r, c = rng.choice(floor)
+        agent = StandardAI(c * tile_size + rng.uniform(0, tile_size - 6),
+                           r * tile_size + rng.uniform(0, tile_size - 6))
+        reach = rng.uniform(12, agent.vision_distance)
+        angle = rng.uniform(0, 6.283185307179586)
+        target = Player(agent.x + reach * math.cos(angle), agent.y + reach * math.sin(angle))
+        agent.set_facing_toward((target.x, target.y))
+        queries.append((agent, target))
+    return queries
+
+
+def time_queries(queries, maze, repeat):
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = [in_vision_cone(a, t, maze) for a, t in queries]
+        best = min(best, time.perf_counter() - t0)
+    return best, results
+
+
+def resolved_fraction(queries, maze):
+    """Share of queries the index answers without falling back to the ray march."""
+    resolved = 0
+    for agent, target in queries:
+        ax = agent.x + agent.size / 2
+        ay = agent.y + agent.size / 2
+        steps = int(math.hypot(target.x - agent.x, target.y - agent.y) // 6)
+        step = max(abs(target.x - ax), abs(target.y - ay)) / steps
+        resolved += maze.visibility_between(ax, ay, target.x, target.y, step) != VIS_UNKNOWN
+    return resolved / len(queries)
+
+
+def bench(name, grid, tile_size, queries_n, repeat, seed):
+    indexed = Maze(grid, tile_size)
+    t0 = time.perf_counter()
+    indexed.build_visibility_index(indexed.visibility_radius)
+    build = time.perf_counter() - t0
+    marched = Maze(grid, tile_size, visibility_radius=0)
+
+    queries = make_queries(grid, tile_size, queries_n, seed)
+    t_march, r_march = time_queries(queries, marched, repeat)
+    t_index, r_index = time_queries(queries, indexed, repeat)
+    mismatches = sum(a != b for a, b in zip(r_march, r_index))
+
+    per = 1e6 / len(queries)
+    print(f"{name:>14} {build * 1000:>9.1f} {len(indexed.visibility) / 1024:>9.0f} "
+          f"{resolved_fraction(queries, indexed) * 100:>9.1f} "
+          f"{t_march * per:>10.2f} {t_index * per:>10.2f} {t_march / t_index:>8.1f} {mismatches:>10}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'grid':>14} {'build ms':>9} {'index KiB':>9} {'resolved%':>9} {'march us':>10} {'index us':>10} {'speedup':>8} {'mismatches':>10}")
+    state = PlayingState()
+    failed = bench("playing 16x16", state.grid, state.tile_size, args.queries, args.repeat, args.seed)
+    for size in args.sizes:
+        grid = random_grid(size, size, args.density, args.seed + size)
+        failed += bench(f"random {size}x{size}", grid, 50, args.queries, args.repeat, args.seed)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 import pygame
 
+from world.settings import NOISE_BUMP, NOISE_RUN, RUN_FACTOR
+
 class Player:
+    __slots__ = ("x", "y", "size", "speed", "color", "touching")
+
     def __init__(self, x, y, size=14, speed=180):
         # Position stored as floats for smooth movement
         self.x = float(x)
@@ -11,16 +15,24 @@ class Player:
 
         self.color = (255, 50, 50)
 
+        # pressed against a wall since the last update (a bump is only heard once)
+        self.touching = False
+
     def get_rect(self):
         """Return a pygame.Rect representing the player's hitbox."""
         return pygame.Rect(self.x, self.y, self.size, self.size)
 
-    def update(self, dt, maze, dx, dy):
+    def update(self, dt, maze, dx, dy, spatial=None, running=False):
         """
         dt   = delta time (seconds)
         maze = Maze object (for collision)
         dx/dy = direction input (-1, 0, or 1)
+        spatial = optional SpatialHash to keep in sync with the new position
+        running = move RUN_FACTOR times faster, and loudly
+        Returns the noise made (tiles it carries, see world.noise; 0.0 = none):
+        running footsteps, or walking into a wall.
         """
+        moving = dx != 0 or dy != 0
 
         # Normalize diagonal movement
         if dx != 0 and dy != 0:
@@ -28,42 +40,25 @@ class Player:
             dy *= 0.7071
 
         # Calculate movement amount
-        move_x = dx * self.speed * dt
-        move_y = dy * self.speed * dt
-
-        # --- Move in X direction first ---
-        self.x += move_x
-        if self._collides_with_wall(maze):
-            # Undo movement if collision
-            self.x -= move_x
-
-        # --- Then move in Y direction ---
-        self.y += move_y
-        if self._collides_with_wall(maze):
-            self.y -= move_y
-
-    def _collides_with_wall(self, maze):
-        """Check collision against maze walls using tile lookup."""
-        rect = self.get_rect()
-
-        # Determine which tiles the player overlaps
-        left_tile = rect.left // maze.tile_size
-        right_tile = rect.right // maze.tile_size
-        top_tile = rect.top // maze.tile_size
-        bottom_tile = rect.bottom // maze.tile_size
-
-        for row in range(int(top_tile), int(bottom_tile) + 1):
-            for col in range(int(left_tile), int(right_tile) + 1):
-
-                # Bounds check
-                if row < 0 or row >= maze.rows or col < 0 or col >= maze.cols:
-                    return True  # treat outside map as wall
-
-                # Check tile type, if 1, it's a wall
-                if maze.grid[row][col] == 1:
-                    return True
-
-        return False
-
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, self.get_rect())
\ No newline at end of file
+        speed = self.speed * RUN_FACTOR if running else self.speed
+        move_x = dx * speed * dt
+        move_y = dy * speed * dt
+
+        # X then Y, each stopping at the first wall it meets (so the player
+        # slides along walls); the hitbox reaches one pixel past the rect,
+        # hence size + 1
+        self.x, self.y, t = maze.sweep_box(self.x, self.y, self.size + 1, move_x, move_y)
+
+        if spatial is not None:
+            spatial.update(self)
+
+        noise = NOISE_RUN if running and moving else 0.0
+        touching = moving and t < 1.0
+        if touching and not self.touching:
+            noise = max(noise, NOISE_BUMP)
+        self.touching = touching
+        return noise
+
+    def draw(self, screen, offset=(0, 0)):
+        """Draw the player (world pixel offset at the screen's top-left); returns the Rect drawn on."""
+        return pygame.draw.rect(screen, self.color, self.get_rect().move(-offset[0], -offset[1]))
\ No newline at end of file
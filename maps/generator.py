@@ -0,0 +1,138 @@
+"""
+Seeded procedural maze generators.
+
+Every generator returns a (rows, cols) NumPy uint8 grid using the Maze tile
+values (WALL / FLOOR), surrounded by a wall border, and is fully determined by
+its arguments and seed. Save the result with maps.mapfile.save_map, or hand it
+straight to Maze:
+
+    python -m maps.generator backtracker 513 513 --seed 7 -o maps/bt513.hsm
+"""
+import argparse
+import random
+
+import numpy as np
+
+from world.maze import FLOOR, WALL
+
+
+def recursive_backtracker(rows, cols, seed=0):
+    """
+    Perfect maze (exactly one path between any two floor tiles) carved by a
+    depth-first search with an explicit stack. Cells sit on odd (row, col)
+    tiles with walls between them; an even rows/cols leaves the last
+    row/column solid.
+    """
+    if rows < 3 or cols < 3:
+        raise ValueError("a backtracker maze needs at least 3x3 tiles")
+    rng = random.Random(seed)
+    cell_rows = (rows - 1) // 2
+    cell_cols = (cols - 1) // 2
+
+    # flat bytearray while carving: far cheaper to poke from Python than ndarray
+    tiles = bytearray([WALL]) * (rows * cols)
+    visited = bytearray(cell_rows * cell_cols)
+    directions = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    start_r = rng.randrange(cell_rows)
+    start_c = rng.randrange(cell_cols)
+    visited[start_r * cell_cols + start_c] = 1
+    tiles[(2 * start_r + 1) * cols + 2 * start_c + 1] = FLOOR
+    stack = [(start_r, start_c)]
+    while stack:
+        r, c = stack[-1]
+        options = []
+        for dr, dc in directions:
+            nr = r + dr
+            nc = c + dc
+            if 0 <= nr < cell_rows and 0 <= nc < cell_cols and not visited[nr * cell_cols + nc]:
+                options.append((nr, nc))
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = options[rng.randrange(len(options))]
+        visited[nr * cell_cols + nc] = 1
+        # open the wall between the two cells, then the new cell itself
+        tiles[(r + nr + 1) * cols + (c + nc + 1)] = FLOOR
+        tiles[(2 * nr + 1) * cols + 2 * nc + 1] = FLOOR
+        stack.append((nr, nc))
+
+    return np.frombuffer(bytes(tiles), dtype=np.uint8).reshape(rows, cols).copy()
+
+
+def rooms_and_corridors(rows, cols, seed=0, room_attempts=None, min_room=4, max_room=12):
+    """
+    Rectangular rooms placed at random without overlapping (one wall tile
+    apart at least), each joined to the previous one by an L-shaped,
+    one-tile-wide corridor, so every room is reachable.
+    """
+    if rows < min_room + 2 or cols < min_room + 2:
+        raise ValueError("map too small for a room")
+    rng = random.Random(seed)
+    grid = np.full((rows, cols), WALL, dtype=np.uint8)
+    if room_attempts is None:
+        room_attempts = max(8, rows * cols // (max_room * max_room))
+
+    # occupancy of placed rooms grown by one tile, to keep rooms apart
+    taken = np.zeros((rows, cols), dtype=bool)
+    centers = []
+    for _ in range(room_attempts):
+        h = rng.randint(min_room, max_room)
+        w = rng.randint(min_room, max_room)
+        if h > rows - 2 or w > cols - 2:
+            continue
+        top = rng.randint(1, rows - h - 1)
+        left = rng.randint(1, cols - w - 1)
+        if taken[top - 1:top + h + 1, left - 1:left + w + 1].any():
+            continue
+        taken[top - 1:top + h + 1, left - 1:left + w + 1] = True
+        grid[top:top + h, left:left + w] = FLOOR
+        centers.append((top + h // 2, left + w // 2))
+
+    for (r0, c0), (r1, c1) in zip(centers, centers[1:]):
+        # horizontal then vertical, or the other way round
+        if rng.random() < 0.5:
+            grid[r0, min(c0, c1):max(c0, c1) + 1] = FLOOR
+            grid[min(r0, r1):max(r0, r1) + 1, c1] = FLOOR
+        else:
+            grid[min(r0, r1):max(r0, r1) + 1, c0] = FLOOR
+            grid[r1, min(c0, c1):max(c0, c1) + 1] = FLOOR
+
+    return grid
+
+
+GENERATORS = {
+    "backtracker": recursive_backtracker,
+    "rooms": rooms_and_corridors,
+}
+
+
+def generate(kind, rows, cols, seed=0, **options):
+    """Run the generator registered as kind ("backtracker" or "rooms")."""
+    try:
+        generator = GENERATORS[kind]
+    except KeyError:
+        raise ValueError(f"unknown generator {kind!r}, expected one of {tuple(GENERATORS)}") from None
+    return generator(rows, cols, seed, **options)
+
+
+def main():
+    from maps.mapfile import save_map
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=tuple(GENERATORS))
+    parser.add_argument("rows", type=int)
+    parser.add_argument("cols", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tile-size", type=int, default=50)
+    parser.add_argument("-o", "--output", required=True, help="map file to write")
+    args = parser.parse_args()
+
+    grid = generate(args.kind, args.rows, args.cols, args.seed)
+    save_map(args.output, grid, args.tile_size)
+    floor = int((grid == FLOOR).sum())
+    print(f"wrote {args.output}: {args.rows}x{args.cols} tiles, {floor} floor")
+
+
+if __name__ == "__main__":
+    main()
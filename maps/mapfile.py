@@ -0,0 +1,202 @@
+"""
+Binary map files and their derived-data cache.
+
+Map file (little endian), memory-mappable:
+
+    offset  size  field
+    0       4     magic b"HSMP"
+    4       2     format version (1)
+    6       2     header size in bytes (tiles start here)
+    8       4     rows
+    12      4     cols
+    16      2     tile size in pixels
+    18      2     reserved (0)
+    20      ...   rows * cols tile bytes, row-major (Maze tile values)
+
+Next to each map, "<map>.cache" holds what Maze would otherwise rebuild at
+startup: the floor-tile index list and the tile visibility index. It carries
+a digest of the map's tiles and the visibility radius it was built for, so
+a cache that no longer matches its map is ignored and rewritten.
+
+    python -m maps.mapfile maps/bt513.hsm    # print header / cache status
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from world.maze import Maze, VISIBILITY_RADIUS
+
+MAP_MAGIC = b"HSMP"
+MAP_VERSION = 1
+MAP_HEADER = struct.Struct("<4sHHIIHH")
+
+CACHE_MAGIC = b"HSMC"
+CACHE_VERSION = 1
+# magic, version, visibility radius, tile digest, floor count, reserved, visibility bytes
+CACHE_HEADER = struct.Struct("<4sHH16sIIQ")
+
+
+class MapFile:
+    """
+    An opened map file. tiles is a read-only buffer over the tile bytes
+    (memory-mapped by default, so nothing is read until it's used). Close it,
+    or use it as a context manager, once done.
+    """
+
+    def __init__(self, path, use_mmap=True):
+        self.path = path
+        with open(path, "rb") as f:
+            head = f.read(MAP_HEADER.size)
+            if len(head) < MAP_HEADER.size:
+                raise ValueError(f"{path}: truncated map header")
+            magic, version, header_size, rows, cols, tile_size, _ = MAP_HEADER.unpack(head)
+            if magic != MAP_MAGIC:
+                raise ValueError(f"{path}: not a map file")
+            if version != MAP_VERSION:
+                raise ValueError(f"{path}: unsupported map version {version}")
+
+            size = rows * cols
+            if use_mmap:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                f.seek(0)
+                self._data = f.read()
+        if len(self._data) < header_size + size:
+            self.close()
+            raise ValueError(f"{path}: expected {size} tile bytes")
+
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+        self.tiles = memoryview(self._data)[header_size:header_size + size]
+
+    def digest(self):
+        """16-byte digest of the map size and tiles (keys the derived-data cache)."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(struct.pack("<II", self.rows, self.cols))
+        h.update(self.tiles)
+        return h.digest()
+
+    def grid(self):
+        """Tiles as a (rows, cols) uint8 array (a copy)."""
+        return np.frombuffer(self.tiles, dtype=np.uint8).reshape(self.rows, self.cols).copy()
+
+    def close(self):
+        tiles = getattr(self, "tiles", None)
+        if tiles is not None:
+            tiles.release()
+            self.tiles = None
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _write_atomic(path, chunks):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+
+
+def cache_path(path):
+    return path + ".cache"
+
+
+def save_map(path, grid, tile_size):
+    """Write grid (2D sequence or array of tile values) as a map file."""
+    tiles = np.ascontiguousarray(np.asarray(grid, dtype=np.uint8))
+    if tiles.ndim != 2 or tiles.size == 0:
+        raise ValueError("grid must be a non-empty 2D sequence of tile values")
+    rows, cols = tiles.shape
+    header = MAP_HEADER.pack(MAP_MAGIC, MAP_VERSION, MAP_HEADER.size, rows, cols, tile_size, 0)
+    _write_atomic(path, (header, tiles.tobytes()))
+
+
+def save_maze(path, maze):
+    """Write a Maze's tiles as a map file."""
+    save_map(path, maze.tile_array, maze.tile_size)
+
+
+def read_cache(path, digest, visibility_radius):
+    """(floor indices, visibility table) from path's cache, or None if missing/stale."""
+    try:
+        with open(cache_path(path), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < CACHE_HEADER.size:
+        return None
+    magic, version, radius, cached_digest, floor_count, _, vis_len = CACHE_HEADER.unpack_from(data)
+    if (magic != CACHE_MAGIC or version != CACHE_VERSION or cached_digest != digest
+            or radius != visibility_radius):
+        return None
+    start = CACHE_HEADER.size
+    floor_end = start + 4 * floor_count
+    if len(data) != floor_end + vis_len:
+        return None
+    floor = np.frombuffer(data, dtype="<i4", count=floor_count, offset=start).astype(np.int64)
+    return floor, memoryview(data)[floor_end:]
+
+
+def write_cache(path, digest, maze):
+    """Store maze's floor indices and visibility index next to map path."""
+    floor = maze.floor_indices().astype("<i4")
+    header = CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, maze.visibility_radius, digest,
+                               len(floor), 0, len(maze.visibility))
+    _write_atomic(cache_path(path), (header, floor.tobytes(), maze.visibility))
+
+
+def load_maze(path, visibility_radius=VISIBILITY_RADIUS, use_cache=True):
+    """
+    Build a Maze from a map file. Its tiles stay in the file's mapping (not
+    copied), which the Maze keeps open for as long as it lives. With
+    use_cache the floor list and visibility index come from "<path>.cache"
+    when it matches, and the cache is (re)written when it doesn't.
+    """
+    m = MapFile(path)
+    try:
+        cached = None
+        if use_cache:
+            digest = m.digest()
+            cached = read_cache(path, digest, visibility_radius)
+        floor, visibility = cached if cached is not None else (None, None)
+        maze = Maze.from_buffer(m.tiles, m.rows, m.cols, m.tile_size, visibility_radius,
+                                visibility=visibility, floor=floor)
+    except BaseException:
+        m.close()
+        raise
+
+    # the index may have been skipped for size; cache what was actually built
+    if use_cache and cached is None and maze.visibility_radius == visibility_radius:
+        try:
+            write_cache(path, digest, maze)
+        except OSError:
+            pass  # read-only location: still usable, just not cached
+    return maze
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    with MapFile(args.path) as m:
+        digest = m.digest()
+        print(f"{args.path}: {m.rows}x{m.cols} tiles, tile size {m.tile_size}px")
+        cached = read_cache(args.path, digest, VISIBILITY_RADIUS)
+    print("cache:", "valid" if cached is not None else "missing or stale")
+
+
+if __name__ == "__main__":
+    main()
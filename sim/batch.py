@@ -0,0 +1,273 @@
+"""
+Multi-process batch simulation for AI balancing sweeps.
+
+Runs many headless episodes of World/PlayingState over a parameter grid of
+StandardAI settings (vision_distance, vision_angle, standard_speed,
+running_speed) and agent counts, each repeated over several seeds with a
+seeded player policy. Episodes are spread over a process pool; the maze is
+built once in the parent and its tiles, floor list and visibility index are
+handed to the workers through shared memory instead of being pickled.
+
+Each episode ends at the first detection (any agent starts chasing) or after
+--ticks ticks. Results go to a columnar .npz file (one array per column):
+parameters, seed, detected, ticks, time_to_detection (seconds, NaN when
+never detected) and ticks_per_sec.
+
+    python -m sim.batch --agents 7 20 --vision-distance 90 120 150 \\
+        --vision-angle 60 90 --seeds 50 --ticks 1800 -o sweep.npz
+"""
+import argparse
+import itertools
+import math
+import os
+import time
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+
+from world.maze import Maze
+from world.settings import AGENT_COUNT, FPS
+from states.playing_state import PlayingState
+from sim.headless import HeadlessRunner, RandomWalk, Scripted, tile_grid
+
+# StandardAI attributes a sweep may set; vision_angle is given in degrees
+AGENT_PARAMS = ("vision_distance", "vision_angle", "standard_speed", "running_speed")
+POLICIES = ("random", "scripted")
+
+# scripted policy: a fixed loop of (dx, dy, ticks) legs
+SCRIPTED_LEGS = ((1, 0, 90), (0, 1, 90), (-1, 0, 90), (0, -1, 90), (1, 1, 60), (-1, -1, 60))
+
+
+def param_grid(**axes):
+    """Cartesian product of axis values as a list of dicts (axis order kept)."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def _attach(name):
+    """Attach to an existing shared memory block without taking ownership of it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers with the resource tracker; pool
+        # workers share the parent's tracker, so that is just a duplicate
+        # of the parent's own registration
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedMaze:
+    """
+    A Maze's tiles, floor list and visibility index published in shared
+    memory. The (picklable) spec is all a worker needs to rebuild the Maze
+    around the same buffers; tiles and visibility index are used in place.
+    """
+
+    def __init__(self, maze):
+        self._blocks = []
+        floor = np.ascontiguousarray(maze.floor_indices(), dtype=np.int64)
+        self.spec = {
+            "rows": maze.rows,
+            "cols": maze.cols,
+            "tile_size": maze.tile_size,
+            "visibility_radius": maze.visibility_radius,
+            "tiles": self._publish(maze.tiles),
+            "floor": self._publish(floor.tobytes()),
+            "floor_count": len(floor),
+            "visibility": self._publish(maze.visibility),
+        }
+
+    def _publish(self, data):
+        if len(data) == 0:
+            return None
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        self._blocks.append(shm)
+        return shm.name
+
+    def close(self):
+        """Release and unlink the blocks (call once all workers are done)."""
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    @staticmethod
+    def attach(spec):
+        """Rebuild the Maze in a worker. Returns (maze, blocks to keep open)."""
+        blocks = []
+
+        def view(name, size):
+            if name is None:
+                return None
+            shm = _attach(name)
+            blocks.append(shm)
+            return shm.buf[:size]
+
+        rows, cols = spec["rows"], spec["cols"]
+        r = spec["visibility_radius"]
+        tiles = view(spec["tiles"], rows * cols)
+        floor_buf = view(spec["floor"], 8 * spec["floor_count"])
+        floor = np.frombuffer(floor_buf, dtype=np.int64) if floor_buf is not None else np.zeros(0, np.int64)
+        visibility = view(spec["visibility"], rows * cols * (2 * r + 1) ** 2)
+        maze = Maze.from_buffer(tiles, rows, cols, spec["tile_size"], r,
+                                visibility=visibility, floor=floor)
+        return maze, blocks
+
+
+# per-worker state, set up once by _init_worker
+_worker_maze = None
+_worker_blocks = None
+
+
+def _init_worker(spec):
+    global _worker_maze, _worker_blocks
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    _worker_maze, _worker_blocks = SharedMaze.attach(spec)
+
+
+def _make_policy(kind, seed):
+    if kind == "scripted":
+        return Scripted(SCRIPTED_LEGS)
+    return RandomWalk(seed)
+
+
+def run_episode(maze, params, seed, max_ticks, dt=1.0 / FPS, policy="random", backend="python"):
+    """
+    One episode on maze with the given agent params. Returns a result row:
+    detected, ticks, time_to_detection (NaN if undetected), ticks_per_sec.
+    """
+    runner = HeadlessRunner(maze=maze, agents=params.get("agents", AGENT_COUNT), dt=dt, seed=seed,
+                            policy=_make_policy(policy, seed), backend=backend)
+    agents = runner.world.agents
+    for a in agents:
+        for name in AGENT_PARAMS:
+            if name in params:
+                value = float(params[name])
+                setattr(a, name, math.radians(value) if name == "vision_angle" else value)
+        a.cos_half_vision = math.cos(a.vision_angle / 2)
+    # vision reach may have changed
+    runner.world.rebuild_spatial()
+
+    detected = False
+    t0 = time.perf_counter()
+    ticks = 0
+    while ticks < max_ticks:
+        runner.step()
+        ticks += 1
+        if any(a.chasing for a in agents):
+            detected = True
+            break
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "detected": detected,
+        "ticks": ticks,
+        "time_to_detection": ticks * dt if detected else math.nan,
+        "ticks_per_sec": ticks / elapsed if elapsed > 0 else math.inf,
+    }
+
+
+def _worker_episode(task):
+    episode, params, seed, max_ticks, dt, policy, backend = task
+    row = run_episode(_worker_maze, params, seed, max_ticks, dt, policy, backend)
+    row["episode"] = episode
+    return row
+
+
+def run_sweep(maze, grid, seeds, max_ticks, dt=1.0 / FPS, policy="random", workers=None,
+              backend="python", chunksize=None):
+    """
+    Run every grid point for every seed across a process pool. Returns the
+    results as columns: a dict of NumPy arrays, one entry per episode, in
+    grid x seed order.
+    """
+    tasks = []
+    for params in grid:
+        for seed in seeds:
+            tasks.append((len(tasks), params, seed, max_ticks, dt, policy, backend))
+
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # a few chunks per worker keeps them busy without per-task overhead
+        chunksize = max(1, len(tasks) // (workers * 4))
+
+    rows = [None] * len(tasks)
+    shared = SharedMaze(maze)
+    try:
+        with get_context().Pool(workers, initializer=_init_worker, initargs=(shared.spec,)) as pool:
+            for row in pool.imap_unordered(_worker_episode, tasks, chunksize):
+                rows[row["episode"]] = row
+    finally:
+        shared.close()
+
+    param_names = sorted({name for params in grid for name in params})
+    columns = {"episode": np.arange(len(tasks))}
+    for name in param_names:
+        columns[name] = np.array([task[1].get(name, np.nan) for task in tasks], dtype=np.float64)
+    columns["seed"] = np.array([task[2] for task in tasks], dtype=np.int64)
+    columns["detected"] = np.array([row["detected"] for row in rows], dtype=np.bool_)
+    columns["ticks"] = np.array([row["ticks"] for row in rows], dtype=np.int64)
+    columns["time_to_detection"] = np.array([row["time_to_detection"] for row in rows], dtype=np.float64)
+    columns["ticks_per_sec"] = np.array([row["ticks_per_sec"] for row in rows], dtype=np.float64)
+    return columns
+
+
+def summarize(columns, keys):
+    """Per grid point: (params tuple, episodes, detection rate, mean time_to_detection)."""
+    params = np.column_stack([columns[k] for k in keys]) if keys else np.zeros((len(columns["episode"]), 0))
+    out = []
+    for point in np.unique(params, axis=0):
+        mask = np.all(params == point, axis=1)
+        ttd = columns["time_to_detection"][mask]
+        mean_ttd = float(np.nanmean(ttd)) if np.isfinite(ttd).any() else math.nan
+        out.append((tuple(point.tolist()), int(mask.sum()), float(columns["detected"][mask].mean()), mean_ttd))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--map", help="map file (see maps.mapfile); default: the PlayingState level")
+    parser.add_argument("--scale", type=int, default=1, help="repetitions of the built-in level per side")
+    parser.add_argument("--agents", type=int, nargs="+", default=[AGENT_COUNT])
+    parser.add_argument("--vision-distance", type=float, nargs="+", default=[120.0])
+    parser.add_argument("--vision-angle", type=float, nargs="+", default=[90.0], help="degrees")
+    parser.add_argument("--standard-speed", type=float, nargs="+", default=[30.0])
+    parser.add_argument("--running-speed", type=float, nargs="+", default=[90.0])
+    parser.add_argument("--seeds", type=int, default=20, help="episodes per grid point")
+    parser.add_argument("--ticks", type=int, default=1800, help="max ticks per episode")
+    parser.add_argument("--dt", type=float, default=1.0 / FPS)
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("-o", "--output", default="sweep.npz")
+    args = parser.parse_args()
+
+    if args.map:
+        from maps.mapfile import load_maze
+        maze = load_maze(args.map)
+    else:
+        maze = Maze(tile_grid(PlayingState().grid, args.scale), 50)
+
+    grid = param_grid(
+        agents=args.agents,
+        vision_distance=args.vision_distance,
+        vision_angle=args.vision_angle,
+        standard_speed=args.standard_speed,
+        running_speed=args.running_speed,
+    )
+    t0 = time.perf_counter()
+    columns = run_sweep(maze, grid, range(args.seeds), args.ticks, args.dt, args.policy, args.workers)
+    elapsed = time.perf_counter() - t0
+    np.savez(args.output, **columns)
+
+    episodes = len(columns["episode"])
+    total_ticks = int(columns["ticks"].sum())
+    print(f"{episodes} episodes, {total_ticks} ticks in {elapsed:.1f}s "
+          f"({episodes / elapsed:.1f} episodes/s, {total_ticks / elapsed:.0f} ticks/s) -> {args.output}")
+    keys = list(grid[0])
+    print(" ".join(f"{k:>16}" for k in keys) + f" {'episodes':>9} {'detected':>9} {'ttd s':>8}")
+    for point, n, rate, ttd in summarize(columns, keys):
+        print(" ".join(f"{v:>16g}" for v in point) + f" {n:>9} {rate:>9.2f} {ttd:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
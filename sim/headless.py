@@ -0,0 +1,230 @@
+"""
+Headless fixed-timestep simulation runner.
+
+Builds a World/PlayingState without opening a window, drives the player with
+a scripted or random policy instead of the keyboard and steps the simulation
+at a fixed dt. Reports ticks/second and per-phase timings from a
+world.profiler.Profiler (player update, agent vision checks, steering,
+collision), and can sweep agent counts and maze
+sizes. This is the reference harness for optimizing Agent_Actions and utils:
+
+    python -m sim.headless --agents 7 100 1000 10000 --scales 1 2 4 --ticks 300
+
+--render full|dirty also draws every tick (offscreen through SDL's dummy video
+driver unless SDL_VIDEODRIVER is set) and reports render and frame time, to
+compare full-screen repaints with dirty-rect presentation:
+
+    python -m sim.headless --agents 7 1000 --render full dirty
+
+--lod runs the python backend through an AIScheduler (distant agents updated
+less often), optionally under a per-frame --budget-us:
+
+    python -m sim.headless --agents 10000 --scales 8 --lod --budget-us 4000
+
+--behaviours mixes agent types (settings.AGENT_MIX, or --agent-mix) run by a
+BehaviourEngine:
+
+    python -m sim.headless --agents 1000 10000 --scales 8 --behaviours
+    python -m sim.headless --agents 1000 --agent-mix patroller=1,hunter=1
+
+--hearing lets agents hear the player's noise (world.noise), on either backend:
+
+    python -m sim.headless --agents 1000 --backend python numpy --hearing
+"""
+import argparse
+import os
+import random
+import time
+
+from world.settings import AGENT_COUNT, AGENT_MIX, FPS, MAZE_LENGTH, MAZE_WIDTH, NOISE_REACH
+from world.world import World
+from world.noise import NoiseModel
+from world.profiler import Profiler
+from states.playing_state import PlayingState
+from Hackathon_Stealth_main.AI_Agents.Agent_Actions import Agent_Actions, BACKENDS
+from Hackathon_Stealth_main.AI_Agents.Agent_Alerts import AlertBoard
+from Hackathon_Stealth_main.AI_Agents.Agent_Behaviours import BehaviourEngine, parse_mix
+from Hackathon_Stealth_main.AI_Agents.Agent_Scheduler import AIScheduler
+
+# Profiler phases reported; "render" is draw + present
+PHASES = ("player", "vision", "steering", "collision", "render")
+RENDER_MODES = ("none", "full", "dirty")
+
+
+class RandomWalk:
+    """Player policy: pick a random 8-way direction (or stand still) every `hold` ticks."""
+
+    def __init__(self, seed=0, hold=30):
+        self.rng = random.Random(seed)
+        self.hold = hold
+        self.left = 0
+        self.direction = (0, 0)
+
+    def __call__(self):
+        if self.left <= 0:
+            self.direction = (self.rng.choice((-1, 0, 1)), self.rng.choice((-1, 0, 1)))
+            self.left = self.hold
+        self.left -= 1
+        return self.direction
+
+
+class Scripted:
+    """Player policy: play back (dx, dy, ticks) legs in order, looping forever."""
+
+    def __init__(self, legs):
+        self.legs = list(legs)
+        self.leg = 0
+        self.left = self.legs[0][2] if self.legs else 0
+
+    def __call__(self):
+        if not self.legs:
+            return (0, 0)
+        while self.left <= 0:
+            self.leg = (self.leg + 1) % len(self.legs)
+            self.left = self.legs[self.leg][2]
+        self.left -= 1
+        dx, dy, _ = self.legs[self.leg]
+        return (dx, dy)
+
+
+def tile_grid(grid, reps):
+    """Repeat grid reps x reps times to build a larger test maze."""
+    return [list(row) * reps for _ in range(reps) for row in grid]
+
+
+class HeadlessRunner:
+    """
+    One headless World + PlayingState stepped at a fixed dt.
+    grid=None uses the PlayingState level; policy defaults to RandomWalk(seed).
+    render="full" or "dirty" draws every tick into a real display surface
+    (full repaint + flip, or DirtyRectRenderer); "none" skips drawing.
+    maze (a ready-made Maze, e.g. a loaded map file) replaces grid / tile_size.
+    scheduler is an optional AIScheduler, alerts an optional AlertBoard and
+    behaviours an optional BehaviourEngine and noise an optional NoiseModel
+    for the agents (see Agent_Actions).
+    """
+
+    def __init__(self, grid=None, tile_size=50, agents=AGENT_COUNT, dt=1.0 / FPS,
+                 seed=0, policy=None, backend="python", render="none", maze=None, scheduler=None,
+                 alerts=None, behaviours=None, noise=None):
+        if agents < 1:
+            raise ValueError("agents must be >= 1 (PlayingState repopulates an empty world)")
+        if render not in RENDER_MODES:
+            raise ValueError(f"unknown render mode {render!r}, expected one of {RENDER_MODES}")
+
+        self.dt = dt
+        self.policy = policy or RandomWalk(seed)
+        self.state = PlayingState(grid, tile_size, maze=maze)
+        self.state.actions = Agent_Actions(show_cones=False, backend=backend, scheduler=scheduler,
+                                           alerts=alerts, behaviours=behaviours, noise=noise)
+        self.render = render
+        # the window is capped at the normal game size; bigger maps scroll
+        width = min(self.state.maze.width, MAZE_WIDTH)
+        height = min(self.state.maze.height, MAZE_LENGTH)
+        self.world = World(width, height, headless=render == "none",
+                           state=self.state, dirty_rects=render == "dirty", seed=seed)
+        self.world.populate(agents)
+        self.ticks = 0
+
+    def step(self):
+        # the policy stands in for the keyboard
+        self.world.input.set_move(*self.policy())
+        self.world.update(self.dt)
+        if self.render != "none":
+            self.world.draw()
+        self.ticks += 1
+
+    def run(self, ticks):
+        """Step `ticks` times and return a dict of throughput and per-phase timings."""
+        profiler = self.world.profiler = Profiler()
+        t0 = time.perf_counter()
+        for _ in range(ticks):
+            self.step()
+        elapsed = time.perf_counter() - t0
+        self.world.profiler = None
+        timings = dict(profiler.totals)
+        timings["render"] = timings["draw"] + timings["present"]
+
+        stats = {
+            "agents": len(self.world.agents),
+            "tiles": self.state.maze.rows * self.state.maze.cols,
+            "ticks": ticks,
+            "seconds": elapsed,
+            "ticks_per_sec": ticks / elapsed if elapsed > 0 else float("inf"),
+        }
+        accounted = 0.0
+        for phase in PHASES:
+            stats[phase + "_ms"] = timings.get(phase, 0.0) * 1000.0 / ticks
+            accounted += timings.get(phase, 0.0)
+        stats["other_ms"] = (elapsed - accounted) * 1000.0 / ticks
+        stats["frame_ms"] = elapsed * 1000.0 / ticks
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[7, 100, 1000, 10000])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4],
+                        help="maze sizes, as repetitions of the 16x16 level per side")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--dt", type=float, default=1.0 / FPS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=BACKENDS, nargs="+", default=["python"])
+    parser.add_argument("--render", choices=RENDER_MODES, nargs="+", default=["none"])
+    parser.add_argument("--map", help="map file (see maps.mapfile) to use instead of --scales")
+    parser.add_argument("--lod", action="store_true", help="schedule agent updates by distance (AIScheduler, python backend)")
+    parser.add_argument("--budget-us", type=float, default=None, help="--lod time budget per frame")
+    parser.add_argument("--alerts", action="store_true",
+                        help="guards alert each other on sightings (AlertBoard, python backend)")
+    parser.add_argument("--behaviours", action="store_true",
+                        help="agent types from settings.AGENT_MIX (BehaviourEngine, python backend)")
+    parser.add_argument("--agent-mix", metavar="TYPE=WEIGHT,...",
+                        help="agent types by weight, e.g. patroller=4,hunter=1 (implies --behaviours)")
+    parser.add_argument("--hearing", action="store_true", help="agents hear the player's noise (NoiseModel)")
+    args = parser.parse_args()
+    agent_mix = AGENT_MIX
+    if args.agent_mix:
+        try:
+            agent_mix = parse_mix(args.agent_mix)
+        except ValueError as e:
+            parser.error(f"--agent-mix: {e}")
+        args.behaviours = True
+    batched = [b for b in args.backend if b != "python"]
+    for flag in ("lod", "alerts", "behaviours"):
+        if getattr(args, flag) and batched:
+            parser.error(f"--{flag} needs the python backend, not --backend {' '.join(batched)}")
+    if args.behaviours and args.lod:
+        parser.error("--behaviours cannot be combined with --lod (BehaviourEngine steps every agent)")
+
+    if args.render != ["none"]:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    base = PlayingState().grid
+    cols = ("backend", "render", "tiles", "agents", "ticks/s", "player ms", "vision ms", "steer ms",
+            "collide ms", "render ms", "other ms", "frame ms")
+    print(" ".join(f"{c:>10}" for c in cols))
+    for backend in args.backend:
+        for render in args.render:
+            for scale in ([None] if args.map else args.scales):
+                for agents in args.agents:
+                    if args.map:
+                        from maps.mapfile import load_maze
+                        grid, maze = None, load_maze(args.map)
+                    else:
+                        grid, maze = tile_grid(base, scale), None
+                    scheduler = AIScheduler(budget_us=args.budget_us) if args.lod else None
+                    alerts = AlertBoard() if args.alerts else None
+                    behaviours = BehaviourEngine(mix=agent_mix) if args.behaviours else None
+                    noise = NoiseModel(NOISE_REACH) if args.hearing else None
+                    runner = HeadlessRunner(grid, agents=agents, dt=args.dt, seed=args.seed,
+                                            backend=backend, render=render, maze=maze, scheduler=scheduler,
+                                            alerts=alerts, behaviours=behaviours, noise=noise)
+                    s = runner.run(args.ticks)
+                    print(f"{backend:>10} {render:>10} {s['tiles']:>10} {s['agents']:>10} "
+                          f"{s['ticks_per_sec']:>10.1f} {s['player_ms']:>10.3f} {s['vision_ms']:>10.3f} "
+                          f"{s['steering_ms']:>10.3f} {s['collision_ms']:>10.3f} {s['render_ms']:>10.3f} "
+                          f"{s['other_ms']:>10.3f} {s['frame_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Deterministic record / replay of game sessions.
+
+A session is fully determined by World.seed, the dt of every tick and the
+player's input, so that is all the log stores. The log is an append-only
+binary stream:
+
+    header  magic b"HSRL", version, flags (FLAG_FIXED_STEP), seed (u64), maze digest (16 bytes),
+            agent count (u32), map path length (u16) + utf-8 map path
+            ("" = the built-in PlayingState level), agent mix length (u16) +
+            utf-8 agent mix (Agent_Behaviours.format_mix, "" = plain guards)
+    records one tag byte, then
+            TICK   dt in microseconds (u32), held input (world.input MOVE_* bits, u8)
+            REPEAT count (u16): the previous TICK again, count more times
+            ACTION press action (world.input RESTART..., u8), delivered before the next tick
+
+Actions rather than keys are logged, so a replay doesn't depend on the
+key bindings it was recorded with.
+
+With a fixed_step World, a TICK is one frame (its real time), which the
+World splits into fixed player / agent steps the same way on replay.
+
+While recording, World.update quantizes dt to whole microseconds so the
+recorded game simulates with exactly the dt that replays.
+
+Every snapshot_every ticks the recorder also appends a pickled
+World.snapshot() to "<log>.snap", with the log offset of the next record.
+Replayer.seek(tick) restores the latest snapshot at or before tick and only
+re-simulates the rest.
+
+    python -m sim.replay record session.hsr --ticks 20000     # scripted, headless
+    python -m sim.replay play session.hsr --to 50000 --verify
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import struct
+import time
+
+from world.settings import AGENT_COUNT, FPS, MAZE_LENGTH, MAZE_WIDTH
+from world.world import World
+from states.playing_state import PlayingState
+from Hackathon_Stealth_main.AI_Agents.Agent_Behaviours import format_mix, parse_mix
+
+LOG_MAGIC = b"HSRL"
+LOG_VERSION = 3
+LOG_HEADER = struct.Struct("<4sHHQ16sIH")
+LOG_LENGTH = struct.Struct("<H")
+
+TAG_TICK = 1
+TAG_REPEAT = 2
+TAG_ACTION = 3
+TICK = struct.Struct("<BIB")
+REPEAT = struct.Struct("<BH")
+ACTION = struct.Struct("<BB")
+MAX_REPEAT = 0xFFFF
+
+# header flags
+FLAG_FIXED_STEP = 1
+
+SNAP_HEADER = struct.Struct("<QQI")  # tick, log offset, pickle size
+
+# one snapshot a minute at 60 ticks/s
+SNAPSHOT_EVERY = 3600
+
+
+def maze_digest(maze):
+    """16-byte digest of a Maze's tiles (checks a log replays on the same map)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(struct.pack("<II", maze.rows, maze.cols))
+    h.update(maze.tiles)
+    return h.digest()
+
+
+def dt_to_us(dt):
+    return min(max(int(round(dt * 1e6)), 0), 0xFFFFFFFF)
+
+
+class Recorder:
+    """
+    Logs a World's session from its first tick. Attach it before the first
+    update (after populate() is fine):
+
+        world.recorder = Recorder("session.hsr", world)
+        ...
+        world.recorder.close()
+    """
+
+    def __init__(self, path, world, map_path="", snapshot_every=SNAPSHOT_EVERY):
+        if world.ticks != 0:
+            raise ValueError("start recording before the world's first tick")
+        self.path = path
+        self.world = world
+        self.snapshot_every = snapshot_every
+        self._log = open(path, "wb")
+        self._snaps = open(path + ".snap", "wb") if snapshot_every else None
+
+        encoded = map_path.encode("utf-8")
+        flags = FLAG_FIXED_STEP if world.fixed_step else 0
+        self._log.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, flags, world.seed,
+                                        maze_digest(world.current_state.maze), len(world.agents),
+                                        len(encoded)))
+        self._log.write(encoded)
+        # the agent types, so the replay doesn't depend on settings or flags
+        mix = format_mix(getattr(world.current_state, "agent_mix", None)).encode("utf-8")
+        self._log.write(LOG_LENGTH.pack(len(mix)))
+        self._log.write(mix)
+
+        self._last = None   # (dt_us, bits) of the last TICK written
+        self._pending = 0   # repeats of _last not written yet
+        if self._snaps is not None:
+            self._snapshot()
+
+    @staticmethod
+    def quantize(dt):
+        """dt rounded to what the log can hold (whole microseconds)."""
+        return dt_to_us(dt) / 1e6
+
+    def _flush_repeats(self):
+        if self._pending:
+            self._log.write(REPEAT.pack(TAG_REPEAT, self._pending))
+            self._pending = 0
+
+    def tick(self, dt, bits):
+        """Log one World.update (called by World itself)."""
+        entry = (dt_to_us(dt), bits & 0xFF)
+        if entry == self._last:
+            self._pending += 1
+            if self._pending == MAX_REPEAT:
+                self._flush_repeats()
+        else:
+            self._flush_repeats()
+            self._log.write(TICK.pack(TAG_TICK, entry[0], entry[1]))
+            self._last = entry
+
+        if self._snaps is not None and self.world.ticks % self.snapshot_every == 0:
+            self._snapshot()
+
+    def action(self, action):
+        """Log a press action (called by World.handle_events)."""
+        self._flush_repeats()
+        self._log.write(ACTION.pack(TAG_ACTION, action))
+        # a REPEAT never spans an action
+        self._last = None
+
+    def _snapshot(self):
+        self._flush_repeats()
+        # replay resumes at this offset, so the next tick must not be a REPEAT
+        self._last = None
+        data = pickle.dumps(self.world.snapshot(), protocol=pickle.HIGHEST_PROTOCOL)
+        self._snaps.write(SNAP_HEADER.pack(self.world.ticks, self._log.tell(), len(data)))
+        self._snaps.write(data)
+        self._snaps.flush()
+
+    def close(self):
+        self._flush_repeats()
+        self._log.close()
+        if self._snaps is not None:
+            self._snaps.close()
+
+
+class Replayer:
+    """
+    Re-simulates a recorded session headless, as fast as it can go.
+    run() continues from the current tick; seek() jumps to any tick.
+    """
+
+    def __init__(self, path, maze=None):
+        """maze overrides loading the map named in the log (it must match the digest)."""
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = f.read()
+        magic, version, flags, seed, digest, agent_count, path_len = LOG_HEADER.unpack_from(self._data)
+        if magic != LOG_MAGIC:
+            raise ValueError(f"{path}: not a replay log")
+        if version != LOG_VERSION:
+            raise ValueError(f"{path}: unsupported replay version {version}")
+        self.seed = seed
+        self.fixed_step = bool(flags & FLAG_FIXED_STEP)
+        self.digest = digest
+        self.agent_count = agent_count
+        start = LOG_HEADER.size
+        self.map_path = self._data[start:start + path_len].decode("utf-8")
+        start += path_len
+        (mix_len,) = LOG_LENGTH.unpack_from(self._data, start)
+        start += LOG_LENGTH.size
+        mix = self._data[start:start + mix_len].decode("utf-8")
+        self.agent_mix = parse_mix(mix) if mix else {}
+        self._start = start + mix_len
+
+        if maze is None and self.map_path:
+            from maps.mapfile import load_maze
+            maze = load_maze(self.map_path)
+        self._maze = maze
+        self._snapshots = None
+        self.reset()
+
+    def reset(self):
+        """Fresh world at tick 0."""
+        state = PlayingState(maze=self._maze, agent_mix=self.agent_mix)
+        if maze_digest(state.maze) != self.digest:
+            raise ValueError(f"{self.path}: recorded on a different map")
+        self._maze = state.maze
+        self.world = World(min(state.maze.width, MAZE_WIDTH), min(state.maze.height, MAZE_LENGTH),
+                           headless=True, state=state, seed=self.seed, fixed_step=self.fixed_step)
+        if self.agent_count:
+            self.world.populate(self.agent_count)
+        self._pos = self._start
+        self._repeat = 0
+        self._last = None
+
+    def _step(self):
+        """Apply records up to and including the next tick. False at the end of the log."""
+        world = self.world
+        data = self._data
+        while True:
+            if self._repeat:
+                self._repeat -= 1
+                dt_us, bits = self._last
+                break
+            if self._pos >= len(data):
+                return False
+            tag = data[self._pos]
+            if tag == TAG_TICK:
+                _, dt_us, bits = TICK.unpack_from(data, self._pos)
+                self._pos += TICK.size
+                self._last = (dt_us, bits)
+                break
+            if tag == TAG_REPEAT:
+                _, self._repeat = REPEAT.unpack_from(data, self._pos)
+                self._pos += REPEAT.size
+            elif tag == TAG_ACTION:
+                _, action = ACTION.unpack_from(data, self._pos)
+                self._pos += ACTION.size
+                world.current_state.handle_action(world, action)
+            else:
+                raise ValueError(f"{self.path}: bad record tag {tag} at offset {self._pos}")
+
+        world.input.set_held(bits)
+        world.update(dt_us / 1e6)
+        return True
+
+    def run(self, ticks=None):
+        """Simulate up to ticks more ticks (default: to the end). Returns ticks run."""
+        done = 0
+        while ticks is None or done < ticks:
+            if not self._step():
+                break
+            done += 1
+        return done
+
+    def snapshots(self):
+        """[(tick, log offset, file offset of the pickle, size)] from "<log>.snap"."""
+        if self._snapshots is None:
+            self._snapshots = []
+            try:
+                with open(self.path + ".snap", "rb") as f:
+                    data = f.read()
+            except OSError:
+                data = b""
+            pos = 0
+            while pos + SNAP_HEADER.size <= len(data):
+                tick, offset, size = SNAP_HEADER.unpack_from(data, pos)
+                pos += SNAP_HEADER.size
+                if pos + size > len(data):
+                    break  # cut off mid-write
+                self._snapshots.append((tick, offset, pos, size))
+                pos += size
+        return self._snapshots
+
+    def seek(self, tick):
+        """Jump to tick: restore the nearest earlier snapshot, then simulate the rest."""
+        best = None
+        for snap in self.snapshots():
+            if snap[0] <= tick and (best is None or snap[0] > best[0]):
+                best = snap
+        current = self.world.ticks
+        if best is not None and (current > tick or best[0] > current):
+            snap_tick, offset, at, size = best
+            with open(self.path + ".snap", "rb") as f:
+                f.seek(at)
+                snap = pickle.loads(f.read(size))
+            self.world.restore(snap)
+            self._pos = offset
+            self._repeat = 0
+            self._last = None
+        elif current > tick:
+            self.reset()
+        return self.run(tick - self.world.ticks)
+
+
+def fingerprint(world):
+    """Hash of the player and agent state (to compare two runs)."""
+    h = hashlib.blake2b(digest_size=16)
+    player = world.current_state.player
+    h.update(struct.pack("<dd", player.x, player.y))
+    for a in world.agents:
+        h.update(struct.pack("<dddd?", a.x, a.y, a.facing[0], a.facing[1], a.chasing))
+    return h.hexdigest()
+
+
+def main():
+    from sim.headless import RandomWalk
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="record a headless session driven by a seeded random walk")
+    rec.add_argument("log")
+    rec.add_argument("--ticks", type=int, default=20000)
+    rec.add_argument("--seed", type=int, default=0)
+    rec.add_argument("--agents", type=int, default=AGENT_COUNT)
+    rec.add_argument("--map", default="", help="map file (default: the built-in level)")
+    rec.add_argument("--agent-mix", metavar="TYPE=WEIGHT,...",
+                     help="agent types, e.g. patroller=4,hunter=1 (default: settings)")
+    rec.add_argument("--snapshot-every", type=int, default=SNAPSHOT_EVERY)
+    play = sub.add_parser("play", help="replay a log headless")
+    play.add_argument("log")
+    play.add_argument("--to", type=int, default=None, help="seek to this tick instead of playing it all")
+    play.add_argument("--verify", action="store_true", help="also replay from tick 0 and compare")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        agent_mix = None
+        if args.agent_mix:
+            try:
+                agent_mix = parse_mix(args.agent_mix)
+            except ValueError as e:
+                parser.error(f"--agent-mix: {e}")
+        maze = None
+        if args.map:
+            from maps.mapfile import load_maze
+            maze = load_maze(args.map)
+        walk = RandomWalk(args.seed)
+        state = PlayingState(maze=maze, agent_mix=agent_mix)
+        world = World(min(state.maze.width, MAZE_WIDTH), min(state.maze.height, MAZE_LENGTH),
+                      headless=True, state=state, seed=args.seed)
+        world.populate(args.agents)
+        world.recorder = Recorder(args.log, world, args.map, args.snapshot_every)
+        t0 = time.perf_counter()
+        for _ in range(args.ticks):
+            world.input.set_move(*walk())
+            world.update(1.0 / FPS)
+        world.recorder.close()
+        elapsed = time.perf_counter() - t0
+        print(f"recorded {args.ticks} ticks in {elapsed:.2f}s, log {os.path.getsize(args.log)} bytes, "
+              f"state {fingerprint(world)}")
+        return
+
+    replayer = Replayer(args.log)
+    t0 = time.perf_counter()
+    if args.to is None:
+        ticks = replayer.run()
+    else:
+        ticks = replayer.seek(args.to)
+    elapsed = time.perf_counter() - t0
+    print(f"tick {replayer.world.ticks} ({ticks} simulated in {elapsed:.2f}s), state {fingerprint(replayer.world)}")
+    if args.verify:
+        full = Replayer(args.log)
+        full.run(replayer.world.ticks)
+        same = fingerprint(full.world) == fingerprint(replayer.world)
+        print("verify:", "match" if same else "MISMATCH")
+        if not same:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
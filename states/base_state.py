@@ -4,8 +4,43 @@ class BaseState:
     """
     Base class for all game states.
     Every state should inherit from this and override its methods.
+
+    States that set dirty_rects = True draw through game.renderer (a
+    DirtyRectRenderer) instead of repainting the whole screen each frame.
+
+    World keeps states on a stack (push_state / pop_state / change_state)
+    and calls the lifecycle hooks as they move on and off it:
+    enter / exit when a state is added / removed, suspend / resume when
+    another state is pushed over it / popped off it. preload() is for
+    heavy setup that World.load_state runs on a worker thread.
     """
 
+    dirty_rects = False
+
+    def preload(self):
+        """
+        Build heavy assets (maze indexes, surfaces...) before the state is
+        shown. May run on a loader thread: it must not touch the World,
+        the display or the event queue.
+        """
+        pass
+
+    def enter(self, game):
+        """The state became active by being added to the stack."""
+        pass
+
+    def exit(self, game):
+        """The state was removed from the stack."""
+        pass
+
+    def suspend(self, game):
+        """Another state was pushed over this one."""
+        pass
+
+    def resume(self, game):
+        """The state above this one was popped: this one is active again."""
+        pass
+
     def handle_events(self, game, event):
         """
         Handle input.
@@ -13,6 +48,13 @@ class BaseState:
         """
         pass
 
+    def handle_action(self, game, action):
+        """
+        Handle a press action (world.input RESTART, PAUSE...), from a bound
+        key or a replay. Held actions are read from game.input.held instead.
+        """
+        pass
+
     def update(self, game, dt):
         """
         Update logic.
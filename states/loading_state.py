@@ -0,0 +1,31 @@
+# states/loading_state.py
+import time
+
+import pygame
+
+from states.base_state import BaseState
+
+
+class LoadingState(BaseState):
+    """
+    Placeholder shown while World.load_state builds the next state on its
+    loader thread: a "Loading..." line with animated dots. It imports
+    nothing heavy, so it can be the first frame main.py presents.
+    """
+
+    def __init__(self, text="Loading"):
+        self.text = text
+        self.font: pygame.font.Font = None
+        self.started = time.perf_counter()
+
+    def draw(self, game, screen):
+        if self.font is None:
+            # pygame's bundled default font: no system font scan
+            self.font = pygame.font.Font(None, 36)
+        dots = int((time.perf_counter() - self.started) * 3) % 4
+        label = self.font.render(self.text + "." * dots, True, (200, 200, 200))
+        # anchored on the text without dots, so it does not jitter
+        width = self.font.size(self.text)[0]
+        x = (screen.get_width() - width) // 2
+        y = (screen.get_height() - label.get_height()) // 2
+        screen.blit(label, (x, y))
@@ -1,11 +1,23 @@
 # states/playing_state.py
+import time
+import warnings
+
 import pygame
 from typing import Optional
 
 from states.base_state import BaseState
 from world.maze import Maze
+from world.camera import Camera
+from world.fog import FogOfWar
+from world.input import PAUSE, RESTART, RUN, bits_from_move, move_from_bits
+from world.noise import NoiseModel
 from entities.player import Player
+from world.settings import (AGENT_MIX, AI_ALERTS, AI_BEHAVIOURS, AI_BUDGET_US, AI_HEARING, AI_LOD, FOG_RADIUS,
+                            MAZE_FOG, MAZE_LENGTH, MAZE_WIDTH, NOISE_REACH, VISION_CONE_CLIP)
 from Hackathon_Stealth_main.AI_Agents.Agent_Actions import Agent_Actions
+from Hackathon_Stealth_main.AI_Agents.Agent_Alerts import AlertBoard
+from Hackathon_Stealth_main.AI_Agents.Agent_Behaviours import BehaviourEngine
+from Hackathon_Stealth_main.AI_Agents.Agent_Scheduler import AIScheduler
 
 
 class PlayingState(BaseState):
@@ -15,9 +27,22 @@ class PlayingState(BaseState):
     will make sure agents exist (calls game.populate()) and will move/draw them each frame.
     """
 
-    def __init__(self):
+    dirty_rects = True
+
+    def __init__(self, grid=None, tile_size=50, move_input=None, maze=None, agent_mix=None):
+        """
+        grid / tile_size override the built-in 16x16 level.
+        move_input is an optional callable returning (dx, dy) in {-1, 0, 1};
+        when given it replaces the held actions in game.input.
+        maze is a ready-made Maze (e.g. from maps.mapfile.load_maze); it
+        takes precedence over grid / tile_size, whose Maze otherwise comes
+        from Maze.cached (shared by every state on the same level).
+        agent_mix ({type: weight}, see Agent_Behaviours) runs the agents as
+        those types through a BehaviourEngine; {} means plain guards and None
+        follows settings (AGENT_MIX if AI_BEHAVIOURS is on).
+        """
         # grid: 16 rows x 16 cols (1 = wall, 0 = floor)
-        self.grid = [
+        self.grid = grid if grid is not None else [
             [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
             [1,0,1,1,1,1,1,1,1,1,1,1,0,1,1,1],
             [1,0,1,1,1,1,1,1,1,1,1,1,0,1,1,1],
@@ -36,66 +61,155 @@ class PlayingState(BaseState):
             [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
         ]
 
-        self.tile_size = 50
+        self.tile_size = tile_size
 
         # Maze and Player
-        self.maze = Maze(self.grid, self.tile_size)
+        if maze is not None:
+            self.maze = maze
+            self.grid = maze.grid
+            self.tile_size = maze.tile_size
+        else:
+            self.maze = Maze.cached(self.grid, self.tile_size)
 
         # Start position in pixels (tile (1,1) approx.)
         start_x = 60
         start_y = 60
+        if self.maze.rect_collides(start_x, start_y, 11):
+            # generated maps may have a wall there: use the first floor tile
+            floor = self.maze.floor_indices()
+            if len(floor):
+                row, col = divmod(int(floor[0]), self.maze.cols)
+                start_x = col * self.maze.tile_size + (self.maze.tile_size - 10) // 2
+                start_y = row * self.maze.tile_size + (self.maze.tile_size - 10) // 2
         self.player = Player(start_x, start_y, size=10, speed=180)
 
         # Agent action controller (draw_cones True for debug)
-        self.actions = Agent_Actions(show_cones=True)
+        # (agent types step through the BehaviourEngine, which has no LOD scheduling)
+        if agent_mix is None:
+            agent_mix = AGENT_MIX if AI_BEHAVIOURS else {}
+        self.agent_mix = dict(agent_mix)
+        behaviours = BehaviourEngine(mix=agent_mix) if agent_mix else None
+        if AI_LOD and behaviours is not None:
+            warnings.warn("AI_LOD is ignored with agent types: the BehaviourEngine steps every agent "
+                          "every AI tick", RuntimeWarning, stacklevel=2)
+        scheduler = AIScheduler(budget_us=AI_BUDGET_US) if AI_LOD and behaviours is None else None
+        alerts = AlertBoard() if AI_ALERTS else None
+        noise = NoiseModel(NOISE_REACH) if AI_HEARING else None
+        self.actions = Agent_Actions(show_cones=True, clip_cones=VISION_CONE_CLIP, scheduler=scheduler,
+                                     alerts=alerts, behaviours=behaviours, noise=noise)
 
         # Optional font for debug text/UI
         self.font: Optional[pygame.font.Font] = None
 
-    def handle_events(self, game, event):
+        self.move_input = move_input
+        self.input_bits = 0
+        self._move = (0, 0)
+        self._running = False
+
+        # positions at the start of the last fixed steps (see draw)
+        self._player_prev = None
+        self._agents_prev = None
+
+        # viewport following the player (sized to the screen on first draw)
+        self.camera = None
+        self._backdrop = None
+
+        # what the player has seen (MAZE_FOG); drawn over the maze
+        self.fog = FogOfWar(self.maze, FOG_RADIUS) if MAZE_FOG else None
+
+    @property
+    def behaviours(self):
+        """The BehaviourEngine the agents run on (World.populate gives them types from it), or None."""
+        return self.actions.behaviours
+
+    def preload(self):
+        """Build the maze's spawn tables and the chunks around the start (World.load_state)."""
+        maze = self.maze
+        maze.spawn_planner()
+        view = Camera(min(MAZE_WIDTH, maze.width), min(MAZE_LENGTH, maze.height), maze.width, maze.height,
+                      step=maze.tile_size)
+        half = self.player.size / 2
+        view.follow(self.player.x + half, self.player.y + half)
+        maze.chunk_cache().prefetch(view.offset, view.view_w, view.view_h)
+
+    def enter(self, game):
+        if hasattr(game, "agents") and len(game.agents) > 0:
+            # replacing a level: its agents go, this level's come in now
+            game.agents.clear()
+            if hasattr(game, "populate"):
+                game.populate()
+
+    def handle_action(self, game, action):
         # Discrete actions only (NOT continuous movement)
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                # Placeholder: could switch to PauseState later
-                pass
-
-            if event.key == pygame.K_r:
-                # Restart: re-create state and repopulate agents in the World
-                # Clear existing agents, replace current state and repopulate
-                try:
-                    # clear the world's agents list if present
-                    if hasattr(game, "agents"):
-                        game.agents.clear()
-                except Exception:
-                    pass
-
-                game.change_state(PlayingState())
-                # populate will use the new current_state (this) to access maze
-                if hasattr(game, "populate"):
-                    game.populate()
+        if action == PAUSE:
+            # Placeholder: could switch to PauseState later
+            pass
+
+        if action == RESTART:
+            # Restart: build a fresh state off the main loop; the World
+            # switches to it when it's ready and its enter() repopulates.
+            # Presses while it loads are ignored.
+            if getattr(game, "loading", False):
+                return
+            # keep the input source and agent types, and reuse the (immutable) maze
+            grid, tile_size, move_input, maze = self.grid, self.tile_size, self.move_input, self.maze
+            agent_mix = self.agent_mix
+            game.load_state(lambda: PlayingState(grid, tile_size, move_input=move_input, maze=maze,
+                                                 agent_mix=agent_mix))
 
     def update(self, game, dt):
         """
         Called each frame with the world (game) object and dt (seconds)
         - Move the player with keyboard input
         - Ensure agents exist (game.populate()) and move them with Agent_Actions
+        A fixed_step World calls the three parts itself, at their own rates.
         """
-        # Smooth movement (held keys)
-        keys = pygame.key.get_pressed()
-        dx = 0
-        dy = 0
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-            dx -= 1
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-            dx += 1
-        if keys[pygame.K_w] or keys[pygame.K_UP]:
-            dy -= 1
-        if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-            dy += 1
+        self.poll_input(game)
+        self.update_player(game, dt)
+        self.update_agents(game, dt)
+
+    def poll_input(self, game):
+        """Read this frame's movement input (held until the next poll)."""
+        if self.move_input is not None:
+            dx, dy = self.move_input()
+            bits = bits_from_move(dx, dy)
+        else:
+            # held movement actions (kept current by World.handle_events)
+            inputs = getattr(game, "input", None)
+            bits = inputs.held if inputs is not None else 0
+            dx, dy = move_from_bits(bits)
+        self._move = (dx, dy)
+        self._running = bool(bits & RUN)
+
+        # this tick's movement as MOVE_* bits (recorded by sim.replay)
+        self.input_bits = bits
 
+    def update_player(self, game, dt):
+        """Move the player by dt with the polled input."""
+        if getattr(game, "fixed_step", False):
+            # start of this step, for draw() to interpolate from
+            self._player_prev = (self.player.x, self.player.y)
+
+        dx, dy = self._move
         # Player movement (maze collision handled in Player.update)
-        self.player.update(dt, self.maze, dx, dy)
+        spatial = getattr(game, "spatial", None)
+        # the World's Profiler, when profiling is on
+        profiler = getattr(game, "profiler", None)
+        if profiler is not None:
+            t0 = time.perf_counter()
+            made = self.player.update(dt, self.maze, dx, dy, spatial, self._running)
+            profiler.add("player", t0, time.perf_counter())
+        else:
+            made = self.player.update(dt, self.maze, dx, dy, spatial, self._running)
+
+        # footsteps and bumps, heard on the agents' next step
+        noise = self.actions.noise
+        if made and noise is not None:
+            half = self.player.size / 2
+            noise.emit(self.maze.tile_index_at(self.player.x + half, self.player.y + half), made)
 
+    def update_agents(self, game, dt):
+        """Make sure the world has agents and move them by dt."""
         # Ensure the world has agents (World.populate uses current_state.maze)
         if not hasattr(game, "agents") or len(game.agents) == 0:
             if hasattr(game, "populate"):
@@ -103,20 +217,132 @@ class PlayingState(BaseState):
 
         # Move agents: game.agents is owned by the World object (game)
         if hasattr(game, "agents"):
+            if getattr(game, "fixed_step", False):
+                self._agents_prev = [(a.x, a.y) for a in game.agents]
             # pass the maze instance (this state's maze) to collision-check agents
-            self.actions.move_agents(game.agents, self.player, self.maze, dt)
+            self.actions.profiler = getattr(game, "profiler", None)
+            self.actions.move_agents(game.agents, self.player, self.maze, dt,
+                                     getattr(game, "spatial", None))
+
+    def snapshot(self):
+        """Simulation state owned by this state (see World.snapshot)."""
+        return {"player": self.player, "scheduler": self.actions.scheduler, "alerts": self.actions.alerts,
+                "noise": self.actions.noise}
+
+    def restore(self, snap):
+        self.player = snap["player"]
+        # cached per-agent arrays refer to the old agent objects
+        self.actions.invalidate_batch()
+        self.actions.scheduler = snap.get("scheduler")
+        self.actions.alerts = snap.get("alerts")
+        self.actions.noise = snap.get("noise")
 
     def draw(self, game, screen):
-        """Draw the maze, player, agents, and optional debug overlays."""
-        # Draw static maze
-        self.maze.draw(screen)
+        """
+        Draw the maze, player, agents, and optional debug overlays. With a
+        fixed_step World, positions are drawn interpolated between the last
+        two simulation steps.
+        """
+        if getattr(game, "fixed_step", False):
+            undo = self._interpolate(game)
+            try:
+                self._draw_scene(game, screen)
+            finally:
+                undo()
+        else:
+            self._draw_scene(game, screen)
+
+    def _interpolate(self, game):
+        """
+        Move the player and agents to their render positions (alpha of the
+        way from the previous step to the current one); returns an undo.
+        """
+        player = self.player
+        saved_player = (player.x, player.y)
+        if self._player_prev is not None:
+            alpha = game.player_clock.alpha
+            px, py = self._player_prev
+            player.x = px + (player.x - px) * alpha
+            player.y = py + (player.y - py) * alpha
+
+        agents = game.agents
+        prev = self._agents_prev
+        saved_agents = None
+        if prev is not None and len(prev) == len(agents):
+            alpha = game.ai_clock.alpha
+            saved_agents = [(a.x, a.y) for a in agents]
+            for a, (ax, ay) in zip(agents, prev):
+                a.x = ax + (a.x - ax) * alpha
+                a.y = ay + (a.y - ay) * alpha
+
+        def undo():
+            player.x, player.y = saved_player
+            if saved_agents is not None:
+                for a, (ax, ay) in zip(agents, saved_agents):
+                    a.x = ax
+                    a.y = ay
+
+        return undo
+
+    def _draw_scene(self, game, screen):
+        renderer = getattr(game, "renderer", None)
+
+        # Camera follows the player a tile at a time; maps smaller than the window never scroll
+        camera = self.camera
+        if camera is None or (camera.view_w, camera.view_h) != screen.get_size():
+            camera = self.camera = Camera(screen.get_width(), screen.get_height(),
+                                          self.maze.width, self.maze.height, step=self.maze.tile_size)
+            self._backdrop = None
+        half = self.player.size / 2
+        moved = camera.follow(self.player.x + half, self.player.y + half)
+        offset = camera.offset
+
+        # fog of war: field of view recomputed when the player changes tile
+        fog = self.fog
+        if fog is not None:
+            fog.update(self.player.x + half, self.player.y + half)
+
+        # Draw static maze (only restores what moved last frame with a renderer)
+        if renderer is not None:
+            # the visible maze is composed from chunks into a window-sized
+            # backdrop, recomposed (with a full repaint) only when the view moves
+            fogged = None
+            if self._backdrop is None or moved:
+                if self._backdrop is None:
+                    self._backdrop = pygame.Surface(screen.get_size())
+                self._backdrop.fill((0, 0, 0))
+                self.maze.draw(self._backdrop, offset)
+                if fog is not None:
+                    fog.draw(self._backdrop, offset)
+                renderer.invalidate()
+            elif fog is not None:
+                # only the tiles whose fog changed are repainted
+                fogged = fog.redraw(self._backdrop, offset)
+            renderer.begin(self._backdrop)
+            if fogged:
+                for r in fogged:
+                    screen.blit(self._backdrop, r, r)
+                renderer.add(fogged)
+        else:
+            self.maze.draw(screen, offset)
+            if fog is not None:
+                fog.draw(screen, offset)
 
         # Draw player
-        self.player.draw(screen)
+        rect = self.player.draw(screen, offset)
+        if renderer is not None:
+            renderer.add(rect)
 
         # Draw agents (if the world has them)
         if hasattr(game, "agents") and len(game.agents) > 0:
-            self.actions.draw_agents(screen, game.agents)
+            agents = game.agents
+            if fog is not None:
+                # guards in the fog stay hidden
+                agents = [a for a in agents if fog.is_visible(a.x + a.size / 2, a.y + a.size / 2)]
+            self.actions.profiler = getattr(game, "profiler", None)
+            rects = self.actions.draw_agents(screen, agents, maze=self.maze, offset=offset)
+            if renderer is not None:
+                renderer.add(rects)
 
         # Optional debug overlay text
         # (uncomment if you want simple on-screen instructions)
@@ -0,0 +1,54 @@
+import copy
+import random
+
+import pytest
+
+from world.world import World
+from world.spatial_hash import SpatialHash
+from world.settings import SPATIAL_CELL_SIZE
+from Hackathon_Stealth_main.AI_Agents.Agent_Actions import Agent_Actions
+
+
+def state_of(agents):
+    return [(a.x, a.y, tuple(a.facing), a.chasing, a.patrol_target) for a in agents]
+
+
+def make_spatial(player, agents):
+    spatial = SpatialHash(SPATIAL_CELL_SIZE)
+    spatial.insert(player)
+    for a in agents:
+        spatial.insert(a, reach=a.vision_distance)
+    return spatial
+
+
+@pytest.mark.parametrize("count", [7, 150])
+@pytest.mark.parametrize("use_spatial", [False, True])
+def test_numpy_backend_matches_python(count, use_spatial):
+    world = World(320, 320, headless=True, seed=3)
+    world.populate(count)
+    maze = world.current_state.maze
+
+    agents_py = world.agents
+    agents_np = copy.deepcopy(agents_py)
+    player_py = world.current_state.player
+    player_np = copy.deepcopy(player_py)
+    spatial_py = make_spatial(player_py, agents_py) if use_spatial else None
+    spatial_np = make_spatial(player_np, agents_np) if use_spatial else None
+    python_actions = Agent_Actions(backend="python")
+    numpy_actions = Agent_Actions(backend="numpy")
+
+    walk = random.Random(4)
+    dt = 1.0 / 60
+    for frame in range(240):
+        if frame % 20 == 0:
+            dx, dy = walk.choice((-1, 0, 1)), walk.choice((-1, 0, 1))
+        player_py.update(dt, maze, dx, dy, spatial_py)
+        player_np.update(dt, maze, dx, dy, spatial_np)
+        python_actions.move_agents(agents_py, player_py, maze, dt, spatial_py)
+        numpy_actions.move_agents(agents_np, player_np, maze, dt, spatial_np)
+        assert state_of(agents_np) == state_of(agents_py), f"backends diverged at frame {frame}"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        Agent_Actions(backend="cython")
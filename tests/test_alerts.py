@@ -0,0 +1,111 @@
+import pytest
+
+from world.maze import Maze
+from world.pathfinding import FlowField
+from world.spatial_hash import SpatialHash
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from Hackathon_Stealth_main.AI_Agents.Agent_Actions import Agent_Actions
+from Hackathon_Stealth_main.AI_Agents.Agent_Alerts import AlertBoard
+from Hackathon_Stealth_main.AI_Agents.Agent_Scheduler import AIScheduler
+
+
+class Guard:
+    pass
+
+
+def test_responders_expire_without_steering():
+    board = AlertBoard(timeout=1.0)
+    guard = Guard()
+    board.responders[guard] = board.time + board.timeout
+    assert board.is_responding(guard)
+
+    board.advance(0.5)
+    assert board.is_responding(guard)
+    board.advance(0.5)
+    assert not board.is_responding(guard)
+    assert guard not in board.responders
+
+
+def test_advance_prunes_expired_responders():
+    board = AlertBoard(timeout=1.0)
+    guards = [Guard() for _ in range(3)]
+    for i, guard in enumerate(guards):
+        board.responders[guard] = board.time + board.timeout * (i + 1)
+    board.advance(1.5)
+    assert list(board.responders) == guards[1:]
+
+
+def on_tile(maze, tile, size=6):
+    row, col = divmod(tile, maze.cols)
+    return StandardAI(col * maze.tile_size + (maze.tile_size - size) / 2,
+                      row * maze.tile_size + (maze.tile_size - size) / 2, size=size)
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 2), 50)
+
+
+def test_propagate_alerts_guards_within_path_radius(maze):
+    floor = maze.floor_indices().tolist()
+    sighting = floor[len(floor) // 2]
+    guards = [on_tile(maze, t) for t in floor]
+    board = AlertBoard(radius=5, rebroadcast=0.5)
+    board.report(sighting)
+    assert board.last_known == sighting
+    alerted = board.propagate(maze, guards, player=None)
+
+    reach = FlowField(maze, sighting, 5).dist_of
+    expected = {id(g) for g, t in zip(guards, floor) if t in reach}
+    assert alerted == len(expected) and {id(g) for g in board.responders} == expected
+
+    # the same guards are found through a SpatialHash
+    spatial = SpatialHash(128)
+    spatial.insert_many(guards)
+    again = AlertBoard(radius=5)
+    again.report(sighting)
+    assert again.propagate(maze, guards, None, spatial) == alerted
+
+
+def test_rebroadcast_is_throttled(maze):
+    tile = int(maze.floor_indices()[0])
+    board = AlertBoard(rebroadcast=0.5)
+    board.report(tile)
+    board.propagate(maze, [], None)
+    board.report(tile)
+    board.advance(0.2)
+    board.propagate(maze, [], None)
+    assert board.alerts == 1
+    board.advance(0.4)
+    board.propagate(maze, [], None)
+    assert board.alerts == 2
+
+
+def test_responders_walk_to_the_sighting(maze):
+    floor = maze.floor_indices().tolist()
+    sighting = floor[len(floor) // 2]
+    reach = FlowField(maze, sighting, 6).dist_of
+    start = max(reach, key=reach.get)
+    guard = on_tile(maze, start)
+    board = AlertBoard(radius=6)
+    board.report(sighting)
+    board.propagate(maze, [guard], None)
+    steps = 0
+    while True:
+        target = board.steer(maze, guard)
+        if target is None:
+            break
+        guard.x, guard.y = target
+        steps += 1
+    assert steps == reach[start]
+    assert maze.tile_index_at(guard.x + guard.size / 2, guard.y + guard.size / 2) == sighting
+    assert not board.is_responding(guard)
+
+
+def test_numpy_backend_rejects_python_only_options():
+    with pytest.raises(ValueError):
+        Agent_Actions(backend="numpy", alerts=AlertBoard())
+    with pytest.raises(ValueError):
+        Agent_Actions(backend="numpy", scheduler=AIScheduler())
@@ -0,0 +1,63 @@
+import gc
+
+import numpy as np
+import pytest
+
+from world.maze import Maze
+from sim.batch import SharedMaze, param_grid, run_episode, run_sweep, summarize
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 2), 50)
+
+
+def test_param_grid_is_the_product_in_axis_order():
+    grid = param_grid(agents=[7, 20], vision_distance=[90.0, 120.0, 150.0])
+    assert len(grid) == 6
+    assert grid[0] == {"agents": 7, "vision_distance": 90.0}
+    assert grid[-1] == {"agents": 20, "vision_distance": 150.0}
+
+
+def test_from_buffer_keeps_the_buffer(maze):
+    buffer = bytearray(maze.tiles)
+    view = Maze.from_buffer(buffer, maze.rows, maze.cols, 50)
+    copy = Maze.from_buffer(buffer, maze.rows, maze.cols, 50, copy=True)
+    buffer[0] = 2
+    assert view.tile_array[0, 0] == 2 and copy.tile_array[0, 0] == maze.tile_array[0, 0]
+    with pytest.raises(ValueError):
+        Maze.from_buffer(buffer[:-1], maze.rows, maze.cols, 50)
+
+
+def test_shared_maze_round_trip(maze):
+    shared = SharedMaze(maze)
+    try:
+        attached, blocks = SharedMaze.attach(shared.spec)
+        assert isinstance(attached.tiles, memoryview)
+        assert (attached.tile_array == maze.tile_array).all()
+        assert (attached.floor_indices() == maze.floor_indices()).all()
+        assert bytes(attached.visibility) == bytes(maze.visibility)
+        del attached
+        gc.collect()
+        for shm in blocks:
+            shm.close()
+    finally:
+        shared.close()
+
+
+def test_sweep_matches_serial_episodes(maze):
+    grid = param_grid(agents=[10], vision_distance=[60.0, 200.0])
+    columns = run_sweep(maze, grid, range(2), 200, workers=2)
+    assert columns["episode"].tolist() == [0, 1, 2, 3]
+    assert columns["vision_distance"].tolist() == [60.0, 60.0, 200.0, 200.0]
+    for i, (params, seed) in enumerate((p, s) for p in grid for s in range(2)):
+        row = run_episode(maze, params, seed, 200)
+        assert columns["detected"][i] == row["detected"]
+        assert columns["ticks"][i] == row["ticks"]
+
+    summary = summarize(columns, ["vision_distance"])
+    assert [(point, n) for point, n, _, _ in summary] == [((60.0,), 2), ((200.0,), 2)]
+    assert all(0.0 <= rate <= 1.0 for _, _, rate, _ in summary)
+    assert np.isnan(columns["time_to_detection"][~columns["detected"]]).all()
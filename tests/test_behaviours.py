@@ -0,0 +1,173 @@
+import copy
+import math
+
+import numpy as np
+import pytest
+
+from world.maze import Maze
+from world.noise import NoiseModel
+from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from Hackathon_Stealth_main.AI_Agents.Agent_Alerts import AlertBoard
+from Hackathon_Stealth_main.AI_Agents.Agent_Behaviours import (AGENT_TYPES, BehaviourEngine, format_mix,
+                                                              parse_mix)
+
+DT = 1 / 30
+
+
+class Player:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.size = 10
+
+
+@pytest.fixture
+def room():
+    grid = [[1] * 12] + [[1] + [0] * 10 + [1] for _ in range(10)] + [[1] * 12]
+    return Maze(grid, 50)
+
+
+def guard(engine, kind, x=100.0, y=100.0):
+    a = StandardAI(x, y)
+    a.patrol_endA = (x, y)
+    a.patrol_endB = (x, y + 200.0)
+    engine.setup(a, kind)
+    a.facing[:] = [1.0, 0.0]
+    return a
+
+
+def test_patroller_chases_what_it_sees_and_goes_back(room):
+    engine = BehaviourEngine()
+    a = guard(engine, "patroller")
+    engine.step([a], Player(160.0, 100.0), room, DT)
+    assert a.mode == "chase" and a.chasing
+    assert a.x > 100.0
+
+    engine.step([a], Player(500.0, 500.0), room, DT)
+    assert a.mode == "patrol" and not a.chasing
+
+
+def test_hunter_searches_scans_then_patrols(room):
+    engine = BehaviourEngine()
+    a = guard(engine, "hunter")
+    agents = [a]
+    engine.step(agents, Player(220.0, 100.0), room, DT)
+    assert a.mode == "chase" and a.last_seen == (220.0, 100.0)
+
+    away = Player(520.0, 520.0)
+    engine.step(agents, away, room, DT)
+    assert a.mode == "search"
+    for _ in range(90):
+        engine.step(agents, away, room, DT)
+        if a.mode != "search":
+            break
+    assert a.mode == "scan"
+    assert math.hypot(a.x - 220.0, a.y - 100.0) <= 4.0
+
+    # scanning stands still until its timeout
+    x, y = a.x, a.y
+    for _ in range(int(3.0 / DT) - 2):
+        engine.step(agents, away, room, DT)
+    assert (a.x, a.y) == (x, y) and a.mode == "scan"
+    for _ in range(3):
+        engine.step(agents, away, room, DT)
+    assert a.mode == "patrol"
+
+
+def test_alerted_guards_investigate_until_released(room):
+    engine = BehaviourEngine()
+    a = guard(engine, "patroller", 60.0, 60.0)
+    board = AlertBoard(radius=10)
+    sighting = room.tile_index_at(310, 310)
+    board.report(sighting)
+    board.propagate(room, [a], None)
+    away = Player(520.0, 60.0)
+    engine.step([a], away, room, DT, alerts=board)
+    assert a.mode == "investigate"
+    for _ in range(300):
+        board.advance(DT)
+        engine.step([a], away, room, DT, alerts=board)
+        if a.mode != "investigate":
+            break
+    assert a.mode == "patrol"
+    assert room.tile_index_at(a.x + a.size / 2, a.y + a.size / 2) == sighting
+
+
+def test_hearing_sends_patrols_to_search_and_sentries_to_listen(room):
+    engine = BehaviourEngine()
+    patroller = guard(engine, "patroller", 60.0, 60.0)
+    sentry = guard(engine, "sentry", 110.0, 60.0)
+    camera = guard(engine, "camera", 60.0, 160.0)
+    agents = [patroller, sentry, camera]
+    noise = NoiseModel()
+    source = room.tile_index_at(210, 210)
+    noise.emit(source, 6.0)
+    noise.listen(room)
+    engine.step(agents, Player(520.0, 520.0), room, DT, noise=noise)
+
+    assert patroller.mode == "search" and sentry.mode == "listen"
+    # cameras don't listen
+    assert camera.mode == "sweep"
+    half = patroller.size / 2
+    assert patroller.last_seen == (225.0 - half, 225.0 - half)
+    assert sentry.x == 110.0 and sentry.facing[0] > 0 and sentry.facing[1] > 0
+
+
+def test_stationary_types_never_move(room):
+    engine = BehaviourEngine(mix={"sentry": 1, "camera": 1})
+    agents = [guard(engine, "sentry"), guard(engine, "camera", 300.0, 300.0)]
+    start = [(a.x, a.y) for a in agents]
+    facing = [tuple(a.facing) for a in agents]
+    for _ in range(60):
+        engine.step(agents, Player(520.0, 520.0), room, DT)
+    assert [(a.x, a.y) for a in agents] == start
+    assert [tuple(a.facing) for a in agents] != facing
+
+
+def test_assign_follows_the_mix():
+    engine = BehaviourEngine(mix={"patroller": 3, "camera": 1})
+    agents = [StandardAI(0, 0) for _ in range(4000)]
+    engine.assign(agents, np.random.default_rng(0))
+    kinds = [a.kind for a in agents]
+    assert set(kinds) == {"patroller", "camera"}
+    assert abs(kinds.count("camera") / len(kinds) - 0.25) < 0.03
+    camera = next(a for a in agents if a.kind == "camera")
+    assert camera.mode == "sweep" and camera.vision_distance == 200.0
+    assert camera.cos_half_vision == pytest.approx(math.cos(math.pi / 6))
+
+
+def test_mix_text_round_trips():
+    mix = parse_mix("patroller=4, hunter=1.5")
+    assert mix == {"patroller": 4.0, "hunter": 1.5}
+    assert format_mix(mix) == "patroller=4,hunter=1.5" and format_mix({}) == ""
+    for bad in ("patroller", "ninja=1", "hunter=x", "hunter=0"):
+        with pytest.raises(ValueError):
+            parse_mix(bad)
+
+
+def broken(edit):
+    types = copy.deepcopy(AGENT_TYPES)
+    edit(types)
+    return types
+
+
+@pytest.mark.parametrize("types", [
+    broken(lambda t: t["patroller"].update(start="nap")),
+    broken(lambda t: t["patroller"]["states"]["patrol"].update(action="fly")),
+    broken(lambda t: t["patroller"]["states"]["patrol"]["on"].update(smells="chase")),
+    broken(lambda t: t["patroller"]["states"]["patrol"]["on"].update(sees="nap")),
+    broken(lambda t: t["patroller"]["states"]["chase"]["on"].update(timeout="patrol")),
+])
+def test_inconsistent_tables_are_rejected(types):
+    with pytest.raises(ValueError):
+        BehaviourEngine(types=types)
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(ValueError):
+        BehaviourEngine(mix={"ninja": 1})
+    engine = BehaviourEngine()
+    a = StandardAI(60, 60)
+    a.kind = "ninja"
+    with pytest.raises(ValueError):
+        engine.step([a], Player(0.0, 0.0), None, DT)
@@ -0,0 +1,107 @@
+import threading
+
+import pygame
+import pytest
+
+from world.camera import Camera
+from world.chunks import MazeChunks
+from world.maze import Maze
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 4), 50)
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def test_chunks_draw_the_tiles(maze):
+    chunks = MazeChunks(maze, chunk_pixels=200)
+    screen = pygame.Surface((430, 370), depth=32)
+    offset = (175, 260)
+    chunks.draw(screen, offset)
+    ts = maze.tile_size
+    for sy in range(0, 370, 23):
+        for sx in range(0, 430, 29):
+            row, col = (sy + offset[1]) // ts, (sx + offset[0]) // ts
+            tile = int(maze.tile_array[row, col])
+            assert tuple(screen.get_at((sx, sy)))[:3] == maze.tile_colors[tile]
+
+
+def test_lru_eviction_keeps_the_byte_cap(maze):
+    size = surface_bytes(MazeChunks(maze, chunk_pixels=200).chunk(0, 0))
+    chunks = MazeChunks(maze, chunk_pixels=200, max_bytes=3 * size)
+    for key in ((0, 0), (0, 1), (0, 2)):
+        chunks.chunk(*key)
+    chunks.chunk(0, 0)          # most recently used again
+    chunks.chunk(1, 0)          # evicts (0, 1), the least recently used
+    assert list(chunks.chunks) == [(0, 2), (0, 0), (1, 0)]
+    assert chunks.bytes == 3 * size
+    assert chunks.rendered == 4
+
+    first = chunks.chunk(0, 0)
+    assert chunks.chunk(0, 0) is first and chunks.rendered == 4
+
+    # one chunk bigger than the cap is still kept
+    tiny = MazeChunks(maze, chunk_pixels=200, max_bytes=1)
+    tiny.chunk(0, 0)
+    tiny.chunk(0, 1)
+    assert list(tiny.chunks) == [(0, 1)]
+
+
+def test_clear_during_prefetch_keeps_the_count_consistent(maze):
+    chunks = MazeChunks(maze, chunk_pixels=100)
+    stop = threading.Event()
+
+    def prefetch():
+        while not stop.is_set():
+            chunks.prefetch((0, 0), maze.width, maze.height)
+
+    loader = threading.Thread(target=prefetch)
+    loader.start()
+    try:
+        for _ in range(200):
+            chunks.clear()
+            chunks.chunk(0, 0)
+    finally:
+        stop.set()
+        loader.join()
+    assert chunks.bytes == sum(surface_bytes(s) for s in chunks.chunks.values())
+
+
+def test_camera_clamps_to_the_world():
+    camera = Camera(400, 300, 1000, 800)
+    camera.follow(0, 0)
+    assert camera.offset == (0, 0)
+    camera.follow(10_000, 10_000)
+    assert camera.offset == (600, 500)
+    small = Camera(400, 300, 200, 100)
+    assert not small.follow(150, 90) and small.offset == (0, 0)
+    assert camera.visible(650, 550, 10, 10) and not camera.visible(0, 0, 10, 10)
+
+
+def test_camera_steps_a_tile_at_a_time():
+    camera = Camera(400, 400, 5000, 5000, step=50)
+    camera.follow(1000, 1000)
+    moves = 0
+    x = 1000.0
+    for _ in range(1000):
+        x += 2.0
+        moved = camera.follow(x, 1000)
+        moves += moved
+        assert camera.x % 50 == 0
+        # the followed point never strays more than a step from the centre
+        assert abs(camera.x + 200 - x) <= 50 + 25
+    assert moves <= 2000 / 50 + 1
+    # standing still never moves it
+    assert not camera.follow(x, 1000)
+
+
+def test_camera_step_one_follows_every_pixel():
+    camera = Camera(400, 400, 5000, 5000)
+    camera.follow(1000, 1000)
+    assert camera.follow(1001, 1000) and camera.offset == (801, 800)
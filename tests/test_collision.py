@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+from world.maze import Maze
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 2), 50)
+
+
+def random_moves(maze, count, seed, reach):
+    """(x, y, size, dx, dy) for boxes at integer positions clear of the walls."""
+    rng = random.Random(seed)
+    moves = []
+    while len(moves) < count:
+        size = rng.choice((8, 10, 20))
+        x = rng.randrange(0, maze.width - size)
+        y = rng.randrange(0, maze.height - size)
+        if maze.rect_collides(x, y, size):
+            continue
+        moves.append((x, y, size, rng.randint(-reach, reach), rng.randint(-reach, reach)))
+    return moves
+
+
+def per_axis(maze, x, y, size, dx, dy):
+    """Reference: move X, then Y, one pixel at a time, stopping at the first overlap."""
+    for axis, d in ((0, dx), (1, dy)):
+        step = 1 if d > 0 else -1
+        for _ in range(abs(d)):
+            nx, ny = (x + step, y) if axis == 0 else (x, y + step)
+            if maze.rect_collides(nx, ny, size):
+                break
+            x, y = nx, ny
+    return x, y
+
+
+def test_sweep_box_matches_per_axis_stepping(maze):
+    for x, y, size, dx, dy in random_moves(maze, 2000, seed=1, reach=120):
+        sx, sy, t = maze.sweep_box(x, y, size, dx, dy)
+        assert (sx, sy) == per_axis(maze, x, y, size, dx, dy), (x, y, size, dx, dy)
+        assert 0.0 <= t <= 1.0
+        assert not maze.rect_collides(int(sx), int(sy), size)
+
+
+def test_sweep_box_never_tunnels(maze):
+    # moves of several tiles in one call stop at the first wall like short ones
+    for x, y, size, dx, dy in random_moves(maze, 300, seed=2, reach=400):
+        assert maze.sweep_box(x, y, size, dx, dy)[:2] == per_axis(maze, x, y, size, dx, dy)
+
+
+def test_sweep_boxes_matches_sweep_box(maze):
+    moves = random_moves(maze, 2000, seed=3, reach=120)
+    xs, ys, sizes, dxs, dys = (np.array(column, dtype=np.float64) for column in zip(*moves))
+    bx, by, bt = maze.sweep_boxes(xs, ys, sizes, dxs, dys)
+    for i, (x, y, size, dx, dy) in enumerate(moves):
+        assert (bx[i], by[i], bt[i]) == maze.sweep_box(float(x), float(y), size, float(dx), float(dy))
+
+
+def test_fast_player_stops_at_walls():
+    state = PlayingState()
+    player, maze = state.player, state.maze
+    player.speed = 50_000
+    for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1), (1, 1), (-1, -1)):
+        for _ in range(3):
+            x, y = player.x, player.y
+            player.update(1.0 / 60, maze, dx, dy)
+            assert not maze.rect_collides(int(player.x), int(player.y), player.size)
+            # it ends flush against whatever stopped it, as one sweep would
+            assert (player.x, player.y) == maze.sweep_box(x, y, player.size, player.x - x, player.y - y)[:2]
@@ -0,0 +1,77 @@
+import math
+import random
+
+import numpy as np
+import pygame
+import pytest
+
+from world.maze import Maze
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from Hackathon_Stealth_main.Vision_Cones.Cones_Initialization import ConeRenderer, fan_template
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 2), 50)
+
+
+def agents_on_floor(maze, count, seed):
+    rng = random.Random(seed)
+    floor = maze.floor_indices().tolist()
+    agents = []
+    for _ in range(count):
+        row, col = divmod(rng.choice(floor), maze.cols)
+        a = StandardAI(col * 50 + rng.uniform(0, 40), row * 50 + rng.uniform(0, 40))
+        angle = rng.uniform(0, 2 * math.pi)
+        a.facing[:] = [math.cos(angle), math.sin(angle)]
+        if rng.random() < 0.5:
+            a.vision_angle = math.pi / 3
+        agents.append(a)
+    return agents
+
+
+def test_fan_template_is_cached_and_read_only():
+    fan = fan_template(math.pi / 2, 15)
+    assert fan_template(math.pi / 2, 15) is fan
+    assert not fan.flags.writeable
+    assert np.allclose(np.hypot(fan[:, 0], fan[:, 1]), 1.0)
+
+
+@pytest.mark.parametrize("clip", [False, True])
+def test_cones_leave_the_agent_centre(maze, clip):
+    agents = agents_on_floor(maze, 60, seed=1)
+    for a, poly in zip(agents, ConeRenderer(clip=clip).polygons(agents, maze)):
+        half = a.size / 2
+        assert tuple(poly[0]) == (a.x + half, a.y + half)
+        rays = poly[1:] - poly[0]
+        lengths = np.hypot(rays[:, 0], rays[:, 1])
+        assert (lengths <= a.vision_distance + 1e-9).all()
+        if not clip:
+            assert np.allclose(lengths, a.vision_distance)
+        # every ray is within half the vision angle of the facing
+        cos = (rays @ np.array(a.facing))[lengths > 0] / lengths[lengths > 0]
+        assert (cos >= math.cos(a.vision_angle / 2) - 1e-9).all()
+
+
+def test_clipped_rays_stop_before_walls(maze):
+    agents = agents_on_floor(maze, 60, seed=2)
+    clipped = ConeRenderer(clip=True).polygons(agents, maze)
+    assert any(not np.allclose(np.hypot(*(p[1:] - p[0]).T), a.vision_distance)
+               for a, p in zip(agents, clipped)), "no cone touched a wall"
+    for poly in clipped:
+        assert not maze.walls_at_pixels(poly[:, 0], poly[:, 1]).any()
+
+
+def test_draw_reports_what_it_touched(maze):
+    agents = agents_on_floor(maze, 20, seed=3)
+    renderer = ConeRenderer()
+    screen = pygame.Surface((maze.width, maze.height))
+    rects = renderer.draw(screen, agents)
+    assert rects
+    lit = pygame.mask.from_threshold(screen, (255, 255, 0), (1, 1, 1, 255))
+    bounds = rects[0].unionall(rects)
+    assert lit.count() > 0
+    assert all(bounds.contains(r) for r in lit.get_bounding_rects())
+    assert renderer.draw(screen, []) == []
@@ -0,0 +1,113 @@
+import numpy as np
+import pygame
+import pytest
+
+from world.fog import FOG_ALPHA, FogOfWar, shadowcast
+from world.maze import Maze
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 2), 50)
+
+
+def disc(maze, row, col, radius):
+    return {r * maze.cols + c
+            for r in range(maze.rows) for c in range(maze.cols)
+            if (r - row) ** 2 + (c - col) ** 2 <= radius * radius}
+
+
+def test_open_room_sees_the_whole_radius():
+    room = Maze([[0] * 21 for _ in range(21)], 10)
+    for radius in (1, 4, 7):
+        assert shadowcast(room, 10, 10, radius) == disc(room, 10, 10, radius)
+    # the map edge clips the disc
+    assert shadowcast(room, 0, 0, 5) == disc(room, 0, 0, 5)
+
+
+def test_walls_are_seen_but_not_seen_through():
+    grid = [[0] * 11 for _ in range(11)]
+    for row in grid:
+        row[5] = 1
+    wall = Maze(grid, 10)
+    seen = shadowcast(wall, 5, 2, 8)
+    cols = {t % 11 for t in seen}
+    assert 5 in cols and max(cols) == 5
+    assert seen >= {r * 11 + 5 for r in range(3, 8)}
+
+
+def test_clear_sight_lines_are_visible(maze):
+    floor = maze.floor_indices().tolist()
+    ts = maze.tile_size
+    radius = 6
+    for origin in floor[::37]:
+        row, col = divmod(origin, maze.cols)
+        seen = shadowcast(maze, row, col, radius)
+        assert seen <= disc(maze, row, col, radius)
+        cx, cy = (col + 0.5) * ts, (row + 0.5) * ts
+        for tile in disc(maze, row, col, radius):
+            r, c = divmod(tile, maze.cols)
+            if maze.wall_mask[tile]:
+                continue
+            if maze.has_line_of_sight(cx, cy, (c + 0.5) * ts, (r + 0.5) * ts, 1):
+                assert tile in seen, (origin, tile)
+
+
+def overlay_alpha(fog, size, offset):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 0))
+    fog.draw(surface, offset)
+    return pygame.surfarray.array_alpha(surface)
+
+
+def test_patched_overlay_matches_a_fresh_one(maze):
+    size, offset = (400, 300), (100, 150)
+    fog = FogOfWar(maze, radius=5)
+    floor = maze.floor_indices().tolist()
+    ts = maze.tile_size
+    for tile in floor[40:400:23]:
+        row, col = divmod(tile, maze.cols)
+        assert fog.update((col + 0.5) * ts, (row + 0.5) * ts)
+        patched = overlay_alpha(fog, size, offset)
+
+        fresh = FogOfWar(maze, radius=5)
+        fresh.visible[:] = fog.visible
+        fresh.explored[:] = fog.explored
+        assert np.array_equal(patched, overlay_alpha(fresh, size, offset))
+    assert set(np.unique(patched)) <= set(FOG_ALPHA)
+
+
+def test_update_only_recomputes_on_a_new_tile(maze):
+    fog = FogOfWar(maze, radius=4)
+    tile = int(maze.floor_indices()[0])
+    row, col = divmod(tile, maze.cols)
+    ts = maze.tile_size
+    assert fog.update(col * ts + 5, row * ts + 5)
+    assert not fog.update(col * ts + 40, row * ts + 40)
+    assert fog.updates == 1 and fog.visible[tile] and fog.explored[tile]
+    assert fog.is_visible(col * ts + 1, row * ts + 1)
+
+
+def test_redraw_matches_a_full_repaint(maze):
+    size, offset = (400, 300), (100, 150)
+    fog = FogOfWar(maze, radius=5)
+    ts = maze.tile_size
+    # a walk over the floor tiles in view
+    walk = [t for t in maze.floor_indices().tolist()
+            if 3 <= t // maze.cols < 9 and 2 <= t % maze.cols < 10]
+    backdrop = pygame.Surface(size)
+    maze.draw(backdrop, offset)
+    fog.draw(backdrop, offset)
+    repainted = 0
+    for tile in walk:
+        row, col = divmod(tile, maze.cols)
+        fog.update((col + 0.5) * ts, (row + 0.5) * ts)
+        repainted += len(fog.redraw(backdrop, offset))
+
+        full = pygame.Surface(size)
+        maze.draw(full, offset)
+        fog.draw(full, offset)
+        assert pygame.image.tobytes(backdrop, "RGB") == pygame.image.tobytes(full, "RGB")
+    assert len(walk) > 3 and repainted > 0
@@ -0,0 +1,63 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from maps.generator import generate, recursive_backtracker, rooms_and_corridors
+from world.maze import FLOOR, WALL
+
+
+def floor_components(grid):
+    """Number of 4-connected floor regions."""
+    rows, cols = grid.shape
+    seen = np.zeros(grid.shape, dtype=bool)
+    count = 0
+    for r, c in zip(*np.nonzero(grid == FLOOR)):
+        if seen[r, c]:
+            continue
+        count += 1
+        seen[r, c] = True
+        queue = deque([(r, c)])
+        while queue:
+            y, x = queue.popleft()
+            for ny, nx in ((y - 1, x), (y + 1, x), (y, x - 1), (y, x + 1)):
+                if 0 <= ny < rows and 0 <= nx < cols and grid[ny, nx] == FLOOR and not seen[ny, nx]:
+                    seen[ny, nx] = True
+                    queue.append((ny, nx))
+    return count
+
+
+def floor_edges(grid):
+    floor = grid == FLOOR
+    return int((floor[1:, :] & floor[:-1, :]).sum() + (floor[:, 1:] & floor[:, :-1]).sum())
+
+
+@pytest.mark.parametrize("kind", ["backtracker", "rooms"])
+def test_seeded_bordered_and_connected(kind):
+    grid = generate(kind, 61, 47, seed=3)
+    assert grid.shape == (61, 47) and grid.dtype == np.uint8
+    assert (generate(kind, 61, 47, seed=3) == grid).all()
+    assert not (generate(kind, 61, 47, seed=4) == grid).all()
+    assert set(np.unique(grid)) <= {WALL, FLOOR}
+    assert (grid[0] == WALL).all() and (grid[-1] == WALL).all()
+    assert (grid[:, 0] == WALL).all() and (grid[:, -1] == WALL).all()
+    assert floor_components(grid) == 1
+
+
+def test_backtracker_is_a_perfect_maze():
+    grid = recursive_backtracker(41, 41, seed=5)
+    # a spanning tree over the floor: one fewer corridor than floor tiles
+    assert floor_edges(grid) == int((grid == FLOOR).sum()) - 1
+    assert ((grid[1::2, 1::2]) == FLOOR).all()
+
+
+def test_no_rooms_leaves_only_walls():
+    grid = rooms_and_corridors(80, 80, seed=2, room_attempts=0)
+    assert (grid == WALL).all()
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        generate("caves", 10, 10)
+    with pytest.raises(ValueError):
+        recursive_backtracker(2, 10)
@@ -0,0 +1,43 @@
+from sim.headless import HeadlessRunner, RandomWalk, Scripted, tile_grid
+from sim.replay import fingerprint
+from states.playing_state import PlayingState
+
+
+def test_tile_grid_repeats_the_level():
+    base = PlayingState().grid
+    grid = tile_grid(base, 3)
+    rows, cols = len(base), len(base[0])
+    assert (len(grid), len(grid[0])) == (rows * 3, cols * 3)
+    for r in range(rows * 3):
+        for c in range(cols * 3):
+            assert grid[r][c] == base[r % rows][c % cols]
+
+
+def test_same_seed_same_run():
+    grid = tile_grid(PlayingState().grid, 2)
+    runs = []
+    for _ in range(2):
+        runner = HeadlessRunner(grid, agents=40, seed=6)
+        runner.run(300)
+        runs.append(fingerprint(runner.world))
+    assert runs[0] == runs[1]
+
+
+def test_run_reports_throughput_and_phases():
+    runner = HeadlessRunner(agents=7, seed=1)
+    stats = runner.run(60)
+    assert stats["ticks"] == 60 and stats["agents"] == 7
+    assert stats["ticks_per_sec"] > 0
+    for phase in ("player", "vision", "steering", "collision", "render", "other", "frame"):
+        assert phase + "_ms" in stats
+    assert runner.ticks == 60
+
+
+def test_policies():
+    walk = RandomWalk(seed=3, hold=5)
+    moves = [walk() for _ in range(20)]
+    assert all(moves[i] == moves[i - i % 5] for i in range(20))
+    assert all(dx in (-1, 0, 1) and dy in (-1, 0, 1) for dx, dy in moves)
+
+    scripted = Scripted([(1, 0, 2), (0, -1, 1)])
+    assert [scripted() for _ in range(6)] == [(1, 0), (1, 0), (0, -1)] * 2
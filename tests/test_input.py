@@ -0,0 +1,75 @@
+import pygame
+import pytest
+
+from world.input import (MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT, MOVE_UP, PAUSE, RESTART, RUN, TOGGLE_PROFILER,
+                         ActionMap, InputState, bits_from_move, move_from_bits)
+
+
+def key(kind, code):
+    return pygame.event.Event(kind, key=code)
+
+
+def test_move_bits_round_trip():
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            assert move_from_bits(bits_from_move(dx, dy)) == (dx, dy)
+    assert move_from_bits(MOVE_LEFT | MOVE_RIGHT | MOVE_DOWN) == (0, 1)
+    assert move_from_bits(RUN) == (0, 0)
+
+
+def test_held_keys_and_presses():
+    state = InputState()
+    assert state.handle_event(key(pygame.KEYDOWN, pygame.K_a)) is None
+    state.handle_event(key(pygame.KEYDOWN, pygame.K_UP))
+    state.handle_event(key(pygame.KEYDOWN, pygame.K_LSHIFT))
+    assert state.held == MOVE_LEFT | MOVE_UP | RUN
+    state.handle_event(key(pygame.KEYUP, pygame.K_UP))
+    assert state.held == MOVE_LEFT | RUN
+
+    assert state.handle_event(key(pygame.KEYDOWN, pygame.K_r)) == RESTART
+    assert state.handle_event(key(pygame.KEYDOWN, pygame.K_ESCAPE)) == PAUSE
+    assert state.handle_event(key(pygame.KEYDOWN, pygame.K_F3)) == TOGGLE_PROFILER
+    assert state.handle_event(key(pygame.KEYUP, pygame.K_r)) is None
+    assert state.handle_event(key(pygame.KEYDOWN, pygame.K_q)) is None
+    assert state.held == MOVE_LEFT | RUN
+
+    state.release_all()
+    assert state.held == 0
+
+
+def test_two_keys_for_one_action():
+    state = InputState()
+    state.handle_event(key(pygame.KEYDOWN, pygame.K_d))
+    state.handle_event(key(pygame.KEYDOWN, pygame.K_RIGHT))
+    state.handle_event(key(pygame.KEYUP, pygame.K_d))
+    assert state.held == MOVE_RIGHT
+    state.handle_event(key(pygame.KEYUP, pygame.K_RIGHT))
+    assert state.held == 0
+
+
+def test_rebinding_moves_keys_between_actions():
+    bindings = ActionMap()
+    bindings.bind("down", pygame.K_j)
+    bindings.bind("restart", pygame.K_a)
+    table = bindings.bindings()
+    assert table["down"] == [pygame.K_j]
+    assert table["restart"] == [pygame.K_a]
+    assert table["left"] == [pygame.K_LEFT]
+
+    state = InputState(ActionMap(table))
+    assert state.handle_event(key(pygame.KEYDOWN, pygame.K_a)) == RESTART
+    state.handle_event(key(pygame.KEYDOWN, pygame.K_j))
+    state.handle_event(key(pygame.KEYDOWN, pygame.K_s))
+    assert state.held == MOVE_DOWN
+    with pytest.raises(ValueError):
+        bindings.bind("jump", pygame.K_SPACE)
+
+
+def test_synthetic_input():
+    state = InputState()
+    state.handle_event(key(pygame.KEYDOWN, pygame.K_a))
+    state.set_move(1, -1)
+    assert state.held == MOVE_RIGHT | MOVE_UP
+    # the key that was down no longer counts once input is synthetic
+    state.handle_event(key(pygame.KEYUP, pygame.K_a))
+    assert state.held == MOVE_RIGHT | MOVE_UP
@@ -0,0 +1,70 @@
+import mmap
+import os
+
+import numpy as np
+
+from maps.mapfile import MapFile, cache_path, load_maze, read_cache, save_map, save_maze
+from world.maze import FLOOR, WALL, VISIBILITY_RADIUS, Maze
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+
+
+def grid():
+    return np.asarray(tile_grid(PlayingState().grid, 2), dtype=np.uint8)
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "level.hsm")
+    tiles = grid()
+    save_map(path, tiles, 40)
+    with MapFile(path) as m:
+        assert (m.rows, m.cols, m.tile_size) == (tiles.shape[0], tiles.shape[1], 40)
+        assert (m.grid() == tiles).all()
+
+    maze = load_maze(path, use_cache=False)
+    assert (maze.tile_array == tiles).all()
+    assert maze.tile_size == 40
+
+    # saving a loaded maze writes the same bytes
+    again = str(tmp_path / "again.hsm")
+    save_maze(again, maze)
+    with open(path, "rb") as a, open(again, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_cache_matches_a_fresh_build(tmp_path):
+    path = str(tmp_path / "level.hsm")
+    tiles = grid()
+    save_map(path, tiles, 50)
+    reference = Maze(tiles, 50)
+
+    first = load_maze(path)  # builds and writes the cache
+    assert os.path.exists(cache_path(path))
+    cached = load_maze(path)  # reads it back
+    for maze in (first, cached):
+        assert (maze.tile_array == reference.tile_array).all()
+        assert (maze.floor_indices() == reference.floor_indices()).all()
+        assert bytes(maze.visibility) == bytes(reference.visibility)
+
+
+def test_stale_cache_is_ignored(tmp_path):
+    path = str(tmp_path / "level.hsm")
+    tiles = grid()
+    save_map(path, tiles, 50)
+    load_maze(path)
+
+    tiles[1, 1] = FLOOR if tiles[1, 1] == WALL else WALL
+    save_map(path, tiles, 50)
+    with MapFile(path) as m:
+        assert read_cache(path, m.digest(), VISIBILITY_RADIUS) is None
+    maze = load_maze(path)
+    assert (maze.tile_array == tiles).all()
+    assert (maze.floor_indices() == Maze(tiles, 50).floor_indices()).all()
+
+
+def test_loaded_tiles_stay_in_the_mapping(tmp_path):
+    path = str(tmp_path / "level.hsm")
+    save_map(path, grid(), 50)
+    maze = load_maze(path)
+    assert isinstance(maze.tiles, memoryview) and isinstance(maze.tiles.obj, mmap.mmap)
+    assert maze.tiles.readonly and not maze.tile_array.flags.writeable
@@ -0,0 +1,144 @@
+import math
+
+import numpy as np
+import pytest
+
+from world.maze import Maze
+from world.noise import NoiseModel, noise_distances
+from sim.headless import HeadlessRunner, Scripted, tile_grid
+from states.playing_state import PlayingState
+from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from Hackathon_Stealth_main.AI_Agents.Agent_Actions import Agent_Actions
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 2), 50)
+
+
+def room(rows=9, cols=9, walls=()):
+    grid = [[0] * cols for _ in range(rows)]
+    for r, c in walls:
+        grid[r][c] = 1
+    return Maze(grid, 50)
+
+
+def test_distances_go_round_walls_within_reach():
+    open_ = room()
+    dist = noise_distances(open_, 4 * 9 + 4, 3)
+    assert dist[4 * 9 + 4] == 0.0 and dist[4 * 9 + 7] == 3.0
+    assert dist[5 * 9 + 5] == math.sqrt(2)
+    assert 4 * 9 + 8 not in dist and max(dist.values()) <= 3
+
+    # a wall column with a gap at the bottom: the way round is longer
+    walled = room(walls=[(r, 4) for r in range(8)])
+    dist = noise_distances(walled, 0 * 9 + 3, 20)
+    assert 0 * 9 + 4 not in dist
+    assert dist[0 * 9 + 5] > 8
+    # diagonal steps never cut a wall corner
+    corner = room(walls=[(0, 1), (1, 0)])
+    assert 1 * 9 + 1 not in noise_distances(corner, 0, 5)
+    assert noise_distances(walled, 4, 5) == {}
+
+
+def test_levels_fade_with_distance_and_loudest_wins():
+    open_ = room()
+    model = NoiseModel(max_reach=8)
+    model.emit(4 * 9 + 1, 3.0)
+    model.emit(4 * 9 + 7, 5.0)
+    model.emit(-1, 5.0)
+    model.emit(0, 0.0)
+    assert model.listen(open_)
+    assert model.pending == {}
+    assert model.level_at(4 * 9 + 1) == 3.0 and model.sources[4 * 9 + 1] == 4 * 9 + 1
+    assert model.level_at(4 * 9 + 5) == 3.0 and model.sources[4 * 9 + 5] == 4 * 9 + 7
+    # 3 tiles from both: the quieter noise has died out there
+    assert model.sources[4 * 9 + 4] == 4 * 9 + 7 and model.level_at(4 * 9 + 4) == 2.0
+    assert model.level_at(0) == 0.0 and 0 not in model.sources
+
+    # nothing new: the next listen clears the field, the one after is a no-op
+    assert not model.listen(open_)
+    assert model.levels == {} and not model.listen(open_)
+
+
+def test_loudness_is_capped_at_max_reach():
+    open_ = room(1, 30)
+    model = NoiseModel(max_reach=4)
+    model.emit(0, 100.0)
+    assert model.pending[0] == 4.0
+    model.listen(open_)
+    assert max(model.levels) == 3
+
+
+def test_distance_cache_is_lru(maze):
+    floor = maze.floor_indices().tolist()
+    model = NoiseModel(cache_size=2)
+    a, b, c = floor[:3]
+    for tile in (a, b, a, c, a, b):
+        model.distances(maze, tile)
+    # a stays the most recent; b is evicted by c and searched again
+    assert (model.hits, model.misses) == (2, 4)
+    assert list(model._cache) == [a, b]
+    model.distances(room(), 0)
+    assert list(model._cache) == [0]
+
+
+def test_sources_at_is_one_gather(maze):
+    floor = maze.floor_indices().tolist()
+    model = NoiseModel()
+    tiles = np.arange(-1, maze.tile_count)
+    for batch in (floor[:3], floor[100:101], []):
+        for tile in batch:
+            model.emit(tile, 6.0)
+        model.listen(maze)
+        expected = [model.sources.get(t, -1) for t in tiles.tolist()]
+        expected[0] = -1
+        assert model.sources_at(maze, tiles).tolist() == expected
+
+
+def guard_on(maze, tile, target_tile):
+    ts = maze.tile_size
+    row, col = divmod(target_tile, maze.cols)
+    end = (col * ts + 22.0, row * ts + 22.0)
+    row, col = divmod(tile, maze.cols)
+    a = StandardAI(col * ts + 22.0, row * ts + 22.0)
+    a.patrol_endA = a.patrol_endB = a.patrol_target = end
+    a.facing[:] = [0.0, -1.0]
+    return a
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_patrols_walk_to_what_they_hear(maze, backend):
+    floor = maze.floor_indices().tolist()
+    source = floor[200]
+    dist = noise_distances(maze, source, 5)
+    near = next(t for t in floor if 2 <= dist.get(t, 0) < 5)
+    far = next(t for t in floor if t not in dist)
+    guards = [guard_on(maze, near, near), guard_on(maze, far, far)]
+    model = NoiseModel()
+    actions = Agent_Actions(backend=backend, noise=model)
+    player = type("P", (), {"x": -1000.0, "y": -1000.0, "size": 10})()
+
+    model.emit(source, 5.0)
+    actions.move_agents(guards, player, maze, 1 / 30)
+    row, col = divmod(source, maze.cols)
+    assert guards[0].patrol_target == (col * 50 + 22.0, row * 50 + 22.0)
+    assert guards[1].patrol_target == guards[1].patrol_endA
+
+    # the noise is gone, but the guard still goes to check it out
+    actions.move_agents(guards, player, maze, 1 / 30)
+    assert guards[0].patrol_target == (col * 50 + 22.0, row * 50 + 22.0)
+
+
+def test_hearing_is_the_same_on_both_backends():
+    grid = tile_grid(PlayingState().grid, 2)
+    legs = [(1, 0, 60), (0, 1, 60), (-1, 0, 60), (0, -1, 60)]
+    runs = []
+    for backend in ("python", "numpy"):
+        noise = NoiseModel(8)
+        runner = HeadlessRunner(grid, agents=150, seed=4, backend=backend,
+                                policy=Scripted(legs), noise=noise)
+        runner.run(900)
+        runs.append([(a.x, a.y, tuple(a.facing), a.chasing, a.patrol_target) for a in runner.world.agents])
+        assert noise.misses > 0
+    assert runs[0] == runs[1]
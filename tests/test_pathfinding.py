@@ -0,0 +1,96 @@
+import random
+from collections import deque
+
+import pytest
+
+from world.maze import Maze
+from world.pathfinding import FlowField, PathCache, astar
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 2), 50)
+
+
+def bfs(maze, source):
+    """Reference 4-connected step counts from source over walkable tiles."""
+    cols, rows, walls = maze.cols, maze.rows, maze.wall_mask
+    dist = {source: 0}
+    queue = deque([source])
+    while queue:
+        tile = queue.popleft()
+        row, col = divmod(tile, cols)
+        for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            n = r * cols + c
+            if 0 <= r < rows and 0 <= c < cols and not walls[n] and n not in dist:
+                dist[n] = dist[tile] + 1
+                queue.append(n)
+    return dist
+
+
+def adjacent(maze, a, b):
+    (ra, ca), (rb, cb) = divmod(a, maze.cols), divmod(b, maze.cols)
+    return abs(ra - rb) + abs(ca - cb) == 1
+
+
+def test_astar_paths_are_shortest(maze):
+    floor = maze.floor_indices().tolist()
+    rng = random.Random(1)
+    for _ in range(100):
+        start, goal = rng.choice(floor), rng.choice(floor)
+        dist = bfs(maze, goal)
+        path = astar(maze, start, goal)
+        if start not in dist:
+            assert path is None
+            continue
+        assert path[0] == start and path[-1] == goal
+        assert len(path) - 1 == dist[start]
+        assert all(adjacent(maze, a, b) and not maze.wall_mask[b] for a, b in zip(path, path[1:]))
+
+
+def test_path_cache_matches_astar_and_survives_eviction(maze):
+    floor = maze.floor_indices().tolist()
+    rng = random.Random(2)
+    pairs = [(rng.choice(floor), rng.choice(floor)) for _ in range(60)]
+    small = PathCache(maze, capacity=50)
+    big = PathCache(maze)
+    for start, goal in pairs * 2:
+        expected = astar(maze, start, goal)
+        assert small.path(start, goal) == expected
+        assert big.path(start, goal) == expected
+        assert len(small.next_step) <= 50
+    # the second round is all cache hits in the big cache
+    assert big.searches <= len(pairs)
+
+
+def test_walls_are_unreachable(maze):
+    wall = maze.wall_mask.index(1)
+    floor = int(maze.floor_indices()[0])
+    assert astar(maze, wall, floor) is None
+    assert maze.paths.next_tile(floor, wall) == -1
+
+
+def test_flow_field_matches_bfs(maze):
+    floor = maze.floor_indices().tolist()
+    rng = random.Random(3)
+    for radius in (5, 32):
+        goal = rng.choice(floor)
+        field = FlowField(maze, goal, radius)
+        dist = bfs(maze, goal)
+        assert field.dist_of == {t: d for t, d in dist.items() if d <= radius}
+        for tile, d in field.dist_of.items():
+            step = field.next_tile(tile)
+            assert field.dist_of[step] == max(d - 1, 0)
+            assert tile == goal or adjacent(maze, tile, step)
+    assert field.next_tile(maze.wall_mask.index(1)) == -1
+
+
+def test_multi_goal_field_leads_to_the_nearest_goal(maze):
+    floor = maze.floor_indices().tolist()
+    goals = floor[::97][:4]
+    field = FlowField.from_goals(maze, goals, 12)
+    per_goal = [bfs(maze, g) for g in goals]
+    for tile, d in field.dist_of.items():
+        assert d == min(dist.get(tile, 1 << 30) for dist in per_goal)
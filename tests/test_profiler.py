@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pygame
+import pytest
+
+from world.profiler import PHASE_NAMES, Profiler
+from world.world import World
+
+
+def frame_of(profiler, vision_ms):
+    profiler.add("vision", 0.0, vision_ms / 1000.0)
+    profiler.end_frame()
+
+
+def test_ring_keeps_the_last_frames():
+    profiler = Profiler(capacity=10)
+    for ms in range(25):
+        frame_of(profiler, ms)
+    assert profiler.frame_count == 25
+    vision = profiler.recent()[:, PHASE_NAMES.index("vision")] * 1000.0
+    assert sorted(np.round(vision, 6).tolist()) == list(range(15, 25))
+    # totals still cover every frame
+    assert profiler.totals["vision"] == pytest.approx(sum(range(25)) / 1000.0)
+
+
+def test_percentiles():
+    profiler = Profiler(capacity=200)
+    assert profiler.percentiles() == {}
+    for ms in range(1, 101):
+        frame_of(profiler, ms)
+    p50, p99 = profiler.percentiles()["vision"]
+    assert p50 == pytest.approx(50.5)
+    assert p99 == pytest.approx(99.01)
+    assert profiler.percentiles()["draw"] == [0.0, 0.0]
+
+
+def test_spans_ring_and_split():
+    profiler = Profiler(capacity=4, max_spans=5)
+    profiler.add_split(1.0, [("vision", 0.25), ("steering", 0.5)])
+    profiler.end_frame()
+    assert profiler.spans() == [("vision", 1.0, 1.25, 0), ("steering", 1.25, 1.75, 0)]
+    for i in range(6):
+        profiler.add("draw", i, i + 0.5)
+    spans = profiler.spans()
+    assert len(spans) == 5 and profiler.span_count == 8
+    assert [s[1] for s in spans] == [1, 2, 3, 4, 5]
+    assert all(s[3] == 1 for s in spans)
+
+
+def test_chrome_trace_export(tmp_path):
+    profiler = Profiler()
+    profiler.add("update", 2.0, 2.004)
+    profiler.end_frame()
+    path = tmp_path / "trace.json"
+    profiler.export_chrome_trace(str(path))
+    trace = json.loads(path.read_text())
+    (event,) = trace["traceEvents"]
+    assert event["name"] == "update" and event["ph"] == "X"
+    assert event["ts"] == pytest.approx(2e6) and event["dur"] == pytest.approx(4000)
+    assert event["args"] == {"frame": 0}
+
+
+def test_world_phases_and_hud():
+    pygame.font.init()  # the HUD is on after toggle_profiler; main.py runs pygame.init()
+    world = World(320, 320, seed=1)
+    world.populate(7)
+    world.toggle_profiler()
+    profiler = world.profiler
+    for _ in range(5):
+        world.update(1.0 / 60)
+        world.draw()
+    assert profiler.frame_count == 5
+    for phase in ("update", "player", "draw", "present", "frame"):
+        assert profiler.totals[phase] > 0, phase
+    rect = profiler.draw_hud(pygame.Surface((320, 320)))
+    assert rect.w > 0 and rect.h > 0
+    world.toggle_profiler()
+    assert world.profiler is None
@@ -0,0 +1,41 @@
+import pygame
+import pytest
+
+from sim.headless import HeadlessRunner, Scripted, tile_grid
+from states.playing_state import PlayingState
+
+CHECKS = (1, 2, 30) + tuple(range(120, 721, 60))
+# heads away from the start (top-left) so that bigger maps scroll
+LEGS = ((1, 1, 120), (1, 0, 120), (0, 1, 120), (1, 1, 120))
+
+
+def frames(render, scale):
+    """Screen contents after each tick in CHECKS, rendering with render."""
+    grid = tile_grid(PlayingState().grid, scale)
+    runner = HeadlessRunner(grid, agents=25, seed=2, render=render, policy=Scripted(LEGS))
+    shots = []
+    for tick in range(1, CHECKS[-1] + 1):
+        runner.step()
+        if tick in CHECKS:
+            shots.append((pygame.image.tobytes(runner.world.screen, "RGB"), runner.state.camera.offset))
+    return shots
+
+
+@pytest.mark.parametrize("scale", [1, 4])
+def test_dirty_rects_match_a_full_repaint(scale):
+    dirty = frames("dirty", scale)
+    full = frames("full", scale)
+    for tick, (d, f) in zip(CHECKS, zip(dirty, full)):
+        assert d[1] == f[1]
+        assert d[0] == f[0], f"frame {tick} differs"
+    if scale > 1:
+        assert len({offset for _, offset in full}) > 1, "the camera never scrolled"
+
+
+def test_dirty_frames_update_only_part_of_the_screen():
+    runner = HeadlessRunner(agents=7, seed=2, render="dirty", policy=Scripted(LEGS))
+    for _ in range(120):
+        runner.step()
+    renderer = runner.world.renderer
+    assert renderer.frames == 120
+    assert renderer.full_frames <= 3
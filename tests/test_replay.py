@@ -0,0 +1,91 @@
+import os
+import random
+
+import pytest
+
+from world.world import World
+from world.input import RESTART, bits_from_move
+from states.playing_state import PlayingState
+from sim.replay import Recorder, Replayer, fingerprint
+
+TICKS = 600
+SNAPSHOT_EVERY = 100
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    """A recorded session and the fingerprints it went through, by tick."""
+    path = str(tmp_path_factory.mktemp("replay") / "session.hsr")
+    world = World(800, 800, headless=True, state=PlayingState(), seed=11)
+    world.populate(30)
+    world.recorder = Recorder(path, world, snapshot_every=SNAPSHOT_EVERY)
+    rng = random.Random(5)
+    prints = {0: fingerprint(world)}
+    for tick in range(1, TICKS + 1):
+        if tick % 25 == 1:
+            move = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        world.input.set_held(bits_from_move(*move))
+        world.update(1.0 / 60 if tick % 7 else 1.0 / 45)
+        prints[tick] = fingerprint(world)
+    world.recorder.close()
+    return path, prints
+
+
+def test_replay_reproduces_the_run(recording):
+    path, prints = recording
+    replayer = Replayer(path)
+    assert replayer.run() == TICKS
+    assert fingerprint(replayer.world) == prints[TICKS]
+
+
+@pytest.mark.parametrize("ticks", [[450], [250, 520], [520, 130], [0, 333]])
+def test_seek_reproduces_the_run(recording, ticks):
+    path, prints = recording
+    replayer = Replayer(path)
+    assert replayer.snapshots(), "the recorder wrote no snapshots"
+    for tick in ticks:
+        replayer.seek(tick)
+        assert replayer.world.ticks == tick
+        assert fingerprint(replayer.world) == prints[tick]
+    replayer.run()
+    assert fingerprint(replayer.world) == prints[TICKS]
+
+
+def test_fixed_step_actions_and_repeats_replay(tmp_path):
+    path = str(tmp_path / "fixed.hsr")
+    world = World(800, 800, headless=True, state=PlayingState(), seed=3, fixed_step=True)
+    world.populate(12)
+    world.recorder = Recorder(path, world, snapshot_every=0)
+    world.input.set_held(bits_from_move(1, 1))
+    for tick in range(400):
+        if tick == 200:
+            world.recorder.action(RESTART)
+            world.current_state.handle_action(world, RESTART)
+        world.update(1.0 / 60)
+    world.recorder.close()
+    # 400 identical ticks and one action: a handful of records, not 400
+    assert os.path.getsize(path) < 100
+
+    replayer = Replayer(path)
+    assert replayer.fixed_step and replayer.agent_count == 12
+    assert replayer.run() == 400
+    assert fingerprint(replayer.world) == fingerprint(world)
+
+
+def test_agent_mix_is_logged(tmp_path):
+    path = str(tmp_path / "mix.hsr")
+    mix = {"patroller": 2.0, "hunter": 1.0, "sentry": 1.0}
+    world = World(800, 800, headless=True, state=PlayingState(agent_mix=mix), seed=8)
+    world.populate(24)
+    world.recorder = Recorder(path, world, snapshot_every=0)
+    world.input.set_held(bits_from_move(1, 0))
+    for _ in range(300):
+        world.update(1.0 / 60)
+    world.recorder.close()
+
+    # replays with the logged types, whatever settings say
+    replayer = Replayer(path)
+    assert replayer.agent_mix == mix
+    assert [a.kind for a in replayer.world.agents] == [a.kind for a in world.agents]
+    replayer.run()
+    assert fingerprint(replayer.world) == fingerprint(world)
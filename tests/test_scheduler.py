@@ -0,0 +1,93 @@
+from collections import Counter
+
+import pytest
+
+from Hackathon_Stealth_main.AI_Agents.Agent_Scheduler import AIScheduler
+
+
+class Dot:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.vision_distance = 100.0
+        self.chasing = False
+
+
+def line_of_agents(count, spacing, start=0.0):
+    return [Dot(start + i * spacing, 0.0) for i in range(count)]
+
+
+def run(scheduler, agents, player, frames, dt=0.1):
+    counts = Counter()
+    elapsed = Counter()
+
+    def step(batch, dts):
+        assert len(batch) == len(dts)
+        for a, d in zip(batch, dts):
+            counts[a] += 1
+            elapsed[a] += d
+
+    for _ in range(frames):
+        scheduler.run(agents, player, dt, None, step)
+    return counts, elapsed
+
+
+def test_tiers_update_at_their_periods():
+    player = Dot(0.0, 0.0)
+    # the mid tier also holds the near agents (skipped there): 18 = 6 per frame
+    near = line_of_agents(6, 10.0)                 # within vision reach
+    mid = line_of_agents(12, 20.0, start=300.0)    # within mid_distance
+    far = line_of_agents(20, 50.0, start=1000.0)
+    agents = near + mid + far
+    scheduler = AIScheduler(mid_period=3, far_period=10, min_batch=4, max_dt=10.0)
+    counts, elapsed = run(scheduler, agents, player, 60)
+    assert all(counts[a] == 60 for a in near)
+    assert all(counts[a] == 20 for a in mid)
+    assert all(counts[a] == 6 for a in far)
+    # an agent's steps add up to the time that passed, short of at most a
+    # period before its first update (which only gets one frame's dt) and after its last
+    for a in agents:
+        assert elapsed[a] <= 6.0 + 1e-9
+        assert elapsed[a] >= 6.0 - 2 * scheduler.far_period * 0.1 - 1e-9
+
+
+def test_chasers_are_always_near():
+    player = Dot(0.0, 0.0)
+    agents = line_of_agents(10, 100.0, start=2000.0)
+    agents[3].chasing = True
+    counts, _ = run(AIScheduler(), agents, player, 10)
+    assert counts[agents[3]] == 10
+
+
+def test_dt_is_capped():
+    player = Dot(0.0, 0.0)
+    agents = line_of_agents(3, 10.0, start=5000.0)
+    scheduler = AIScheduler(far_period=100, max_dt=0.25, min_batch=1)
+    seen = []
+    for _ in range(200):
+        scheduler.run(agents, player, 0.1, None, lambda batch, dts: seen.extend(dts))
+    assert max(seen) == pytest.approx(0.25)
+
+
+def test_budget_defers_but_never_starves():
+    player = Dot(0.0, 0.0)
+    agents = line_of_agents(400, 5.0, start=2000.0)
+    scheduler = AIScheduler(far_period=2, budget_us=0, min_batch=16)
+    counts = Counter()
+
+    def step(batch, dts):
+        counts.update(batch)
+
+    scheduler.run(agents, player, 0.1, None, step)
+    near, updated, deferred = scheduler.stats
+    assert near == 0 and updated == 16 and deferred == 200 - 16
+    for _ in range(30):
+        scheduler.run(agents, player, 0.1, None, step)
+    assert all(counts[a] >= 1 for a in agents)
+    # round robin: nobody got a second turn before everybody had a first
+    assert max(counts.values()) - min(counts.values()) <= 1
+
+
+def test_bad_periods():
+    with pytest.raises(ValueError):
+        AIScheduler(mid_period=0)
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from world.spatial_hash import SpatialHash
+
+
+class Dot:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def scatter(count, seed, extent=2000.0):
+    rng = random.Random(seed)
+    return [Dot(rng.uniform(-100, extent), rng.uniform(-100, extent)) for _ in range(count)]
+
+
+def brute_radius(dots, x, y, r):
+    return {d for d in dots if (d.x - x) ** 2 + (d.y - y) ** 2 <= r * r}
+
+
+def test_queries_match_brute_force():
+    dots = scatter(2000, seed=1)
+    grid = SpatialHash(128)
+    grid.insert_many(dots)
+    assert len(grid) == len(dots)
+    rng = random.Random(2)
+    for _ in range(200):
+        x, y, r = rng.uniform(0, 2000), rng.uniform(0, 2000), rng.uniform(0, 400)
+        assert set(grid.query_radius(x, y, r)) == brute_radius(dots, x, y, r)
+        x1, y1 = x + rng.uniform(0, 500), y + rng.uniform(0, 500)
+        assert set(grid.query_rect(x, y, x1, y1)) == {d for d in dots if x <= d.x <= x1 and y <= d.y <= y1}
+
+
+def test_query_tiles_is_half_open():
+    grid = SpatialHash(64)
+    inside, edge, outside = Dot(50, 50), Dot(149.9, 99.9), Dot(150, 50)
+    for d in (inside, edge, outside):
+        grid.insert(d)
+    # tiles (row 0..1, col 0..2) of 50 px cover [0, 150) x [0, 100)
+    assert set(grid.query_tiles(0, 0, 1, 2, 50)) == {inside, edge}
+
+
+def test_updates_follow_moves():
+    dots = scatter(500, seed=3)
+    grid = SpatialHash(100)
+    for d in dots:
+        grid.insert(d, reach=d.x % 50)
+    assert grid.max_reach == pytest.approx(max(d.x % 50 for d in dots))
+    rng = random.Random(4)
+    for _ in range(20):
+        for d in dots:
+            d.x += rng.uniform(-80, 80)
+            d.y += rng.uniform(-80, 80)
+            grid.update(d)
+        x, y = rng.uniform(0, 2000), rng.uniform(0, 2000)
+        assert set(grid.query_radius(x, y, 300)) == brute_radius(dots, x, y, 300)
+
+    gone = dots[:100]
+    for d in gone:
+        grid.remove(d)
+    assert len(grid) == 400 and gone[0] not in grid
+    assert set(grid.query_rect(-1e9, -1e9, 1e9, 1e9)) == set(dots[100:])
+    # every bucket left holds something
+    assert all(grid.cells.values())
+
+
+def test_results_are_deterministic():
+    runs = []
+    for _ in range(2):
+        grid = SpatialHash(50)
+        dots = scatter(300, seed=5)
+        grid.insert_many(dots)
+        runs.append([dots.index(d) for d in grid.query_radius(1000, 1000, 600)])
+    assert runs[0] == runs[1]
+
+
+def test_cell_size_must_be_positive():
+    with pytest.raises(ValueError):
+        SpatialHash(0)
@@ -0,0 +1,102 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from world.maze import Maze
+from world.spawn import SpawnPlanner
+from sim.headless import HeadlessRunner, tile_grid
+from states.playing_state import PlayingState
+
+
+@pytest.fixture(scope="module")
+def maze():
+    return Maze(tile_grid(PlayingState().grid, 4), 50)
+
+
+def bfs_components(maze):
+    """Component label per tile by plain 4-connected flood fill (-1 for walls)."""
+    rows, cols = maze.rows, maze.cols
+    label = [-1] * (rows * cols)
+    count = 0
+    for start in maze.floor_indices().tolist():
+        if label[start] >= 0:
+            continue
+        label[start] = count
+        queue = deque([start])
+        while queue:
+            row, col = divmod(queue.popleft(), cols)
+            for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                t = r * cols + c
+                if 0 <= r < rows and 0 <= c < cols and not maze.wall_mask[t] and label[t] < 0:
+                    label[t] = count
+                    queue.append(t)
+        count += 1
+    return label
+
+
+def test_components_match_flood_fill():
+    grid = [[1] * 12 for _ in range(9)]
+    for r, c in ((1, 1), (1, 2), (2, 2), (3, 2), (3, 3), (3, 4), (2, 4), (1, 4), (1, 5),
+                 (6, 8), (7, 8), (7, 9), (7, 10), (5, 8), (5, 9), (5, 10), (6, 10)):
+        grid[r][c] = 0
+    grid[6][1] = 0
+    maze = Maze(grid, 10)
+    planner = SpawnPlanner(maze)
+    label = bfs_components(maze)
+    ours = planner.components.tolist()
+    # same partition of the floor, up to the numbering
+    pairs = {(a, b) for a, b in zip(label, ours)}
+    assert len(pairs) == len({a for a, _ in pairs}) == len({b for _, b in pairs}) == 4
+    assert planner.component_sizes.sum() == len(maze.floor_indices())
+
+
+def test_spawns_are_separated_floor_tiles(maze):
+    planner = maze.spawn_planner()
+    cols = maze.cols
+    avoid = int(planner.floor[len(planner.floor) // 2])
+    for seed in range(5):
+        tiles = planner.spawn_tiles(30, np.random.default_rng(seed), separation=3, avoid=avoid)
+        assert len(tiles) == 30 and len(set(tiles.tolist())) == 30
+        assert not maze.wall_array.ravel()[tiles].any()
+        points = np.array([divmod(t, cols) for t in tiles.tolist() + [avoid]])
+        d = ((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+        np.fill_diagonal(d, 9)
+        assert d.min() >= 9
+
+
+def test_crowded_maps_still_fill_the_count(maze):
+    planner = maze.spawn_planner()
+    tiles = planner.spawn_tiles(2 * len(planner.floor), np.random.default_rng(1), separation=4)
+    assert len(tiles) == 2 * len(planner.floor)
+    assert not maze.wall_array.ravel()[tiles].any()
+
+
+def test_component_limits_spawns(maze):
+    planner = maze.spawn_planner()
+    component = planner.component_of(int(planner.floor[0]))
+    tiles = planner.spawn_tiles(20, np.random.default_rng(3), component=component)
+    assert (planner.components[tiles] == component).all()
+
+
+def test_patrols_run_straight_through_the_spawn(maze):
+    planner = maze.spawn_planner()
+    rng = np.random.default_rng(7)
+    cols = maze.cols
+    tiles = planner.spawn_tiles(200, rng, separation=2)
+    tiles_a, tiles_b = planner.patrols(tiles, rng)
+    for t, a, b in zip(tiles.tolist(), tiles_a.tolist(), tiles_b.tolist()):
+        (ra, ca), (rb, cb), (rt, ct) = divmod(a, cols), divmod(b, cols), divmod(t, cols)
+        assert ra == rb == rt or ca == cb == ct
+        step = 1 if ra == rb else cols
+        assert a <= t <= b
+        assert not maze.wall_array.ravel()[np.arange(a, b + 1, step)].any()
+
+
+def test_populate_is_seeded():
+    def spawns(seed):
+        runner = HeadlessRunner(agents=40, seed=seed)
+        return [(a.x, a.y) for a in runner.world.agents]
+
+    assert spawns(5) == spawns(5)
+    assert spawns(5) != spawns(6)
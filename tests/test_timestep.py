@@ -0,0 +1,40 @@
+import pytest
+
+from world.timestep import FixedTimestep, merge_steps
+from world.world import World
+
+
+def test_steps_and_remainder():
+    clock = FixedTimestep(120)
+    frames = [1 / 60, 1 / 144, 1 / 30, 0.0, 0.25]
+    total = sum(clock.advance(dt) for dt in frames)
+    assert total == int(sum(frames) * 120 + 1e-9)
+    assert 0.0 <= clock.accumulator < clock.step
+    assert clock.alpha == pytest.approx(clock.accumulator * 120)
+    with pytest.raises(ValueError):
+        FixedTimestep(0)
+
+
+def test_merge_orders_steps_in_time():
+    # player at 120 Hz, agents at 30 Hz, one 1/30 s frame from empty clocks
+    order = merge_steps([0.0, 0.0], [4, 1], [1 / 120, 1 / 30])
+    assert order == [0, 0, 0, 0, 1]
+    # an agent step nearly due comes before the player's
+    assert merge_steps([0.0, 0.03], [2, 1], [1 / 120, 1 / 30]) == [1, 0, 0]
+    # ties go to the lower index
+    assert merge_steps([0.0, 1 / 60], [2, 1], [1 / 120, 1 / 30]) == [0, 0, 1]
+
+
+def test_fixed_step_world_is_frame_rate_independent():
+    prints = []
+    for frame_dt, frames in ((1 / 30, 60), (1 / 60, 120), (1 / 120, 240)):
+        world = World(320, 320, headless=True, seed=8, fixed_step=True)
+        world.populate(7)
+        world.input.set_move(1, 1)
+        for _ in range(frames):
+            world.update(frame_dt)
+        state = world.current_state
+        prints.append((state.player.x, state.player.y, [(a.x, a.y) for a in world.agents]))
+    assert prints[0][:2] == pytest.approx(prints[1][:2]) and prints[1][:2] == pytest.approx(prints[2][:2])
+    for a, b in zip(prints[0][2], prints[2][2]):
+        assert a == pytest.approx(b)
@@ -0,0 +1,50 @@
+import random
+
+import numpy as np
+import pytest
+
+from world.maze import VIS_BLOCKED, VIS_CLEAR, VIS_UNKNOWN, Maze
+from sim.headless import tile_grid
+from states.playing_state import PlayingState
+
+
+@pytest.fixture(scope="module")
+def mazes():
+    grid = tile_grid(PlayingState().grid, 2)
+    return Maze(grid, 50), Maze(grid, 50, visibility_radius=0)
+
+
+def random_pairs(maze, count, seed, reach=150):
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        x1 = rng.uniform(0, maze.width - 1)
+        y1 = rng.uniform(0, maze.height - 1)
+        x2 = min(max(x1 + rng.uniform(-reach, reach), 0), maze.width - 1)
+        y2 = min(max(y1 + rng.uniform(-reach, reach), 0), maze.height - 1)
+        pairs.append((x1, y1, x2, y2))
+    return pairs
+
+
+def test_index_agrees_with_ray_marching(mazes):
+    indexed, marched = mazes
+    assert indexed.visibility_radius == 3 and marched.visibility_radius == 0
+    for step in (2, 4, 6):
+        for x1, y1, x2, y2 in random_pairs(indexed, 3000, seed=step):
+            assert (indexed.has_line_of_sight(x1, y1, x2, y2, step)
+                    == marched.has_line_of_sight(x1, y1, x2, y2, step)), (x1, y1, x2, y2, step)
+
+
+def test_index_answers_most_queries(mazes):
+    indexed, _ = mazes
+    classes = [indexed.visibility_between(*pair, 4) for pair in random_pairs(indexed, 2000, seed=9)]
+    assert set(classes) <= {VIS_UNKNOWN, VIS_CLEAR, VIS_BLOCKED}
+    assert sum(c != VIS_UNKNOWN for c in classes) > len(classes) // 2
+
+
+def test_many_matches_single(mazes):
+    indexed, _ = mazes
+    pairs = random_pairs(indexed, 2000, seed=4)
+    x1, y1, x2, y2 = (np.array(column) for column in zip(*pairs))
+    many = indexed.visibility_between_many(x1, y1, x2, y2, 4)
+    assert many.tolist() == [indexed.visibility_between(*pair, 4) for pair in pairs]
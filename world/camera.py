@@ -0,0 +1,42 @@
+class Camera:
+    """
+    Viewport onto the world: a view_w x view_h window whose top-left sits at
+    world pixel (x, y). follow() centres it on a point and clamps it to the
+    world bounds, so maps smaller than the window never scroll.
+    With step > 1 the view only moves once the point strays step pixels from
+    its centre, and then in whole steps (a tile, say), so a moving player
+    scrolls it a few times a second instead of every frame.
+    Draw code subtracts camera.offset from world coordinates.
+    """
+
+    def __init__(self, view_w, view_h, world_w, world_h, step=1):
+        self.view_w = int(view_w)
+        self.view_h = int(view_h)
+        self.world_w = int(world_w)
+        self.world_h = int(world_h)
+        self.step = max(1, int(step))
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self):
+        return (self.x, self.y)
+
+    def follow(self, cx, cy):
+        """Centre on world point (cx, cy), to within step. Returns True if the view moved."""
+        x = self._scroll(self.x, int(cx) - self.view_w // 2, self.world_w - self.view_w)
+        y = self._scroll(self.y, int(cy) - self.view_h // 2, self.world_h - self.view_h)
+        moved = x != self.x or y != self.y
+        self.x = x
+        self.y = y
+        return moved
+
+    def _scroll(self, pos, target, limit):
+        step = self.step
+        if abs(target - pos) >= step:
+            pos = (target + step // 2) // step * step
+        return min(max(pos, 0), max(0, limit))
+
+    def visible(self, x, y, w, h):
+        """True if the world rect (x, y, w, h) overlaps the view."""
+        return x + w > self.x and y + h > self.y and x < self.x + self.view_w and y < self.y + self.view_h
@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from .settings import CHUNK_CACHE_BYTES, CHUNK_PIXELS
+
+
+class MazeChunks:
+    """
+    Lazily rendered, LRU-cached tile chunks of a Maze.
+
+    The map is split into square chunks of chunk_tiles x chunk_tiles tiles.
+    A chunk surface is only rendered when a draw needs it, and the least
+    recently used ones are dropped once the cache holds more than max_bytes
+    of pixels, so startup cost and memory depend on the window size rather
+    than the map size. chunk() may be called from a loader thread
+    (prefetch, see PlayingState.preload) while the main loop draws.
+    """
+
+    def __init__(self, maze, chunk_pixels=CHUNK_PIXELS, max_bytes=CHUNK_CACHE_BYTES):
+        self.maze = maze
+        ts = maze.tile_size
+        self.chunk_tiles = max(1, chunk_pixels // ts)
+        self.chunk_px = self.chunk_tiles * ts
+        self.max_bytes = max_bytes
+        self.chunks = OrderedDict()  # (chunk_row, chunk_col) -> Surface
+        self.bytes = 0
+        self.rendered = 0
+        self._lock = threading.Lock()
+
+        # tile value -> RGB, as a lookup table for whole chunks at once
+        self._palette = np.zeros((256, 3), dtype=np.uint8)
+        self._palette[:] = (255, 0, 255)  # fallback color
+        for tile, color in maze.tile_colors.items():
+            self._palette[tile] = color
+
+    def _render(self, chunk_row, chunk_col):
+        n = self.chunk_tiles
+        tiles = self.maze.tile_array[chunk_row * n:(chunk_row + 1) * n, chunk_col * n:(chunk_col + 1) * n]
+        # one pixel per tile, then scale up: nearest-neighbour keeps tiles exact
+        small = pygame.surfarray.make_surface(self._palette[tiles].transpose(1, 0, 2))
+        ts = self.maze.tile_size
+        return pygame.transform.scale(small, (tiles.shape[1] * ts, tiles.shape[0] * ts))
+
+    def chunk(self, chunk_row, chunk_col):
+        """Surface for one chunk (rendered on demand, most recently used last)."""
+        key = (chunk_row, chunk_col)
+        chunks = self.chunks
+        with self._lock:
+            surface = chunks.get(key)
+            if surface is not None:
+                chunks.move_to_end(key)
+                return surface
+
+        # rendered outside the lock, so a prefetch never stalls the draw thread
+        rendered = self._render(chunk_row, chunk_col)
+        with self._lock:
+            surface = chunks.get(key)
+            if surface is not None:
+                # the other thread got there first: keep its surface
+                chunks.move_to_end(key)
+                return surface
+            surface = chunks[key] = rendered
+            self.rendered += 1
+            self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+            # keep at least the chunk just made, even past the cap
+            while self.bytes > self.max_bytes and len(chunks) > 1:
+                _, old = chunks.popitem(last=False)
+                self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surface
+
+    def _visible(self, offset, width, height):
+        """(chunk_row, chunk_col) of the chunks a width x height view at offset overlaps."""
+        ox, oy = offset
+        maze = self.maze
+        px = self.chunk_px
+        x0 = max(0, ox)
+        y0 = max(0, oy)
+        x1 = min(maze.width, ox + width)
+        y1 = min(maze.height, oy + height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        for chunk_row in range(y0 // px, (y1 - 1) // px + 1):
+            for chunk_col in range(x0 // px, (x1 - 1) // px + 1):
+                yield chunk_row, chunk_col
+
+    def draw(self, screen, offset=(0, 0)):
+        """
+        Blit the chunks overlapping the screen. offset is the world pixel
+        shown at the screen's top-left (Camera.offset).
+        """
+        ox, oy = offset
+        px = self.chunk_px
+        for chunk_row, chunk_col in self._visible(offset, screen.get_width(), screen.get_height()):
+            screen.blit(self.chunk(chunk_row, chunk_col), (chunk_col * px - ox, chunk_row * px - oy))
+
+    def prefetch(self, offset, width, height):
+        """Render (without drawing) the chunks a width x height view at offset would show."""
+        for chunk_row, chunk_col in self._visible(offset, width, height):
+            self.chunk(chunk_row, chunk_col)
+
+    def clear(self):
+        with self._lock:
+            self.chunks.clear()
+            self.bytes = 0
@@ -0,0 +1,217 @@
+"""
+Fog of war (settings.MAZE_FOG).
+
+The player's visible tiles come from recursive shadowcasting over the
+maze's wall mask, recomputed only when the player moves to another tile.
+Tiles seen at least once stay "explored" (dimmed); the rest are dark.
+
+The darkening is drawn from a cached overlay covering the tiles in view.
+That overlay is rebuilt only when the view moves onto other tiles, and
+otherwise patched for just the tiles whose visibility changed.
+"""
+import numpy as np
+import pygame
+
+# overlay alpha by tile state: unexplored, explored, visible
+FOG_ALPHA = (255, 150, 0)
+
+# (xx, xy, yx, yy) transforms from octant-local (dx, dy) to map offsets
+_OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+
+def shadowcast(maze, row, col, radius):
+    """
+    Set of flat tile indices visible from tile (row, col) within radius
+    tiles. Walls are visible but block what is behind them; outside the
+    map counts as wall.
+    """
+    visible = set()
+    if not (0 <= row < maze.rows and 0 <= col < maze.cols):
+        return visible
+    visible.add(row * maze.cols + col)
+    for octant in _OCTANTS:
+        _cast(maze, row, col, 1, 1.0, 0.0, radius, octant, visible)
+    return visible
+
+
+def _cast(maze, row, col, depth, start, end, radius, octant, visible):
+    """Scan one octant from depth outward between slopes start > end."""
+    if start < end:
+        return
+    xx, xy, yx, yy = octant
+    rows = maze.rows
+    cols = maze.cols
+    walls = maze.wall_mask
+    radius_sq = radius * radius
+    new_start = start
+    for j in range(depth, radius + 1):
+        dy = -j
+        blocked = False
+        for dx in range(-j, 1):
+            left = (dx - 0.5) / (dy + 0.5)
+            right = (dx + 0.5) / (dy - 0.5)
+            if start < right:
+                continue
+            if end > left:
+                break
+
+            c = col + dx * xx + dy * xy
+            r = row + dx * yx + dy * yy
+            inside = 0 <= r < rows and 0 <= c < cols
+            if inside and dx * dx + dy * dy <= radius_sq:
+                visible.add(r * cols + c)
+            wall = not inside or walls[r * cols + c]
+
+            if blocked:
+                if wall:
+                    new_start = right
+                    continue
+                blocked = False
+                start = new_start
+            elif wall and j < radius:
+                # this wall starts a shadow: scan past it, then skip it
+                blocked = True
+                _cast(maze, row, col, j + 1, start, left, radius, octant, visible)
+                new_start = right
+        if blocked:
+            break
+
+
+class FogOfWar:
+    """
+    Per-tile fog state for one maze: visible and explored are flat bytearrays
+    (index = row * cols + col). update() recomputes visibility when the
+    watched point enters another tile; draw() / redraw() put the darkening
+    on a surface (see PlayingState).
+    """
+
+    def __init__(self, maze, radius=8):
+        self.maze = maze
+        self.radius = int(radius)
+        self.visible = bytearray(maze.tile_count)
+        self.explored = bytearray(maze.tile_count)
+        self.tile = -1
+        self._visible_set = set()
+        self._changed = []      # tiles whose state changed since the overlay last saw them
+        self.updates = 0        # FOV recomputations so far
+
+        self._view = None       # overlay surface for the tiles in _view_box
+        self._view_box = None   # (row0, col0, rows, cols)
+
+    def update(self, x, y):
+        """Recompute what is seen from pixel (x, y) if it is on a new tile; returns True if so."""
+        maze = self.maze
+        tile = maze.tile_index_at(x, y)
+        if tile == self.tile:
+            return False
+        self.tile = tile
+        self.updates += 1
+
+        if tile < 0:
+            seen = set()
+        else:
+            seen = shadowcast(maze, *divmod(tile, maze.cols), self.radius)
+        old = self._visible_set
+        visible = self.visible
+        explored = self.explored
+        for t in old - seen:
+            visible[t] = 0
+        for t in seen - old:
+            visible[t] = 1
+            explored[t] = 1
+        self._changed.extend(old ^ seen)
+        self._visible_set = seen
+        return True
+
+    def is_visible(self, x, y):
+        """True if the tile under pixel (x, y) is in view."""
+        tile = self.maze.tile_index_at(x, y)
+        return tile >= 0 and self.visible[tile] == 1
+
+    def _alpha(self, tile):
+        return FOG_ALPHA[self.visible[tile] + self.explored[tile]]
+
+    def _view_for(self, surface, offset):
+        """The overlay for the tiles surface shows at offset, rebuilt only if those tiles changed."""
+        maze = self.maze
+        ts = maze.tile_size
+        ox, oy = offset
+        row0 = max(0, oy // ts)
+        col0 = max(0, ox // ts)
+        row1 = min(maze.rows, (oy + surface.get_height() - 1) // ts + 1)
+        col1 = min(maze.cols, (ox + surface.get_width() - 1) // ts + 1)
+        box = (row0, col0, max(0, row1 - row0), max(0, col1 - col0))
+        if box != self._view_box:
+            self._view_box = box
+            self._view = None
+            if box[2] and box[3]:
+                shape = (maze.rows, maze.cols)
+                visible = np.frombuffer(self.visible, dtype=np.uint8).reshape(shape)[row0:row1, col0:col1]
+                explored = np.frombuffer(self.explored, dtype=np.uint8).reshape(shape)[row0:row1, col0:col1]
+                alpha = np.asarray(FOG_ALPHA, dtype=np.uint8)[visible + explored]
+                small = pygame.Surface((box[3], box[2]), pygame.SRCALPHA)
+                small.fill((0, 0, 0, 0))
+                pixels = pygame.surfarray.pixels_alpha(small)
+                pixels[:] = alpha.T
+                del pixels
+                self._view = pygame.transform.scale(small, (box[3] * ts, box[2] * ts))
+            # the new overlay already shows every change
+            self._changed.clear()
+        return self._view
+
+    def _patch(self, tile):
+        """Bring the cached overlay up to date for one changed tile; returns its world Rect or None."""
+        row0, col0, nrows, ncols = self._view_box
+        row, col = divmod(tile, self.maze.cols)
+        if not (row0 <= row < row0 + nrows and col0 <= col < col0 + ncols):
+            return None
+        ts = self.maze.tile_size
+        rect = pygame.Rect((col - col0) * ts, (row - row0) * ts, ts, ts)
+        # fill on a per-pixel-alpha surface replaces the pixels, alpha included
+        self._view.fill((0, 0, 0, self._alpha(tile)), rect)
+        return rect
+
+    def draw(self, surface, offset=(0, 0)):
+        """Darken surface (showing the maze at world offset) by the fog."""
+        view = self._view_for(surface, offset)
+        if view is None:
+            return
+        for tile in self._changed:
+            self._patch(tile)
+        self._changed.clear()
+        row0, col0 = self._view_box[:2]
+        ts = self.maze.tile_size
+        surface.blit(view, (col0 * ts - offset[0], row0 * ts - offset[1]))
+
+    def redraw(self, surface, offset=(0, 0)):
+        """
+        Repaint only the tiles whose fog changed since the last draw/redraw on
+        surface, which must already show the fogged maze at the same offset.
+        Returns the surface Rects repainted.
+        """
+        if not self._changed:
+            return []
+        view = self._view_for(surface, offset)
+        if view is None:
+            return []
+        maze = self.maze
+        colors = maze.tile_colors
+        tiles = maze.tiles
+        row0, col0 = self._view_box[:2]
+        ts = maze.tile_size
+        shift_x = col0 * ts - offset[0]
+        shift_y = row0 * ts - offset[1]
+        rects = []
+        for tile in self._changed:
+            area = self._patch(tile)
+            if area is None:
+                continue
+            dest = area.move(shift_x, shift_y)
+            surface.fill(colors.get(tiles[tile], (255, 0, 255)), dest)
+            surface.blit(view, dest, area)
+            rects.append(dest.clip(surface.get_rect()))
+        self._changed.clear()
+        return rects
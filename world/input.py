@@ -0,0 +1,134 @@
+"""
+Action-based input.
+
+World.handle_events drains the pygame event queue once and hands every
+KEYDOWN / KEYUP to an InputState, which turns keys into actions through a
+rebindable ActionMap:
+
+- held actions (movement, RUN) live in InputState.held, a bitmask of
+  MOVE_* / RUN bits kept current from KEYDOWN / KEYUP; states read it
+  every tick.
+- press actions (RESTART, PAUSE, TOGGLE_PROFILER) are reported once per
+  key press and delivered to State.handle_action.
+
+Nothing here polls the keyboard (pygame.key), so headless runs and replays
+just set held bits (set_held / set_move) and call handle_action directly.
+"""
+import pygame
+
+# held actions: bits of InputState.held (sim.replay logs one byte per tick)
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+MOVE_UP = 4
+MOVE_DOWN = 8
+RUN = 16
+
+# press actions
+RESTART = 1
+PAUSE = 2
+TOGGLE_PROFILER = 3
+
+HELD_ACTIONS = {"left": MOVE_LEFT, "right": MOVE_RIGHT, "up": MOVE_UP, "down": MOVE_DOWN, "run": RUN}
+PRESS_ACTIONS = {"restart": RESTART, "pause": PAUSE, "profiler": TOGGLE_PROFILER}
+
+DEFAULT_BINDINGS = {
+    "left": (pygame.K_a, pygame.K_LEFT),
+    "right": (pygame.K_d, pygame.K_RIGHT),
+    "up": (pygame.K_w, pygame.K_UP),
+    "down": (pygame.K_s, pygame.K_DOWN),
+    "run": (pygame.K_LSHIFT, pygame.K_RSHIFT),
+    "restart": (pygame.K_r,),
+    "pause": (pygame.K_ESCAPE,),
+    "profiler": (pygame.K_F3,),
+}
+
+
+def move_from_bits(bits):
+    """(dx, dy) in {-1, 0, 1} for a set of MOVE_* bits."""
+    dx = (1 if bits & MOVE_RIGHT else 0) - (1 if bits & MOVE_LEFT else 0)
+    dy = (1 if bits & MOVE_DOWN else 0) - (1 if bits & MOVE_UP else 0)
+    return dx, dy
+
+
+def bits_from_move(dx, dy):
+    """MOVE_* bits for a (dx, dy) direction."""
+    return ((MOVE_LEFT if dx < 0 else 0) | (MOVE_RIGHT if dx > 0 else 0)
+            | (MOVE_UP if dy < 0 else 0) | (MOVE_DOWN if dy > 0 else 0))
+
+
+class ActionMap:
+    """
+    Key code -> action bindings. Each key triggers at most one action; an
+    action may have several keys. bindings is {action name: key codes}
+    (defaults to DEFAULT_BINDINGS).
+    """
+
+    def __init__(self, bindings=None):
+        self.held = {}   # key -> MOVE_* bit
+        self.press = {}  # key -> press action
+        for name, keys in (DEFAULT_BINDINGS if bindings is None else bindings).items():
+            self.bind(name, *keys)
+
+    def bind(self, name, *keys):
+        """Make keys (and only them) trigger action name, taking them from any other action."""
+        if name in HELD_ACTIONS:
+            table, value = self.held, HELD_ACTIONS[name]
+        elif name in PRESS_ACTIONS:
+            table, value = self.press, PRESS_ACTIONS[name]
+        else:
+            raise ValueError(f"unknown action {name!r}, expected one of "
+                             f"{tuple(HELD_ACTIONS) + tuple(PRESS_ACTIONS)}")
+        for key in [k for k, v in table.items() if v == value]:
+            del table[key]
+        for key in keys:
+            self.held.pop(key, None)
+            self.press.pop(key, None)
+            table[key] = value
+
+    def bindings(self):
+        """{action name: [key codes]} (what bind / the constructor take)."""
+        out = {}
+        for name, bit in HELD_ACTIONS.items():
+            out[name] = [k for k, v in self.held.items() if v == bit]
+        for name, action in PRESS_ACTIONS.items():
+            out[name] = [k for k, v in self.press.items() if v == action]
+        return out
+
+
+class InputState:
+    """Held-action bitmask plus press actions, fed by events or synthetically."""
+
+    def __init__(self, action_map=None):
+        self.map = action_map if action_map is not None else ActionMap()
+        self.held = 0
+        self._down = {}  # held key -> its MOVE_* bit
+
+    def handle_event(self, event):
+        """Update held from a KEYDOWN / KEYUP; returns the press action it triggers, if any."""
+        if event.type == pygame.KEYDOWN:
+            bit = self.map.held.get(event.key)
+            if bit is not None:
+                self._down[event.key] = bit
+                self.held |= bit
+                return None
+            return self.map.press.get(event.key)
+        if event.type == pygame.KEYUP:
+            if self._down.pop(event.key, None) is not None:
+                # another key may still hold the same action
+                held = 0
+                for bit in self._down.values():
+                    held |= bit
+                self.held = held
+        return None
+
+    def set_held(self, bits):
+        """Synthetic input: replace the held actions (headless runs, replays)."""
+        self._down.clear()
+        self.held = bits
+
+    def set_move(self, dx, dy):
+        self.set_held(bits_from_move(dx, dy))
+
+    def release_all(self):
+        """Drop every held action (window lost focus: its KEYUPs never arrive)."""
+        self.set_held(0)
@@ -1,22 +1,193 @@
-import pygame
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+
+import numpy as np
+
+from world.pathfinding import FlowField, PathCache
 
 WALL = 1
 FLOOR = 0
 GOAL = 2
 
+# tile-to-tile visibility classes stored in Maze.visibility
+VIS_UNKNOWN = 0   # needs the fine-grained pixel check
+VIS_CLEAR = 1     # every segment between the two tiles stays on non-wall tiles
+VIS_BLOCKED = 2   # a full row/column band of walls separates the two tiles
+
+# default index reach in tiles; a 120 px vision_distance spans at most 3 tiles of 50 px
+VISIBILITY_RADIUS = 3
+
+# the index costs rows * cols * (2*radius+1)**2 bytes; bigger maps skip it and
+# fall back to ray marching
+VISIBILITY_MAX_BYTES = 64 * 1024 * 1024
+
+# Mazes kept by Maze.cached (most recently used last)
+MAZE_CACHE_SIZE = 4
+
+_stencil_cache = {}
+_maze_cache = OrderedDict()
+_maze_cache_lock = threading.Lock()
+
+
+def _visibility_stencils(radius):
+    """
+    For every tile offset (dc, dr) within radius, list the relative tiles that a
+    segment from anywhere in tile (0, 0) to anywhere in tile (dc, dr) can touch,
+    plus the "bands": for each row (column) strictly between the two tiles, the
+    touched tiles in that row (column). Every such segment crosses each band
+    completely, so a band made only of walls blocks it for any ray whose
+    samples are closer together than one tile.
+
+    Uses the Minkowski trick: the hull of two tiles overlaps tile E iff the
+    segment between the tile origins passes through the open 2x2 box around E.
+    """
+    if radius in _stencil_cache:
+        return _stencil_cache[radius]
+
+    def open_interval(e, d):
+        # t in [0, 1] values with |t * d - e| < 1, as an open (lo, hi) range
+        if d == 0:
+            return (Fraction(-1), Fraction(2)) if abs(e) < 1 else None
+        lo, hi = Fraction(e - 1, d), Fraction(e + 1, d)
+        return (min(lo, hi), max(lo, hi))
+
+    stencils = []
+    for dr in range(-radius, radius + 1):
+        for dc in range(-radius, radius + 1):
+            touched = []
+            for er in range(min(0, dr), max(0, dr) + 1):
+                ty = open_interval(er, dr)
+                if ty is None:
+                    continue
+                for ec in range(min(0, dc), max(0, dc) + 1):
+                    tx = open_interval(ec, dc)
+                    if tx is None:
+                        continue
+                    lo, hi = max(tx[0], ty[0]), min(tx[1], ty[1])
+                    if lo < hi and lo < 1 and hi > 0:
+                        touched.append((er, ec))
+
+            bands = []
+            for er in range(min(0, dr) + 1, max(0, dr)):
+                bands.append([t for t in touched if t[0] == er])
+            for ec in range(min(0, dc) + 1, max(0, dc)):
+                bands.append([t for t in touched if t[1] == ec])
+            stencils.append((touched, bands))
+
+    _stencil_cache[radius] = stencils
+    return stencils
+
+
 class Maze:
-    def __init__(self, grid, tile_size):
-        self.grid = grid
-        self.tile_size = tile_size
+    """
+    Tile map plus everything derived from it.
+
+    Tiles live in a flat byte buffer (index = row * cols + col) with a parallel
+    wall_mask (1 = wall); `grid` is a read-only 2D NumPy view over the same
+    bytes for code that still indexes grid[row][col]. A 2048x2048 map is two
+    4 MB buffers and no per-cell Python objects. The tiles are never written
+    after construction, so Maze.from_buffer can leave them where they are
+    (a memory-mapped map file, shared memory).
+    """
+
+    def __init__(self, grid, tile_size, visibility_radius=VISIBILITY_RADIUS):
+        """
+        grid: list of rows, 2D array, or anything np.asarray turns into one
+        (use Maze.from_buffer for raw tile bytes).
+        """
+        tiles = np.asarray(grid, dtype=np.uint8)
+        if tiles.ndim != 2 or tiles.size == 0:
+            raise ValueError("grid must be a non-empty 2D sequence of tile values")
+        self._init_tiles(bytearray(tiles.tobytes()), tiles.shape[0], tiles.shape[1], tile_size,
+                         visibility_radius)
 
-        self.rows = len(grid)
-        self.cols = len(grid[0])
+    @classmethod
+    def from_buffer(cls, buffer, rows, cols, tile_size, visibility_radius=VISIBILITY_RADIUS,
+                    visibility=None, floor=None, copy=False):
+        """
+        Build a Maze straight from rows*cols tile bytes (bytes, bytearray, mmap, ...).
+        visibility / floor are optional precomputed derived data (a saved
+        Maze.visibility table for visibility_radius, and floor_indices());
+        maps.mapfile passes them from its cache so they aren't rebuilt.
+        The tile and visibility buffers are used as is, not copied, so they
+        can live in a mapped file or shared memory (see sim.batch) and must
+        stay unchanged while the Maze is in use; copy=True takes a private
+        copy of the tiles instead.
+        """
+        if len(buffer) != rows * cols:
+            raise ValueError(f"expected {rows * cols} tile bytes, got {len(buffer)}")
+        tiles = bytearray(buffer) if copy else memoryview(buffer).cast("B")
+        maze = cls.__new__(cls)
+        maze._init_tiles(tiles, rows, cols, tile_size, visibility_radius, visibility, floor)
+        return maze
 
+    @classmethod
+    def cached(cls, grid, tile_size, visibility_radius=VISIBILITY_RADIUS):
+        """
+        Maze(grid, tile_size), shared with earlier calls for the same tiles
+        and sizes (the last MAZE_CACHE_SIZE are kept). Nothing about a Maze
+        changes after construction except its derived caches, so restarting
+        a level reuses its indexes, paths and chunk surfaces.
+        """
+        tiles = np.ascontiguousarray(np.asarray(grid, dtype=np.uint8))
+        key = (hashlib.blake2b(tiles.tobytes(), digest_size=16).digest(), tiles.shape,
+               tile_size, visibility_radius)
+        with _maze_cache_lock:
+            maze = _maze_cache.get(key)
+            if maze is not None:
+                _maze_cache.move_to_end(key)
+                return maze
+
+        maze = cls(tiles, tile_size, visibility_radius)
+        with _maze_cache_lock:
+            _maze_cache[key] = maze
+            while len(_maze_cache) > MAZE_CACHE_SIZE:
+                _maze_cache.popitem(last=False)
+        return maze
+
+    def _init_tiles(self, tiles, rows, cols, tile_size, visibility_radius, visibility=None, floor=None):
+        self.tile_size = tile_size
+        self.rows = rows
+        self.cols = cols
+
+        # precomputed bounds
         self.width = self.cols * tile_size
         self.height = self.rows * tile_size
+        self.tile_count = rows * cols
+
+        self.tiles = tiles
+        self.tile_array = np.frombuffer(self.tiles, dtype=np.uint8).reshape(rows, cols)
+        self.tile_array.flags.writeable = False
+
+        walls = self.tile_array == WALL
+        self.wall_mask = bytearray(walls.tobytes())
+        self.wall_array = np.frombuffer(self.wall_mask, dtype=np.uint8).reshape(rows, cols)
+        self.wall_array.flags.writeable = False
 
-        # Create a surface the size of the maze
-        self.surface = pygame.Surface((self.width, self.height))
+        # flat indices of FLOOR tiles, computed on first floor_indices() call
+        self._floor = None
+        if floor is not None:
+            self._floor = np.asarray(floor, dtype=np.int64)
+
+        # The grid never changes at runtime, so line-of-sight between tiles is
+        # precomputed once (see build_visibility_index).
+        if rows * cols * (2 * visibility_radius + 1) ** 2 > VISIBILITY_MAX_BYTES:
+            visibility_radius = 0
+        if visibility is not None and len(visibility) == rows * cols * (2 * visibility_radius + 1) ** 2:
+            self._set_visibility_index(visibility_radius, visibility)
+        else:
+            self.build_visibility_index(visibility_radius)
+
+        self.paths = PathCache(self)
+        self._flow_field = None
+        self._spawn_planner = None
+
+        # tile surfaces, rendered chunk by chunk on first draw so headless
+        # runs never pay for them (see world.chunks)
+        self._chunks = None
 
         # Optional: color lookup dictionary
         self.tile_colors = {
@@ -25,10 +196,202 @@ class Maze:
             GOAL: (0, 200, 0)
         }
 
-        # Pre-render the maze once
-        self._build_surface()
+    @property
+    def grid(self):
+        """Read-only (rows, cols) view of the tiles; grid[row][col] still works."""
+        return self.tile_array
+
+    def is_wall_tile(self, row, col):
+        """True if tile (row, col) is a wall or outside the map."""
+        if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
+            return True
+        return self.wall_mask[row * self.cols + col] == 1
+
+    def rect_collides(self, left, top, size):
+        """
+        True if the size x size box with integer top-left (left, top) overlaps
+        a wall tile or leaves the map (the StandardAI hitbox convention).
+        """
+        ts = self.tile_size
+        left_tile = left // ts
+        right_tile = (left + size - 1) // ts
+        top_tile = top // ts
+        bottom_tile = (top + size - 1) // ts
+        if left_tile < 0 or top_tile < 0 or right_tile >= self.cols or bottom_tile >= self.rows:
+            return True
+
+        walls = self.wall_mask
+        cols = self.cols
+        for row in range(top_tile, bottom_tile + 1):
+            base = row * cols
+            for col in range(left_tile, right_tile + 1):
+                if walls[base + col]:
+                    return True
+        return False
+
+    # ------------------------------------------------------- swept movement
+
+    def sweep_box(self, x, y, size, dx, dy):
+        """
+        Move the size x size box at top-left (x, y) by (dx, dy) against the
+        walls and map edges: X first, then Y, each axis stopping exactly where
+        its leading edge meets the first wall tile it would enter, so the box
+        slides along walls and can't tunnel through them however far it goes.
+        The box covers [x, x + size) on each axis. Returns (x, y, t) with t
+        the fraction of the move done at the first contact (1.0 = no contact).
+        """
+        t = 1.0
+        if dx:
+            x, t = self._sweep_axis(x, y, size, dx, True)
+        if dy:
+            y, ty = self._sweep_axis(y, x, size, dy, False)
+            if ty < t:
+                t = ty
+        return x, y, t
+
+    def _sweep_axis(self, pos, cross, size, d, along_x):
+        """sweep_box along one axis: (new pos, contact fraction)."""
+        ts = self.tile_size
+        # tile lines (rows when moving along x) the box spans across the move
+        first = math.floor(cross / ts)
+        last = math.ceil((cross + size) / ts) - 1
+        # tile lines the leading edge enters, in order
+        if d > 0:
+            lead = pos + size
+            start = math.ceil(lead / ts)
+            end = math.ceil((lead + d) / ts) - 1
+            step = 1
+        else:
+            lead = pos
+            start = math.floor(lead / ts) - 1
+            end = math.floor((lead + d) / ts)
+            step = -1
 
-    # maze.py (add inside class Maze)
+        cols = self.cols
+        limit, cross_limit = (cols, self.rows) if along_x else (self.rows, cols)
+        walls = self.wall_mask
+        for line in range(start, end + step, step):
+            blocked = line < 0 or line >= limit or first < 0 or last >= cross_limit
+            if not blocked:
+                for k in range(first, last + 1):
+                    if walls[k * cols + line if along_x else line * cols + k]:
+                        blocked = True
+                        break
+            if blocked:
+                edge = line * ts if d > 0 else (line + 1) * ts
+                return float(edge - size if d > 0 else edge), (edge - lead) / d
+        return pos + d, 1.0
+
+    def sweep_boxes(self, xs, ys, sizes, dxs, dys):
+        """
+        Vectorized sweep_box over arrays (sizes may be a scalar); the results
+        match sweep_box element for element. Returns (xs, ys, ts) arrays.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        sizes = np.broadcast_to(np.asarray(sizes), xs.shape)
+        dxs = np.asarray(dxs, dtype=np.float64)
+        dys = np.asarray(dys, dtype=np.float64)
+        xs, tx = self._sweep_axis_many(xs, ys, sizes, dxs, True)
+        ys, ty = self._sweep_axis_many(ys, xs, sizes, dys, False)
+        return xs, ys, np.minimum(tx, ty)
+
+    def _sweep_axis_many(self, pos, cross, size, d, along_x):
+        ts = self.tile_size
+        first = np.floor(cross / ts).astype(np.int64)
+        last = (np.ceil((cross + size) / ts) - 1).astype(np.int64)
+        forward = d > 0
+        lead = np.where(forward, pos + size, pos)
+        start = np.where(forward, np.ceil(lead / ts), np.floor(lead / ts) - 1).astype(np.int64)
+        end = np.where(forward, np.ceil((lead + d) / ts) - 1, np.floor((lead + d) / ts)).astype(np.int64)
+        step = np.where(forward, 1, -1)
+        count = np.where(d != 0, np.maximum((end - start) * step + 1, 0), 0)
+
+        new = np.where(d != 0, pos + d, pos)
+        t = np.ones(pos.shape, dtype=np.float64)
+        if new.size == 0:
+            return new, t
+
+        limit, cross_limit = (self.cols, self.rows) if along_x else (self.rows, self.cols)
+        span = last - first
+        outside = (first < 0) | (last >= cross_limit)
+        walls = self.wall_array
+        pending = count > 0
+        for k in range(int(count.max())):
+            active = pending & (k < count)
+            if not active.any():
+                break
+            line = start + step * k
+            blocked = active & (outside | (line < 0) | (line >= limit))
+            probe = active & ~blocked
+            for j in range(int(span[probe].max()) + 1 if probe.any() else 0):
+                p = probe & (j <= span)
+                if p.any():
+                    if along_x:
+                        blocked[p] |= walls[first[p] + j, line[p]] == 1
+                    else:
+                        blocked[p] |= walls[line[p], first[p] + j] == 1
+            if blocked.any():
+                edge = np.where(forward, line * ts, (line + 1) * ts)
+                contact = np.where(forward, edge - size, edge)
+                new[blocked] = contact[blocked]
+                t[blocked] = (edge[blocked] - lead[blocked]) / d[blocked]
+                pending &= ~blocked
+        return new, t
+
+    # ------------------------------------------------------- batched queries
+
+    def walls_at_pixels(self, xs, ys):
+        """Vectorized is_wall_at_pixel over arrays of pixel positions."""
+        col = np.trunc(np.asarray(xs, dtype=np.float64)).astype(np.int64) // self.tile_size
+        row = np.trunc(np.asarray(ys, dtype=np.float64)).astype(np.int64) // self.tile_size
+        outside = (row < 0) | (row >= self.rows) | (col < 0) | (col >= self.cols)
+        hit = outside.copy()
+        inside = ~outside
+        hit[inside] = self.wall_array[row[inside], col[inside]] == 1
+        return hit
+
+    def rects_collide(self, xs, ys, sizes):
+        """
+        Vectorized rect_collides: boxes at top-left (int(x), int(y)) with the
+        given sizes (scalar or array). Returns a bool array.
+        """
+        ts = self.tile_size
+        left = np.trunc(np.asarray(xs, dtype=np.float64)).astype(np.int64)
+        top = np.trunc(np.asarray(ys, dtype=np.float64)).astype(np.int64)
+        sizes = np.broadcast_to(np.asarray(sizes, dtype=np.int64), left.shape)
+        left_tile = left // ts
+        right_tile = (left + sizes - 1) // ts
+        top_tile = top // ts
+        bottom_tile = (top + sizes - 1) // ts
+
+        hit = (left_tile < 0) | (top_tile < 0) | (right_tile >= self.cols) | (bottom_tile >= self.rows)
+        if hit.size == 0:
+            return hit
+
+        span_c = right_tile - left_tile
+        span_r = bottom_tile - top_tile
+        inside = ~hit
+        for dr in range(int(span_r.max()) + 1):
+            for dc in range(int(span_c.max()) + 1):
+                probe = inside & (dr <= span_r) & (dc <= span_c)
+                if probe.any():
+                    hit[probe] |= self.wall_array[top_tile[probe] + dr, left_tile[probe] + dc] == 1
+        return hit
+
+    def floor_indices(self):
+        """Flat indices of every FLOOR tile, as a NumPy int array (cached)."""
+        if self._floor is None:
+            self._floor = np.flatnonzero(self.tile_array.ravel() == FLOOR)
+            self._floor.flags.writeable = False
+        return self._floor
+
+    def spawn_planner(self):
+        """The SpawnPlanner (floor runs and components) for this maze, built on first use."""
+        if self._spawn_planner is None:
+            from world.spawn import SpawnPlanner
+            self._spawn_planner = SpawnPlanner(self)
+        return self._spawn_planner
 
     def is_wall_at_pixel(self, x, y):
         """
@@ -43,23 +406,142 @@ class Maze:
         if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
             return True
 
-        return self.grid[row][col] == WALL
+        return self.wall_mask[row * self.cols + col] == 1
+
+    # ------------------------------------------------------------ visibility
+
+    def build_visibility_index(self, radius):
+        """
+        Precompute the tile-to-tile visibility class for every tile and every
+        offset up to radius tiles away. Stored as a flat bytearray
+        (rows * cols * (2*radius+1)**2 entries, one VIS_* byte each).
+        radius 0 disables the index and every query falls back to ray marching.
+        """
+        self._set_visibility_index(radius, bytearray())
+        if self.visibility_radius <= 0:
+            return
+
+        r = self.visibility_radius
+        walls = self.wall_array == 1
+
+        # pad with walls: outside the map counts as wall, like is_wall_at_pixel
+        padded = np.ones((self.rows + 2 * r, self.cols + 2 * r), dtype=bool)
+        padded[r:r + self.rows, r:r + self.cols] = walls
 
-    def _build_surface(self):
-        """Draw all tiles onto the internal surface once."""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                tile = self.grid[row][col]
-                color = self.tile_colors.get(tile, (255, 0, 255))  # fallback color
+        def shifted(er, ec):
+            return padded[r + er:r + er + self.rows, r + ec:r + ec + self.cols]
 
-                x = col * self.tile_size
-                y = row * self.tile_size
+        # built offset-major, stored tile-major so one tile's entries are adjacent
+        index = np.zeros((self._vis_offsets, self.rows, self.cols), dtype=np.uint8)
+        for k, (touched, bands) in enumerate(_visibility_stencils(r)):
+            hit = np.zeros((self.rows, self.cols), dtype=bool)
+            for er, ec in touched:
+                hit |= shifted(er, ec)
+            blocked = np.zeros((self.rows, self.cols), dtype=bool)
+            for band in bands:
+                solid = np.ones((self.rows, self.cols), dtype=bool)
+                for er, ec in band:
+                    solid &= shifted(er, ec)
+                blocked |= solid
+            index[k][blocked] = VIS_BLOCKED
+            index[k][~hit] = VIS_CLEAR
 
-                pygame.draw.rect(
-                    self.surface,
-                    color,
-                    (x, y, self.tile_size, self.tile_size)
-                )
+        self.visibility = bytearray(np.ascontiguousarray(index.transpose(1, 2, 0)).tobytes())
+
+    def _set_visibility_index(self, radius, table):
+        """Install a visibility table (as built by build_visibility_index) for radius."""
+        self.visibility_radius = int(radius)
+        self._vis_span = 2 * self.visibility_radius + 1
+        self._vis_offsets = self._vis_span * self._vis_span
+        self.visibility = table if self.visibility_radius > 0 else bytearray()
+
+    def tile_visibility(self, row1, col1, row2, col2):
+        """Visibility class between two tiles (VIS_UNKNOWN if outside the index)."""
+        r = self.visibility_radius
+        dr = row2 - row1
+        dc = col2 - col1
+        if (
+            r <= 0
+            or row1 < 0 or row1 >= self.rows or col1 < 0 or col1 >= self.cols
+            or dr < -r or dr > r or dc < -r or dc > r
+        ):
+            return VIS_UNKNOWN
+        k = (dr + r) * self._vis_span + (dc + r)
+        return self.visibility[(row1 * self.cols + col1) * self._vis_offsets + k]
+
+    def visibility_between(self, x1, y1, x2, y2, sample_step):
+        """
+        Line-of-sight class between two pixel positions for a point-sampled ray
+        whose samples are at most sample_step pixels apart along each axis.
+        VIS_CLEAR / VIS_BLOCKED are exact answers; VIS_UNKNOWN means the caller
+        has to do its own fine-grained check.
+        """
+        if x1 < 0 or y1 < 0 or x2 < 0 or y2 < 0:
+            return VIS_UNKNOWN
+        ts = self.tile_size
+        cls = self.tile_visibility(int(y1) // ts, int(x1) // ts, int(y2) // ts, int(x2) // ts)
+        # a wall between two samples only counts if the samples can't skip it
+        if cls == VIS_BLOCKED and sample_step >= ts:
+            return VIS_UNKNOWN
+        return cls
+
+    def visibility_between_many(self, x1, y1, x2, y2, sample_step):
+        """Vectorized visibility_between over NumPy arrays; returns a uint8 array."""
+        x1, y1, x2, y2 = (np.asarray(v, dtype=np.float64) for v in (x1, y1, x2, y2))
+        out = np.zeros(x1.shape, dtype=np.uint8)
+        r = self.visibility_radius
+        if r <= 0 or out.size == 0:
+            return out
+
+        ts = self.tile_size
+        c1 = np.trunc(x1).astype(np.int64) // ts
+        r1 = np.trunc(y1).astype(np.int64) // ts
+        dc = np.trunc(x2).astype(np.int64) // ts - c1
+        dr = np.trunc(y2).astype(np.int64) // ts - r1
+        ok = (
+            (x1 >= 0) & (y1 >= 0) & (x2 >= 0) & (y2 >= 0)
+            & (r1 < self.rows) & (c1 < self.cols)
+            & (np.abs(dc) <= r) & (np.abs(dr) <= r)
+        )
+
+        table = np.frombuffer(self.visibility, dtype=np.uint8)
+        k = (dr[ok] + r) * self._vis_span + (dc[ok] + r)
+        out[ok] = table[(r1[ok] * self.cols + c1[ok]) * self._vis_offsets + k]
+
+        coarse = (out == VIS_BLOCKED) & (np.asarray(sample_step) >= ts)
+        out[coarse] = VIS_UNKNOWN
+        return out
+
+    # ----------------------------------------------------------- pathfinding
+
+    def tile_index_at(self, x, y):
+        """Flat tile index (row * cols + col) containing pixel (x, y), or -1 if outside."""
+        col = int(x) // self.tile_size
+        row = int(y) // self.tile_size
+        if row < 0 or row >= self.rows or col < 0 or col >= self.cols:
+            return -1
+        return row * self.cols + col
+
+    def find_path(self, start, goal):
+        """Cached shortest path between (row, col) tiles as a list of (row, col), or None."""
+        path = self.paths.path(start[0] * self.cols + start[1], goal[0] * self.cols + goal[1])
+        if path is None:
+            return None
+        return [divmod(i, self.cols) for i in path]
+
+    def next_tile_toward(self, start, goal):
+        """Next tile index on the cached A* path from start to goal (indices), -1 if none."""
+        return self.paths.next_tile(start, goal)
+
+    def flow_field(self, goal):
+        """
+        Flow field toward tile index goal. The last field is reused while the
+        goal stays the same, so all chasers share one BFS per goal change.
+        """
+        field = self._flow_field
+        if field is None or field.goal != goal:
+            field = self._flow_field = FlowField(self, goal)
+        return field
 
     def is_clear_straight_path(self, x1, y1, x2, y2):
         """
@@ -70,14 +552,20 @@ class Maze:
         row1 = int(y1) // self.tile_size
         col2 = int(x2) // self.tile_size
         row2 = int(y2) // self.tile_size
-    
+
+        # On a shared row/column the index stencil is exactly the tiles between
+        if row1 == row2 or col1 == col2:
+            cls = self.tile_visibility(row1, col1, row2, col2)
+            if cls != VIS_UNKNOWN:
+                return cls == VIS_CLEAR
+
         # Must be purely horizontal OR vertical
         if row1 == row2:
             # horizontal
             start = min(col1, col2)
             end = max(col1, col2)
             for c in range(start, end + 1):
-                if self.grid[row1][c] == 1:
+                if self.is_wall_tile(row1, c):
                     return False
             return True
     
@@ -86,7 +574,7 @@ class Maze:
             start = min(row1, row2)
             end = max(row1, row2)
             for r in range(start, end + 1):
-                if self.grid[r][col1] == 1:
+                if self.is_wall_tile(r, col1):
                     return False
             return True
     
@@ -105,7 +593,12 @@ class Maze:
             return True
     
         steps = int(dist // step)
-    
+
+        if steps > 0:
+            cls = self.visibility_between(x1, y1, x2, y2, max(abs(dx), abs(dy)) / steps)
+            if cls != VIS_UNKNOWN:
+                return cls == VIS_CLEAR
+
         for i in range(steps + 1):
             t = i / steps if steps > 0 else 0
             px = x1 + dx * t
@@ -116,6 +609,13 @@ class Maze:
     
         return True
 
-    def draw(self, screen):
-        """Blit the pre-rendered surface to the screen."""
-        screen.blit(self.surface, (0, 0))
\ No newline at end of file
+    def chunk_cache(self):
+        """The MazeChunks renderer for this maze (created on first use)."""
+        if self._chunks is None:
+            from world.chunks import MazeChunks
+            self._chunks = MazeChunks(self)
+        return self._chunks
+
+    def draw(self, screen, offset=(0, 0)):
+        """Draw the part of the maze visible with world pixel offset at the screen's top-left."""
+        self.chunk_cache().draw(screen, offset)
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Noise and hearing.
+
+The player makes noise (running, bumping into walls; see Player.update)
+that carries through the maze's floor tiles, not through walls, and fades
+by one unit of loudness per tile travelled. How far it goes from a tile
+is a bounded Dijkstra over the floor (8-connected, diagonal steps cost
+sqrt(2) and may not cut wall corners) that stops at the loudest noise's
+reach, cached per source tile: a noise from a tile heard from before
+costs one merge of its cached distances and no search.
+
+NoiseModel collects the noises made between two agent steps; listen()
+folds them into one sound field (tile -> loudness left, and which noise
+it came from), so each listener hears with one lookup of its own tile
+(or, for a whole AgentBatch, one gather: sources_at).
+"""
+import heapq
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+# (row step, col step, distance)
+_STEPS = (
+    (0, 1, 1.0), (0, -1, 1.0), (1, 0, 1.0), (-1, 0, 1.0),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)), (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+)
+
+
+def noise_distances(maze, source, reach):
+    """
+    {tile: distance} of the floor tiles within reach tiles of flat tile
+    index source, by the shortest way round the walls. Empty for a wall
+    or off-map source.
+    """
+    rows, cols = maze.rows, maze.cols
+    walls = maze.wall_mask
+    if not (0 <= source < rows * cols) or walls[source]:
+        return {}
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, tile = heapq.heappop(heap)
+        if d > dist[tile]:
+            continue
+        row, col = divmod(tile, cols)
+        for dr, dc, step in _STEPS:
+            nd = d + step
+            if nd > reach:
+                continue
+            r = row + dr
+            c = col + dc
+            if r < 0 or r >= rows or c < 0 or c >= cols:
+                continue
+            n = r * cols + c
+            if walls[n]:
+                continue
+            if dr and dc and (walls[row * cols + c] or walls[r * cols + col]):
+                continue
+            if nd < dist.get(n, reach + 1.0):
+                dist[n] = nd
+                heapq.heappush(heap, (nd, n))
+    return dist
+
+
+class NoiseModel:
+    """
+    Noises made since the last listen() and the sound field they add up to.
+
+    emit() queues a noise (a source tile and its loudness, in tiles it
+    carries); listen(maze) turns the queue into levels / sources, the
+    loudest noise still audible on each tile. Noises louder than max_reach
+    are cut down to it. Distances from up to cache_size source tiles are
+    kept (least recently used go first), for one maze at a time.
+    """
+
+    def __init__(self, max_reach=8, cache_size=256):
+        self.max_reach = float(max_reach)
+        self.cache_size = int(cache_size)
+        self._maze = None
+        self._cache = OrderedDict()   # source tile -> {tile: distance}
+        self.hits = 0
+        self.misses = 0
+        self._dense = None          # sources as a flat array over the maze (sources_at)
+        self._dense_maze = None
+        self._dense_sources = {}    # the sources dict _dense currently holds
+        self.reset()
+
+    def reset(self):
+        """Forget queued noises and the current sound field (restart...)."""
+        self.pending = {}   # source tile -> loudness, loudest per tile
+        self.levels = {}    # tile -> loudness left there
+        self.sources = {}   # tile -> source tile of that loudness
+
+    def __getstate__(self):
+        # snapshots (sim.replay) keep the noises, not the maze or the cache
+        state = dict(self.__dict__)
+        state["_maze"] = None
+        state["_cache"] = OrderedDict()
+        state["_dense"] = None
+        state["_dense_maze"] = None
+        state["_dense_sources"] = {}
+        return state
+
+    def emit(self, tile, loudness):
+        """Make a noise of loudness (tiles) at flat tile index tile."""
+        if tile < 0 or loudness <= 0:
+            return
+        if loudness > self.pending.get(tile, 0.0):
+            self.pending[tile] = min(float(loudness), self.max_reach)
+
+    def distances(self, maze, source):
+        """noise_distances from source out to max_reach, from the cache when possible."""
+        if maze is not self._maze:
+            self._maze = maze
+            self._cache.clear()
+        cache = self._cache
+        dist = cache.get(source)
+        if dist is not None:
+            cache.move_to_end(source)
+            self.hits += 1
+            return dist
+        self.misses += 1
+        dist = cache[source] = noise_distances(maze, source, self.max_reach)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return dist
+
+    def listen(self, maze):
+        """Replace the sound field with the queued noises (then clear them); True if any."""
+        pending = self.pending
+        if not pending and not self.levels:
+            return False
+        levels = self.levels = {}
+        sources = self.sources = {}
+        for source, loudness in pending.items():
+            for tile, d in self.distances(maze, source).items():
+                left = loudness - d
+                if left > 0 and left > levels.get(tile, 0.0):
+                    levels[tile] = left
+                    sources[tile] = source
+        self.pending = {}
+        return bool(levels)
+
+    def sources_at(self, maze, tiles):
+        """
+        Source tile of the noise heard on each of tiles (a numpy array of
+        flat indices, -1 off the map), or -1 where it is silent. The sound
+        field is kept as one flat array, patched only where it changed.
+        """
+        dense = self._dense
+        if dense is None or maze is not self._dense_maze:
+            dense = self._dense = np.full(maze.tile_count, -1, dtype=np.int64)
+            self._dense_maze = maze
+            self._dense_sources = {}
+        sources = self.sources
+        if self._dense_sources is not sources:
+            old = self._dense_sources
+            if old:
+                dense[np.fromiter(old, dtype=np.int64, count=len(old))] = -1
+            if sources:
+                dense[np.fromiter(sources, dtype=np.int64, count=len(sources))] = \
+                    np.fromiter(sources.values(), dtype=np.int64, count=len(sources))
+            self._dense_sources = sources
+        tiles = np.asarray(tiles, dtype=np.int64)
+        return np.where(tiles >= 0, dense[tiles], -1)
+
+    def level_at(self, tile):
+        """Loudness left on flat tile index tile in the current sound field (0.0 = silent)."""
+        return self.levels.get(tile, 0.0)
@@ -0,0 +1,219 @@
+import heapq
+from collections import deque
+
+# tiles are addressed by flat index: row * maze.cols + col
+
+# max entries in Maze's (start, goal) -> next-step cache before old ones are dropped
+PATH_CACHE_SIZE = 1 << 16
+
+# flow fields only spread this many steps from the goal; chasing agents are
+# always within vision range of the player, so a bounded BFS is enough
+FLOW_FIELD_RADIUS = 32
+
+
+def _neighbors(maze, index):
+    """4-connected walkable neighbours of a tile, in a fixed order (up, down, left, right)."""
+    cols = maze.cols
+    row, col = divmod(index, cols)
+    walls = maze.wall_mask
+    if row > 0 and not walls[index - cols]:
+        yield index - cols
+    if row < maze.rows - 1 and not walls[index + cols]:
+        yield index + cols
+    if col > 0 and not walls[index - 1]:
+        yield index - 1
+    if col < cols - 1 and not walls[index + 1]:
+        yield index + 1
+
+
+def astar(maze, start, goal):
+    """
+    Shortest 4-connected path between two tile indices over walkable tiles.
+    Returns the list of tile indices from start to goal (inclusive), or None.
+
+    The path is canonical: searching backward from goal until every node with
+    f <= optimal cost is settled gives exact distances-to-goal along all
+    shortest paths, and the walk from start always takes the first neighbour
+    (in _neighbors order) that is one step closer. So the answer for a
+    (start, goal) pair never depends on earlier queries, and the tail of a
+    canonical path is itself the canonical path from that tile.
+    """
+    walls = maze.wall_mask
+    if walls[start] or walls[goal]:
+        return None
+    if start == goal:
+        return [start]
+
+    cols = maze.cols
+    start_row, start_col = divmod(start, cols)
+
+    def h(index):
+        row, col = divmod(index, cols)
+        return abs(row - start_row) + abs(col - start_col)
+
+    dist = {goal: 0}
+    best = None
+    open_heap = [(h(goal), 0, goal)]
+    while open_heap:
+        f, d, current = heapq.heappop(open_heap)
+        if best is not None and f > best:
+            break
+        if d > dist[current]:
+            continue  # stale heap entry
+        if current == start:
+            best = d
+            continue
+        for n in _neighbors(maze, current):
+            nd = d + 1
+            if nd < dist.get(n, nd + 1):
+                dist[n] = nd
+                heapq.heappush(open_heap, (nd + h(n), nd, n))
+
+    if best is None:
+        return None
+
+    path = [start]
+    current = start
+    while current != goal:
+        closer = dist[current] - 1
+        for n in _neighbors(maze, current):
+            if dist.get(n) == closer:
+                current = n
+                break
+        path.append(current)
+    return path
+
+
+class PathCache:
+    """
+    (start, goal) -> next tile cache filled from A* results.
+    Every tile on a solved path is cached toward the same goal (the tail of a
+    canonical path is canonical), so an agent walking a path costs one A*
+    search in total rather than one per tile. Unreachable pairs cache -1.
+    Entries are pure functions of their key, so eviction never changes answers.
+    """
+
+    def __init__(self, maze, capacity=PATH_CACHE_SIZE):
+        self.maze = maze
+        self.capacity = capacity
+        self.next_step = {}
+        self.searches = 0
+
+    def next_tile(self, start, goal):
+        """Next tile index from start toward goal, or -1 if unreachable."""
+        key = (start, goal)
+        step = self.next_step.get(key)
+        if step is not None:
+            return step
+
+        self.searches += 1
+        path = astar(self.maze, start, goal)
+        if path is None:
+            self._put(key, -1)
+            return -1
+        for i in range(len(path) - 1):
+            self._put((path[i], goal), path[i + 1])
+        self._put((goal, goal), goal)
+        return self.next_step[key]
+
+    def path(self, start, goal):
+        """Full tile path (list of indices) by following the cache, or None."""
+        path = [start]
+        while start != goal:
+            start = self.next_tile(start, goal)
+            if start < 0:
+                return None
+            path.append(start)
+        return path
+
+    def _put(self, key, value):
+        cache = self.next_step
+        cache[key] = value
+        # dicts keep insertion order: drop the oldest entries first
+        while len(cache) > self.capacity:
+            del cache[next(iter(cache))]
+
+    def clear(self):
+        self.next_step.clear()
+
+
+class FlowField:
+    """
+    Breadth-first field toward one goal tile, shared by every agent heading there.
+    next_of[tile] is the neighbouring tile one step closer to the goal and
+    dist_of[tile] the step count; tiles further than radius steps (or not
+    connected) are absent.
+    """
+
+    def __init__(self, maze, goal, radius=FLOW_FIELD_RADIUS):
+        self.goal = goal
+        self.radius = radius
+        self.next_of = {}
+        self.dist_of = {}
+        self._spread(maze, (goal,))
+
+    @classmethod
+    def from_goals(cls, maze, goals, radius=FLOW_FIELD_RADIUS):
+        """
+        Field toward the nearest of several goal tiles, from one multi-source
+        BFS (ties go to the earlier goal). goal is the first of them.
+        """
+        field = cls.__new__(cls)
+        field.goal = goals[0] if goals else -1
+        field.radius = radius
+        field.next_of = {}
+        field.dist_of = {}
+        field._spread(maze, goals)
+        return field
+
+    def _spread(self, maze, goals):
+        next_of = self.next_of
+        dist_of = self.dist_of
+        frontier = deque()
+        for goal in goals:
+            if goal not in dist_of and not maze.wall_mask[goal]:
+                next_of[goal] = goal
+                dist_of[goal] = 0
+                frontier.append(goal)
+
+        radius = self.radius
+        while frontier:
+            current = frontier.popleft()
+            d = dist_of[current] + 1
+            if d > radius:
+                continue
+            for n in _neighbors(maze, current):
+                if n not in dist_of:
+                    dist_of[n] = d
+                    next_of[n] = current
+                    frontier.append(n)
+
+    def next_tile(self, tile):
+        """Next tile index toward the goal, or -1 if tile is outside the field."""
+        return self.next_of.get(tile, -1)
+
+
+def steer_point(maze, x, y, size, goal_x, goal_y, goal_tile=None, field=None):
+    """
+    Where an agent at top-left (x, y) should head on its way to top-left
+    (goal_x, goal_y): the centre of the next tile on the path (shifted to
+    top-left coordinates), or the goal itself once they share a tile or no
+    path is known. Uses field when given, else the maze's A* cache.
+    """
+    half = size / 2
+    start = maze.tile_index_at(x + half, y + half)
+    if goal_tile is None:
+        goal_tile = maze.tile_index_at(goal_x + half, goal_y + half)
+    if start < 0 or goal_tile < 0 or start == goal_tile:
+        return goal_x, goal_y
+
+    if field is not None:
+        step = field.next_tile(start)
+    else:
+        step = maze.next_tile_toward(start, goal_tile)
+    if step < 0:
+        return goal_x, goal_y
+
+    ts = maze.tile_size
+    row, col = divmod(step, maze.cols)
+    return col * ts + ts / 2 - half, row * ts + ts / 2 - half
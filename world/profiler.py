@@ -0,0 +1,181 @@
+"""
+Per-frame profiling: timing spans, a ring buffer of recent frames, an
+on-screen p50/p99 HUD and Chrome trace export.
+
+Instrumented code holds the profiler in a variable that is None when
+profiling is off, so a disabled profiler costs one "is not None" test per
+hook and nothing else:
+
+    profiler = game.profiler
+    if profiler is not None:
+        t0 = time.perf_counter()
+    ...
+    if profiler is not None:
+        profiler.add("vision", t0, time.perf_counter())
+
+World toggles it with F3 (see World.toggle_profiler). Open an exported
+trace in chrome://tracing or https://ui.perfetto.dev.
+"""
+import json
+import time
+
+import numpy as np
+
+# nesting only matters for the HUD (children are indented under "update"/"draw")
+PHASES = (
+    ("events", 0),
+    ("update", 0),
+    ("player", 1),
+    ("vision", 1),
+    ("steering", 1),
+    ("collision", 1),
+    ("draw", 0),
+    ("draw_agents", 1),
+    ("draw_cones", 1),
+    ("present", 0),
+    ("frame", 0),
+)
+PHASE_NAMES = tuple(name for name, _ in PHASES)
+_PHASE_INDEX = {name: i for i, name in enumerate(PHASE_NAMES)}
+_FRAME = _PHASE_INDEX["frame"]
+
+HUD_REFRESH_FRAMES = 30  # the HUD text is re-rendered this often
+
+
+class Profiler:
+    """
+    Collects spans (phase, start, end) from perf_counter timestamps.
+
+    Each frame's per-phase totals go into a ring of the last `capacity`
+    frames (what the HUD percentiles are taken over); the spans themselves
+    go into a ring of the last `max_spans` spans (what a trace export holds).
+    totals keeps seconds per phase since the profiler was created.
+    """
+
+    def __init__(self, capacity=600, max_spans=None):
+        self.capacity = capacity
+        self.frames = np.zeros((capacity, len(PHASE_NAMES)), dtype=np.float64)
+        self.frame_count = 0
+        self.totals = dict.fromkeys(PHASE_NAMES, 0.0)
+        self._current = [0.0] * len(PHASE_NAMES)
+        self._frame_start = time.perf_counter()
+
+        self.max_spans = max_spans or capacity * 32
+        self._span_phase = [0] * self.max_spans
+        self._span_start = [0.0] * self.max_spans
+        self._span_end = [0.0] * self.max_spans
+        self._span_frame = [0] * self.max_spans
+        self.span_count = 0
+
+        self.show_hud = False
+        self._hud = None
+        self._hud_frame = -1
+        self._font = None
+
+    def add(self, phase, start, end):
+        """Record one span of phase (a PHASE_NAMES entry) from start to end (perf_counter seconds)."""
+        i = _PHASE_INDEX[phase]
+        self._current[i] += end - start
+        slot = self.span_count % self.max_spans
+        self._span_phase[slot] = i
+        self._span_start[slot] = start
+        self._span_end[slot] = end
+        self._span_frame[slot] = self.frame_count
+        self.span_count += 1
+
+    def add_split(self, start, durations):
+        """
+        Record phases measured as sums over many small pieces (per-agent
+        work in the Python backend): durations is [(phase, seconds)], laid
+        out back to back from start so the trace shows their share.
+        """
+        for phase, seconds in durations:
+            end = start + seconds
+            self.add(phase, start, end)
+            start = end
+
+    def end_frame(self):
+        """Close the current frame: its totals go into the ring."""
+        now = time.perf_counter()
+        current = self._current
+        current[_FRAME] = now - self._frame_start
+        self._frame_start = now
+        self.frames[self.frame_count % self.capacity] = current
+        totals = self.totals
+        for name, seconds in zip(PHASE_NAMES, current):
+            totals[name] += seconds
+        self._current = [0.0] * len(PHASE_NAMES)
+        self.frame_count += 1
+
+    def recent(self):
+        """(frames, phases) array of seconds for the frames still in the ring."""
+        return self.frames[:min(self.frame_count, self.capacity)]
+
+    def percentiles(self, qs=(50, 99)):
+        """{phase: [ms at each q]} over the frames in the ring."""
+        frames = self.recent()
+        if len(frames) == 0:
+            return {}
+        table = np.percentile(frames, qs, axis=0) * 1000.0
+        return {name: table[:, i].tolist() for i, name in enumerate(PHASE_NAMES)}
+
+    def spans(self):
+        """Recorded spans still in the ring, oldest first: [(phase, start, end, frame)]."""
+        count = min(self.span_count, self.max_spans)
+        first = self.span_count - count
+        out = []
+        for n in range(first, self.span_count):
+            slot = n % self.max_spans
+            out.append((PHASE_NAMES[self._span_phase[slot]], self._span_start[slot],
+                        self._span_end[slot], self._span_frame[slot]))
+        return out
+
+    def chrome_trace(self):
+        """The spans as a Chrome trace-event dict (complete "X" events, microseconds)."""
+        events = []
+        for phase, start, end, frame in self.spans():
+            events.append({
+                "name": phase,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": 0,
+                "tid": 0,
+                "args": {"frame": frame},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def draw_hud(self, screen):
+        """Blit the p50/p99 table at the top-left of screen; returns its Rect."""
+        import pygame
+
+        if self._hud is None or self.frame_count - self._hud_frame >= HUD_REFRESH_FRAMES:
+            if self._font is None:
+                # pygame's bundled default font: no system font scan
+                self._font = pygame.font.Font(None, 14)
+            font = self._font
+            stats = self.percentiles()
+            rows = [("phase", "p50 ms", "p99 ms")]
+            for name, depth in PHASES:
+                p50, p99 = stats.get(name, (0.0, 0.0))
+                rows.append(("  " * depth + name, f"{p50:.2f}", f"{p99:.2f}"))
+            # the default font is proportional: the name column is left-aligned,
+            # the numbers right-aligned, each laid out by its widest cell
+            rendered = [[font.render(cell, True, (255, 255, 255)) for cell in row] for row in rows]
+            widths = [max(r[c].get_width() for r in rendered) + 8 for c in range(3)]
+            line = max(s.get_height() for r in rendered for s in r)
+            hud = pygame.Surface((sum(widths) + 8, line * len(rendered) + 8))
+            hud.fill((0, 0, 0))
+            y = 4
+            for name, p50, p99 in rendered:
+                hud.blit(name, (4, y))
+                hud.blit(p50, (4 + widths[0] + widths[1] - p50.get_width(), y))
+                hud.blit(p99, (4 + sum(widths) - p99.get_width(), y))
+                y += line
+            self._hud = hud
+            self._hud_frame = self.frame_count
+        return screen.blit(self._hud, (0, 0))
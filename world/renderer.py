@@ -0,0 +1,75 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """
+    Dirty-rectangle presenter for a mostly static scene.
+
+    The state blits its static background (the prebuilt maze surface) once;
+    after that each frame only restores the areas the moving things covered
+    last frame, draws them again, and pushes just those rects to the display
+    with pygame.display.update. Render cost then scales with the number of
+    moving objects rather than the screen area.
+
+    Frame protocol (World.draw drives it):
+        renderer.begin(background)   # state, before drawing anything
+        renderer.add(rect_or_rects)  # state, for everything drawn this frame
+        renderer.present()           # World, once per frame
+    """
+
+    def __init__(self, screen, max_rects=512):
+        self.screen = screen
+        # past this many rects (or the screen area) one flip is cheaper
+        self.max_rects = max_rects
+        self.background = None
+        self.full_redraw = True
+        self.frames = 0
+        self.full_frames = 0
+        self._dirty = []
+        self._erased = []
+
+    def invalidate(self):
+        """Repaint the whole screen on the next frame (state change, resize...)."""
+        self.full_redraw = True
+
+    def begin(self, background):
+        """Erase last frame's moving objects by restoring background under them."""
+        screen = self.screen
+        if background is not self.background:
+            self.background = background
+            self.full_redraw = True
+
+        if self.full_redraw:
+            screen.fill((0, 0, 0))
+            screen.blit(background, (0, 0))
+            self._erased = []
+        else:
+            self._erased = [screen.blit(background, r, r) for r in self._dirty]
+        self._dirty = []
+
+    def add(self, rects):
+        """Mark a Rect (or an iterable of Rects) as drawn this frame."""
+        if isinstance(rects, pygame.Rect):
+            self._dirty.append(rects)
+        else:
+            self._dirty.extend(rects)
+
+    def present(self):
+        """Push this frame to the display; returns the number of rects updated (0 = full flip)."""
+        self.frames += 1
+        if self.full_redraw:
+            self.full_redraw = False
+            self.full_frames += 1
+            pygame.display.flip()
+            return 0
+
+        rects = self._erased + self._dirty
+        area = 0
+        for r in rects:
+            area += r.w * r.h
+        if len(rects) > self.max_rects or area >= self.screen.get_width() * self.screen.get_height():
+            self.full_frames += 1
+            pygame.display.flip()
+            return 0
+        pygame.display.update(rects)
+        return len(rects)
@@ -3,5 +3,24 @@ import pygame
 FPS = 60
 MAZE_WIDTH = 1024
 MAZE_LENGTH = 1024
-MAZE_FOG = False
-AGENT_COUNT = 7
\ No newline at end of file
+MAZE_FOG = False  # fog of war around the player (world.fog)
+FOG_RADIUS = 8  # tiles the player sees with MAZE_FOG
+AGENT_COUNT = 7
+SPAWN_SEPARATION = 2  # tiles between agent spawns (and the player), when there is room
+SPATIAL_CELL_SIZE = 128  # pixels; about one vision_distance per cell
+VISION_CONE_CLIP = True  # debug cones stop at walls
+CHUNK_PIXELS = 512  # maze chunk surfaces are about this many pixels square
+CHUNK_CACHE_BYTES = 64 * 1024 * 1024  # LRU cap on cached chunk surfaces
+AI_LOD = False  # update distant agents less often (AIScheduler)
+AI_BUDGET_US = 4000  # per-frame time for distant agents when AI_LOD is on
+AI_ALERTS = True  # guards that spot the player alert the others nearby (AlertBoard)
+AI_BEHAVIOURS = False  # agent types driven by state machines (Agent_Behaviours.BehaviourEngine, python backend); not with AI_LOD
+AI_HEARING = True  # agents hear the player's noise (world.noise) and go to where it came from
+RUN_FACTOR = 1.6  # player speed multiplier while running
+NOISE_RUN = 6.0  # tiles a running footstep carries
+NOISE_BUMP = 4.0  # tiles walking into a wall carries
+NOISE_REACH = 8  # loudest noise, in tiles (bounds the noise search)
+AGENT_MIX = {"patroller": 4, "hunter": 1, "sentry": 1, "camera": 1}  # agent types by weight, with AI_BEHAVIOURS or main.py --behaviours (--agent-mix overrides)
+PLAYER_HZ = 120  # fixed simulation rates (World fixed_step)
+AI_HZ = 30
+MAX_FRAME_TIME = 0.25  # seconds of simulation one frame may catch up
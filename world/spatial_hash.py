@@ -0,0 +1,145 @@
+import math
+
+
+class SpatialHash:
+    """
+    Uniform grid over entity positions for proximity queries.
+
+    Entities are any objects with .x / .y (top-left pixel position, like
+    Player and StandardAI). Each entity lives in exactly one square cell;
+    update() only touches the grid when an entity crosses into a new cell, so
+    keeping the index current costs O(1) per moved entity. Queries only visit
+    the cells overlapping the query area, so they run in time proportional to
+    the number of nearby entities rather than the total count.
+    """
+
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+
+        # (cx, cy) -> {entity: None}; dicts keep insertion order, so query
+        # results are deterministic for the same sequence of operations
+        self.cells = {}
+        self.cell_of = {}
+
+        # largest reach (e.g. vision distance) registered by any entity; lets
+        # callers ask "who could possibly reach (x, y)" with one radius query
+        self.max_reach = 0.0
+
+    def __len__(self):
+        return len(self.cell_of)
+
+    def __contains__(self, entity):
+        return entity in self.cell_of
+
+    def _key(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, entity, reach=0.0):
+        """Add entity at its current position (re-inserting just updates it)."""
+        if reach > self.max_reach:
+            self.max_reach = float(reach)
+        if entity in self.cell_of:
+            self.update(entity)
+            return
+        key = self._key(entity.x, entity.y)
+        self.cell_of[entity] = key
+        self.cells.setdefault(key, {})[entity] = None
+
+    def insert_many(self, entities, reach=0.0):
+        """insert() for many entities at once (reach is the largest of theirs)."""
+        if reach > self.max_reach:
+            self.max_reach = float(reach)
+        size = self.cell_size
+        cells = self.cells
+        cell_of = self.cell_of
+        for e in entities:
+            if e in cell_of:
+                self.update(e)
+                continue
+            key = (int(e.x // size), int(e.y // size))
+            cell_of[e] = key
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = {e: None}
+            else:
+                bucket[e] = None
+
+    def remove(self, entity):
+        key = self.cell_of.pop(entity, None)
+        if key is None:
+            return
+        bucket = self.cells[key]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[key]
+
+    def update(self, entity):
+        """Re-file entity after it moved. Cheap no-op while it stays in its cell."""
+        key = self._key(entity.x, entity.y)
+        old = self.cell_of.get(entity)
+        if key == old:
+            return
+        if old is not None:
+            bucket = self.cells[old]
+            del bucket[entity]
+            if not bucket:
+                del self.cells[old]
+        self.cell_of[entity] = key
+        self.cells.setdefault(key, {})[entity] = None
+
+    def clear(self):
+        self.cells.clear()
+        self.cell_of.clear()
+        self.max_reach = 0.0
+
+    def _buckets(self, x0, y0, x1, y1):
+        cx0, cy0 = self._key(x0, y0)
+        cx1, cy1 = self._key(x1, y1)
+        cells = self.cells
+        # sparse maps: walking the occupied cells is cheaper than the range
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            for (cx, cy), bucket in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield bucket
+            return
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield bucket
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Entities whose position lies in the closed rect [x0, x1] x [y0, y1]."""
+        found = []
+        for bucket in self._buckets(x0, y0, x1, y1):
+            for e in bucket:
+                if x0 <= e.x <= x1 and y0 <= e.y <= y1:
+                    found.append(e)
+        return found
+
+    def query_radius(self, x, y, radius):
+        """Entities whose position is within radius pixels of (x, y)."""
+        r_sq = radius * radius
+        found = []
+        for bucket in self._buckets(x - radius, y - radius, x + radius, y + radius):
+            for e in bucket:
+                dx = e.x - x
+                dy = e.y - y
+                if dx * dx + dy * dy <= r_sq:
+                    found.append(e)
+        return found
+
+    def query_tiles(self, row0, col0, row1, col1, tile_size):
+        """Entities whose position falls inside the inclusive tile range."""
+        x0 = col0 * tile_size
+        y0 = row0 * tile_size
+        x1 = (col1 + 1) * tile_size
+        y1 = (row1 + 1) * tile_size
+        found = []
+        for bucket in self._buckets(x0, y0, math.nextafter(x1, x0), math.nextafter(y1, y0)):
+            for e in bucket:
+                if x0 <= e.x < x1 and y0 <= e.y < y1:
+                    found.append(e)
+        return found
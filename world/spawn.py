@@ -0,0 +1,207 @@
+"""
+Spawn and patrol planning for World.populate.
+
+A SpawnPlanner is built once per Maze (Maze.spawn_planner) and caches:
+- the floor tiles (Maze.floor_indices),
+- the straight runs of walkable tiles through every tile, horizontal and
+  vertical, as start / end indices,
+- connected components of walkable tiles (4-connected, like pathfinding),
+  found by merging horizontal runs that touch vertically.
+
+spawn_tiles() and patrols() then work on whole arrays. Spawns are
+scattered at least `separation` tiles apart, using a grid of
+separation-sized cells as the spatial index. Each agent gets a patrol
+along a straight run through its spawn tile, so both endpoints are in
+sight of each other (Maze.is_clear_straight_path) and on the same
+component. Every patrol can be walked without touching a wall.
+"""
+import numpy as np
+
+# picks per cell before a cell is given up as full
+SPAWN_ATTEMPTS = 4
+
+# candidate tiles drawn per requested spawn; big maps never look at all their floor
+SPAWN_OVERSAMPLE = 2
+
+
+def _runs(walk):
+    """
+    Horizontal runs of True in a 2D bool array: (run id per cell, -1 off
+    runs; flat index of each run's first cell; flat index of its last).
+    """
+    starts = walk.copy()
+    starts[:, 1:] &= ~walk[:, :-1]
+    ends = walk.copy()
+    ends[:, :-1] &= ~walk[:, 1:]
+    flat = walk.ravel()
+    run_id = np.cumsum(starts.ravel(), dtype=np.int64) - 1
+    run_id[~flat] = -1
+    return run_id, np.flatnonzero(starts), np.flatnonzero(ends)
+
+
+def _union(count, a, b):
+    """Component root (smallest member) of each of count nodes joined by edges a[i]-b[i]."""
+    parent = np.arange(count, dtype=np.int64)
+    while True:
+        pa = parent[a]
+        pb = parent[b]
+        lo = np.minimum(pa, pb)
+        hi = np.maximum(pa, pb)
+        joined = lo != hi
+        if not joined.any():
+            return parent
+        # hook each root onto the smallest root it touches, then flatten
+        np.minimum.at(parent, hi[joined], lo[joined])
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+
+class SpawnPlanner:
+    """Cached floor / run / component tables of one Maze, and spawn planning over them."""
+
+    def __init__(self, maze):
+        self.maze = maze
+        rows, cols = maze.rows, maze.cols
+        walk = maze.wall_array == 0
+        self.floor = maze.floor_indices()
+
+        # horizontal runs, straight from the row-major layout
+        self._h_id, self._h_start, self._h_end = _runs(walk)
+
+        # vertical runs: runs of the transpose, mapped back to map indices
+        v_id, v_start, v_end = _runs(np.ascontiguousarray(walk.T))
+        self._v_id = v_id.reshape(cols, rows).T.ravel()
+        self._v_start = (v_start % rows) * cols + v_start // rows
+        self._v_end = (v_end % rows) * cols + v_end // rows
+
+        # components: horizontal runs joined wherever a tile has a walkable tile below it
+        h_id = self._h_id
+        below = np.flatnonzero((walk[:-1] & walk[1:]).ravel())
+        roots = _union(len(self._h_start), h_id[below], h_id[below + cols])
+        _, run_component = np.unique(roots, return_inverse=True)
+        self.components = np.where(h_id >= 0, run_component[h_id], -1).astype(np.int32)
+        self.component_sizes = np.bincount(run_component,
+                                           weights=self._h_end - self._h_start + 1).astype(np.int64)
+
+    def component_of(self, tile):
+        """Component id of flat tile index tile (-1 for walls)."""
+        return int(self.components[tile])
+
+    def spawn_tiles(self, count, rng, separation=2, avoid=-1, component=None):
+        """
+        count floor tiles (flat indices, in random order) at least separation
+        tiles apart from each other and from tile avoid (e.g. the player's).
+        Once no more fit, the rest are drawn uniformly from the floor tiles,
+        so the constraint is best effort on crowded maps. component limits
+        spawns to one connected component. rng is a numpy Generator.
+        """
+        floor = self.floor
+        if component is not None:
+            floor = floor[self.components[floor] == component]
+        if count <= 0 or len(floor) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if separation <= 1:
+            return rng.choice(floor, count, replace=count > len(floor))
+
+        maze = self.maze
+        cols = maze.cols
+        sep = int(np.ceil(separation))
+        cell_rows = -(-maze.rows // sep)
+        cell_cols = -(-cols // sep)
+        # the spatial index: at most one spawn per sep x sep cell, so only the
+        # 8 neighbouring cells can hold a spawn closer than sep
+        taken = np.full(cell_rows * cell_cols, -1, dtype=np.int64)
+        if avoid >= 0:
+            ar, ac = divmod(avoid, cols)
+            taken[(ar // sep) * cell_cols + ac // sep] = avoid
+
+        if len(floor) > SPAWN_OVERSAMPLE * count:
+            pool = rng.choice(floor, SPAWN_OVERSAMPLE * count, replace=False)
+        else:
+            pool = rng.permutation(floor)
+        pool_cell = (pool // cols // sep) * cell_cols + (pool % cols) // sep
+        sep_sq = separation * separation
+        slot = np.empty(len(taken), dtype=np.int64)
+        for _ in range(SPAWN_ATTEMPTS):
+            open_ = taken[pool_cell] < 0
+            pool = pool[open_]
+            pool_cell = pool_cell[open_]
+            if len(pool) == 0:
+                break
+            cell_row = pool_cell // cell_cols
+            cell_col = pool_cell % cell_cols
+            tried = np.zeros(len(pool), dtype=bool)
+            # cells of one parity are never neighbours, so each phase can
+            # place all of its picks at once
+            for parity_row in (0, 1):
+                for parity_col in (0, 1):
+                    phase = ((cell_row & 1) == parity_row) & ((cell_col & 1) == parity_col) & ~tried
+                    idx = np.flatnonzero(phase)
+                    # one (random: the pool is shuffled) candidate per cell:
+                    # whichever write lands in slot
+                    cells = pool_cell[idx]
+                    slot[cells] = idx
+                    idx = idx[slot[cells] == idx]
+                    if len(idx) == 0:
+                        continue
+                    tried[idx] = True
+                    tiles = pool[idx]
+                    row = tiles // cols
+                    col = tiles % cols
+                    crow = cell_row[idx]
+                    ccol = cell_col[idx]
+                    ok = np.ones(len(idx), dtype=bool)
+                    for dr in (-1, 0, 1):
+                        for dc in (-1, 0, 1):
+                            if dr == 0 and dc == 0:
+                                continue
+                            nr = crow + dr
+                            nc = ccol + dc
+                            inside = (nr >= 0) & (nr < cell_rows) & (nc >= 0) & (nc < cell_cols)
+                            other = np.full(len(idx), -1, dtype=np.int64)
+                            other[inside] = taken[nr[inside] * cell_cols + nc[inside]]
+                            near = other >= 0
+                            d_row = row[near] - other[near] // cols
+                            d_col = col[near] - other[near] % cols
+                            ok[np.flatnonzero(near)[d_row * d_row + d_col * d_col < sep_sq]] = False
+                    taken[pool_cell[idx[ok]]] = tiles[ok]
+            pool = pool[~tried]
+            pool_cell = pool_cell[~tried]
+
+        if avoid >= 0:
+            taken[taken == avoid] = -1
+        placed = taken[taken >= 0]
+        if len(placed) >= count:
+            return rng.choice(placed, count, replace=False)
+        extra = rng.choice(floor, count - len(placed))
+        return np.concatenate((rng.permutation(placed), extra))
+
+    def patrols(self, tiles, rng):
+        """
+        Patrol endpoints (tiles_a, tiles_b) for agents spawning on tiles: two
+        tiles of the longer straight run (either one on a tie) through each
+        spawn tile, on either side of it, so the spawn lies between them.
+        """
+        tiles = np.asarray(tiles, dtype=np.int64)
+        n = len(tiles)
+        cols = self.maze.cols
+        h_lo = self._h_start[self._h_id[tiles]]
+        h_hi = self._h_end[self._h_id[tiles]]
+        v_lo = self._v_start[self._v_id[tiles]]
+        v_hi = self._v_end[self._v_id[tiles]]
+        h_len = h_hi - h_lo
+        v_len = (v_hi - v_lo) // cols
+        horizontal = (h_len > v_len) | ((h_len == v_len) & (rng.random(n) < 0.5))
+
+        # positions along the chosen run: 1 per column, or cols per row
+        step = np.where(horizontal, 1, cols)
+        lo = np.where(horizontal, h_lo, v_lo)
+        hi = np.where(horizontal, h_hi, v_hi)
+        before = (tiles - lo) // step
+        after = (hi - tiles) // step
+        tiles_a = tiles - (rng.random(n) * (before + 1)).astype(np.int64) * step
+        tiles_b = tiles + (rng.random(n) * (after + 1)).astype(np.int64) * step
+        return tiles_a, tiles_b
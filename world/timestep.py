@@ -0,0 +1,44 @@
+class FixedTimestep:
+    """
+    Accumulator for one fixed-rate simulation clock.
+
+    advance(elapsed) banks real time and returns how many whole steps of
+    1/hz seconds are due; the remainder carries over to the next frame.
+    alpha (0..1) is how far the clock is into its next step, which is what
+    the renderer interpolates positions by.
+    """
+
+    __slots__ = ("hz", "step", "accumulator")
+
+    def __init__(self, hz):
+        if hz <= 0:
+            raise ValueError("hz must be positive")
+        self.hz = hz
+        self.step = 1.0 / hz
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.step)
+
+
+def merge_steps(clocks_before, counts, steps):
+    """
+    Order the fixed steps of several clocks in time within one frame.
+
+    clocks_before are the accumulators before advance(), counts the step
+    counts it returned and steps the step lengths. Returns clock indices in
+    the order their steps fall due (ties go to the lower index).
+    """
+    events = []
+    for i, (before, count, step) in enumerate(zip(clocks_before, counts, steps)):
+        for k in range(count):
+            events.append(((k + 1) * step - before, i))
+    events.sort()
+    return [i for _, i in events]
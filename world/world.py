@@ -1,10 +1,18 @@
+import gc
+import numpy as np
 import pygame
 import random
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-from .settings import AGENT_COUNT, MAZE_WIDTH, MAZE_LENGTH
-from Hackathon_Stealth_main.Vision_Cones.Cones_Initialization import draw_vision_cone
-from states.playing_state import PlayingState
-from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+from .settings import (AGENT_COUNT, MAZE_WIDTH, MAZE_LENGTH, SPATIAL_CELL_SIZE, PLAYER_HZ, AI_HZ, MAX_FRAME_TIME,
+                       SPAWN_SEPARATION)
+from .spatial_hash import SpatialHash
+from .renderer import DirtyRectRenderer
+from .timestep import FixedTimestep, merge_steps
+from .input import InputState, TOGGLE_PROFILER
 
 
 class World:
@@ -12,25 +20,83 @@ class World:
     Owns the pygame window, clock, and delegates behavior to the active State.
     """
 
-    def __init__(self, width: int, height: int, caption: str = "Maze Game", fps: int = 60):
+    def __init__(self, width: int, height: int, caption: str = "Maze Game", fps: int = 60,
+                 headless: bool = False, state=None, dirty_rects: bool = True, seed: Optional[int] = None,
+                 fixed_step: bool = False, action_map=None):
+        """
+        headless=True skips the window entirely (screen is None); use it with
+        update(dt) for simulation-only runs such as sim.headless.
+        state overrides the initial state (defaults to a fresh PlayingState).
+        dirty_rects presents only the regions that changed (see DirtyRectRenderer)
+        for states that support it; False repaints and flips the whole screen.
+        seed seeds self.rng, the only randomness the simulation uses (a random
+        seed is picked when None); sim.replay records it to reproduce a session.
+        fixed_step makes update() bank the frame's real time and run the
+        player at PLAYER_HZ and the agents at AI_HZ in fixed steps (states
+        with update_player / update_agents); draw() then interpolates
+        positions between steps. False runs one variable update per call.
+        action_map is the key bindings (world.input.ActionMap) for self.input.
+        """
         # Window / timing
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption(caption)
+        self.headless = headless
+        if headless:
+            self.screen = None
+        else:
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption(caption)
+        self.renderer = DirtyRectRenderer(self.screen) if dirty_rects and self.screen is not None else None
 
         self.clock = pygame.time.Clock()
         self.fps = fps
         self.running = True
 
-        # FSM: start in Playing for now
-        self.current_state = PlayingState()
-
         self.agents = []
 
-    def populate(self):
+        # held actions + key bindings; fed by handle_events, or set directly
+        # by headless runs and replays
+        self.input = InputState(action_map)
+
+        self.seed = seed if seed is not None else secrets.randbits(63)
+        self.rng = random.Random(self.seed)
+
+        # optional sim.replay.Recorder logging every tick's dt and input
+        self.recorder = None
+        self.ticks = 0
+
+        # optional Profiler (None = off, no timing at all); F3 toggles it
+        self.profiler = None
+
+        self.fixed_step = fixed_step
+        self.player_clock = FixedTimestep(PLAYER_HZ)
+        self.ai_clock = FixedTimestep(AI_HZ)
+
+        # proximity index over the player and agents; rebuilt by populate()
+        self.spatial = SpatialHash(SPATIAL_CELL_SIZE)
+
+        # state stack (top = current_state); start in Playing for now
+        self._states = []
+        self._loader = None   # worker thread for load_state, started on first use
+        self._loading = None  # (Future, push) of the state being loaded
+        if state is None:
+            # imported here: the level, AI and vision modules only load once a
+            # world actually plays (main.py opens on a LoadingState instead)
+            from states.playing_state import PlayingState
+            state = PlayingState()
+        self.push_state(state)
+
+    @property
+    def current_state(self):
+        """The active state: the top of the state stack."""
+        return self._states[-1] if self._states else None
+
+    def populate(self, count=None):
         """
-        Create AGENT_COUNT agents placed on floor tiles (tile centers).
-        Agents are added to self.agents and given two random patrol endpoints
-        chosen from floor tiles. This uses the maze found on the current_state.
+        Create count (default AGENT_COUNT) agents placed on floor tiles (tile centers).
+        Spawns are spread SPAWN_SEPARATION tiles apart (and away from the
+        player) while there is room, and each agent patrols between two tiles
+        of a straight corridor through its spawn (see world.spawn), so every
+        patrol is walkable. This uses the maze found on the current_state,
+        and its behaviours (a BehaviourEngine) to pick agent types if it has one.
         """
         # don't repopulate if already have agents
         if len(self.agents) > 0:
@@ -42,85 +108,323 @@ class World:
             # nothing to base spawn locations on
             return
 
-        # collect floor tile coordinates (row, col)
-        floor_tiles = []
-        for r in range(maze.rows):
-            for c in range(maze.cols):
-                if maze.grid[r][c] == 0:  # floor
-                    floor_tiles.append((r, c))
+        if count is None:
+            count = AGENT_COUNT
 
-        if not floor_tiles:
+        from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+
+        # floor tiles, corridors and components are cached on the maze
+        planner = maze.spawn_planner()
+        if len(planner.floor) == 0:
             return
 
-        from Hackathon_Stealth_main.AI_Agents.AI_Agents import StandardAI
+        avoid = -1
+        player = getattr(self.current_state, "player", None)
+        if player is not None:
+            half = player.size / 2
+            avoid = maze.tile_index_at(player.x + half, player.y + half)
 
-        for _ in range(AGENT_COUNT):
-            # pick a random floor tile for spawn
-            row, col = random.choice(floor_tiles)
-            center_x = col * maze.tile_size + maze.tile_size / 2
-            center_y = row * maze.tile_size + maze.tile_size / 2
+        # whole-array planning draws from a numpy generator seeded off self.rng
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        tiles = planner.spawn_tiles(count, rng, SPAWN_SEPARATION, avoid)
+        tiles_a, tiles_b = planner.patrols(tiles, rng)
+        to_a = rng.random(len(tiles)) < 0.5
 
-            # agent size (tweak if necessary)
-            agent_size = 6
+        # agent size (tweak if necessary); positions are top-left coords
+        # such that the agent is centered on its tile
+        agent_size = 6
+        ts = maze.tile_size
+        cols = maze.cols
+        shift = ts / 2 - agent_size / 2
 
-            # top-left coords for agent such that it's centered on tile
-            top_left_x = center_x - agent_size / 2
-            top_left_y = center_y - agent_size / 2
+        def corner(t):
+            return ((t % cols) * ts + shift).tolist(), ((t // cols) * ts + shift).tolist()
 
-            agent = StandardAI(top_left_x, top_left_y, size=agent_size)
+        xs, ys = corner(tiles)
+        axs, ays = corner(tiles_a)
+        bxs, bys = corner(tiles_b)
 
-            # pick two random floor tiles as patrol endpoints (could be same tile)
-            rA, cA = random.choice(floor_tiles)
-            rB, cB = random.choice(floor_tiles)
-            ax = cA * maze.tile_size + maze.tile_size / 2 - agent_size / 2
-            ay = rA * maze.tile_size + maze.tile_size / 2 - agent_size / 2
-            bx = cB * maze.tile_size + maze.tile_size / 2 - agent_size / 2
-            by = rB * maze.tile_size + maze.tile_size / 2 - agent_size / 2
+        # the cycle collector would otherwise run over and over while
+        # thousands of agents are allocated; they hold no cycles
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            agents = self.agents
+            for x, y, ax, ay, bx, by, first in zip(xs, ys, axs, ays, bxs, bys, to_a.tolist()):
+                agent = StandardAI(x, y, size=agent_size)
+                agent.patrol_endA = (ax, ay)
+                agent.patrol_endB = (bx, by)
+                agent.patrol_target = agent.patrol_endA if first else agent.patrol_endB
+                agent._set_facing_toward(agent.patrol_target)
+                agents.append(agent)
 
-            agent.patrol_endA = (ax, ay)
-            agent.patrol_endB = (bx, by)
-            agent.patrol_target = random.choice([agent.patrol_endA, agent.patrol_endB])
-            agent._set_facing_toward(agent.patrol_target)
+            # agent types (and their stats) for states that run a BehaviourEngine
+            behaviours = getattr(self.current_state, "behaviours", None)
+            if behaviours is not None:
+                behaviours.assign(agents, rng)
 
-            self.agents.append(agent)
+            self.rebuild_spatial()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def rebuild_spatial(self):
+        """Re-index the current player and agents from scratch."""
+        self.spatial.clear()
+        player = getattr(self.current_state, "player", None)
+        if player is not None:
+            self.spatial.insert(player)
+        reach = max((agent.vision_distance for agent in self.agents), default=0.0)
+        self.spatial.insert_many(self.agents, reach)
 
     def change_state(self, new_state) -> None:
-        """Switch to a new state object (e.g., MenuState(), PauseState())."""
-        self.current_state = new_state
+        """Replace the current state with a new state object (e.g., MenuState())."""
+        if self._states:
+            self._states.pop().exit(self)
+        self._states.append(new_state)
+        new_state.enter(self)
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    def push_state(self, state) -> None:
+        """Run state on top of the current one (e.g. PauseState()), which is suspended."""
+        if self._states:
+            self._states[-1].suspend(self)
+        self._states.append(state)
+        state.enter(self)
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    def pop_state(self):
+        """Remove and return the current state; the one below it resumes."""
+        state = self._states.pop()
+        state.exit(self)
+        if self._states:
+            self._states[-1].resume(self)
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        return state
+
+    @property
+    def loading(self) -> bool:
+        """True while a load_state is still building its state."""
+        return self._loading is not None
+
+    def load_state(self, factory, push=False) -> bool:
+        """
+        Switch to the state factory() builds, without stalling the frame:
+        factory() and the new state's preload() run on a worker thread
+        while the current state keeps running, and update() switches
+        (change_state, or push_state with push=True) once it is ready.
+        Headless and recorded worlds load synchronously instead, so the
+        switch lands on the same tick when a recording is replayed.
+        Returns False (and does nothing) while another load is pending.
+        """
+        if self._loading is not None:
+            return False
+        if self.screen is None or self.recorder is not None:
+            self._switch(_build_state(factory), push)
+            return True
+        if self._loader is None:
+            self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-loader")
+        self._loading = (self._loader.submit(_build_state, factory), push)
+        return True
+
+    def _finish_loading(self):
+        """Switch to the state being loaded if it is ready (re-raises its errors)."""
+        future, push = self._loading
+        if not future.done():
+            return
+        self._loading = None
+        self._switch(future.result(), push)
+
+    def _switch(self, state, push):
+        if push:
+            self.push_state(state)
+        else:
+            self.change_state(state)
+
+    def close(self) -> None:
+        """Cancel a pending load_state and stop its loader thread (call on exit)."""
+        if self._loading is not None:
+            self._loading[0].cancel()
+            self._loading = None
+        if self._loader is not None:
+            self._loader.shutdown(wait=False, cancel_futures=True)
+            self._loader = None
+
+    def toggle_profiler(self) -> None:
+        """Turn profiling and its HUD on (fresh Profiler) or off."""
+        if self.profiler is None:
+            from .profiler import Profiler
+            self.profiler = Profiler()
+            self.profiler.show_hud = True
+        else:
+            self.profiler = None
+        if self.renderer is not None:
+            self.renderer.invalidate()
 
     def handle_events(self) -> None:
-        """Collect pygame events and forward them to the current state."""
+        """
+        Drain the pygame event queue (the only place that does): keys update
+        self.input, press actions go to the state's handle_action and every
+        event to its handle_events.
+        """
+        profiler = self.profiler
+        if profiler is not None:
+            t0 = time.perf_counter()
+        focus_lost = getattr(pygame, "WINDOWFOCUSLOST", None)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-                return
+                break
+            if event.type == focus_lost:
+                self.input.release_all()
+
+            action = self.input.handle_event(event)
+            if action == TOGGLE_PROFILER:
+                # a debug view, not part of the game: not recorded
+                self.toggle_profiler()
+                continue
+
+            state = self.current_state
+            if action is not None:
+                if self.recorder is not None:
+                    self.recorder.action(action)
+                if state is not None:
+                    state.handle_action(self, action)
+                    state = self.current_state
 
-            # Let the active state respond to events (keys, mouse, etc.)
-            if self.current_state is not None:
-                self.current_state.handle_events(self, event)
+            # Let the active state respond to events (mouse, etc.)
+            if state is not None:
+                state.handle_events(self, event)
+        if profiler is not None:
+            profiler.add("events", t0, time.perf_counter())
 
-    def update(self) -> float:
+    def update(self, dt: Optional[float] = None) -> float:
         """
         Tick the clock and update the current state.
+        Pass dt (seconds) to step by a fixed amount instead of wall-clock time.
+        With fixed_step, dt is the frame time to simulate (capped at
+        MAX_FRAME_TIME) and the state advances in fixed steps.
         Returns dt in seconds.
         """
-        dt_seconds = self.clock.tick(self.fps) / 1000.0
+        if dt is None:
+            dt_seconds = self.clock.tick(self.fps) / 1000.0
+        else:
+            dt_seconds = dt
+        if self.fixed_step and dt_seconds > MAX_FRAME_TIME:
+            # after a stall, slow down rather than spiral into ever more steps
+            dt_seconds = MAX_FRAME_TIME
+
+        recorder = self.recorder
+        if recorder is not None:
+            # simulate with exactly the dt that goes into the log
+            dt_seconds = recorder.quantize(dt_seconds)
+
+        if self._loading is not None:
+            self._finish_loading()
 
-        if self.current_state is not None:
-            self.current_state.update(self, dt_seconds)
+        profiler = self.profiler
+        if profiler is not None:
+            t0 = time.perf_counter()
+        state = self.current_state
+        if state is not None:
+            if self.fixed_step and hasattr(state, "update_agents"):
+                self._fixed_update(state, dt_seconds)
+            else:
+                state.update(self, dt_seconds)
+        self.ticks += 1
+        if profiler is not None:
+            profiler.add("update", t0, time.perf_counter())
+            if self.screen is None:
+                # no draw() to close the frame
+                profiler.end_frame()
+
+        if recorder is not None:
+            recorder.tick(dt_seconds, getattr(self.current_state, "input_bits", 0))
 
         return dt_seconds
 
+    def _fixed_update(self, state, elapsed):
+        """Run the player and agent steps due in elapsed seconds, in time order."""
+        clocks = (self.player_clock, self.ai_clock)
+        before = [c.accumulator for c in clocks]
+        counts = [c.advance(elapsed) for c in clocks]
+        # input is sampled once per frame and held for all of its steps
+        state.poll_input(self)
+        for i in merge_steps(before, counts, [c.step for c in clocks]):
+            if i == 0:
+                state.update_player(self, clocks[0].step)
+            else:
+                state.update_agents(self, clocks[1].step)
+
+    def snapshot(self):
+        """
+        Picklable copy of the simulation state (RNG, tick count, agents and
+        the current state's own part) for sim.replay seeking.
+        """
+        state = self.current_state
+        return {
+            "ticks": self.ticks,
+            "rng": self.rng.getstate(),
+            "clocks": (self.player_clock.accumulator, self.ai_clock.accumulator),
+            "agents": self.agents,
+            "state": state.snapshot() if hasattr(state, "snapshot") else None,
+        }
+
+    def restore(self, snap):
+        """Put the simulation back to a snapshot() (taken from this kind of World)."""
+        self.ticks = snap["ticks"]
+        self.rng.setstate(snap["rng"])
+        self.player_clock.accumulator, self.ai_clock.accumulator = snap["clocks"]
+        self.agents[:] = snap["agents"]
+        state = self.current_state
+        if snap["state"] is not None and hasattr(state, "restore"):
+            state.restore(snap["state"])
+        self.rebuild_spatial()
+
     def draw(self) -> None:
-        """Clear the screen, ask the state to draw, then present the frame."""
-        self.screen.fill((0, 0, 0))
+        """Ask the state to draw, then present the frame (once)."""
+        if self.screen is None:
+            return
+
+        state = self.current_state
+        renderer = self.renderer
+        profiler = self.profiler
+        if profiler is not None:
+            t0 = time.perf_counter()
+        dirty = renderer is not None and getattr(state, "dirty_rects", False)
+        if dirty:
+            # the state restores and reports its own dirty regions
+            state.draw(self, self.screen)
+        else:
+            self.screen.fill((0, 0, 0))
+            if state is not None:
+                state.draw(self, self.screen)
+
+        if profiler is not None:
+            t1 = time.perf_counter()
+            profiler.add("draw", t0, t1)
+            if profiler.show_hud:
+                rect = profiler.draw_hud(self.screen)
+                if dirty:
+                    renderer.add(rect)
+
+        if dirty:
+            renderer.present()
+        else:
+            pygame.display.flip()
+            if renderer is not None:
+                renderer.invalidate()
 
-        if self.current_state is not None:
-            self.current_state.draw(self, self.screen)
+        if profiler is not None:
+            profiler.add("present", t1, time.perf_counter())
+            profiler.end_frame()
 
-        pygame.display.flip()
 
-    def drawAgents(self, screen):
-        for agent in self.agents:
-            pygame.draw.circle(screen, (20, 150, 20), (int(agent.x), int(agent.y)), 3)
-            draw_vision_cone
\ No newline at end of file
+def _build_state(factory):
+    """load_state's loader: make the state and run its preload."""
+    state = factory()
+    state.preload()
+    return state